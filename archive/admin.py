@@ -1,55 +1,12 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-from .models import (
-    Entry, Glossary, Translation, Segment, Item, Resource
-)
-
-
-class EntryAdmin(admin.ModelAdmin):
-    list_display = (
-        'source',
-        'target',
-        'glossary',
-    )
-    search_fields = ["source", "target"]
-
-
-class SegmentAdmin(admin.ModelAdmin):
-    list_display = (
-        'source',
-        'target',
-        'translation',
-    )
-    search_fields = ["source", "target"]
-
-
-class GlossaryAdmin(admin.ModelAdmin):
-    fields = (
-        "title",
-        "notes",
-        "type",
-    )
-    list_display = (
-        'title',
-        'notes',
-    )
-
-
-class TranslationAdmin(admin.ModelAdmin):
-    fields = (
-        "title",
-        "field",
-        "client",
-        "translator",
-        "notes",
-        "type",
-    )
-    list_display = (
-        'title',
-        'field',
-        'client',
-        "translator",
-    )
+from .models import Item, ProfileReport, Resource, clear_archive_stats, clear_navbar_resources
 
 
 class ItemAdmin(admin.ModelAdmin):
@@ -60,6 +17,18 @@ class ItemAdmin(admin.ModelAdmin):
     )
     search_fields = ["source", "target"]
 
+    def delete_queryset(self, request, queryset):
+        """
+        Overridden to keep Resource.item_count up to date when items are
+        deleted with the "delete selected" action.
+        """
+        counts = queryset.order_by().values("resource").annotate(count=Count("id"))
+        with transaction.atomic():
+            for row in list(counts):
+                if row["resource"]:
+                    Resource.objects.adjust_item_count(row["resource"], -row["count"])
+            super().delete_queryset(request, queryset)
+
 
 class ResourceAdmin(admin.ModelAdmin):
     fields = (
@@ -79,10 +48,89 @@ class ResourceAdmin(admin.ModelAdmin):
     )
     search_fields = ["title"]
 
+    def delete_queryset(self, request, queryset):
+        """
+        Overridden to clear the cached statistics and navbar resource list
+        when resources are deleted with the "delete selected" action.
+        """
+        super().delete_queryset(request, queryset)
+        clear_archive_stats()
+        clear_navbar_resources()
+
+
+class ProfileReportAdmin(admin.ModelAdmin):
+    """
+    Read-only views of the profile reports captured by ProfilingMiddleware,
+    with links to download each report as text and its cProfile stats.
+    """
+
+    list_display = (
+        "created_on",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "sql_ms",
+        "user",
+    )
+    list_filter = ("method", "status_code")
+    search_fields = ["path"]
+    fields = ("downloads", "report")
+    readonly_fields = ("downloads", "report")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_report),
+                name="archive_profilereport_download",
+            ),
+            path(
+                "<int:pk>/stats/",
+                self.admin_site.admin_view(self.download_stats),
+                name="archive_profilereport_stats",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Download")
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">report.txt</a> / <a href="{}">profile.prof</a>',
+            reverse("admin:archive_profilereport_download", args=[obj.pk]),
+            reverse("admin:archive_profilereport_stats", args=[obj.pk]),
+        )
+
+    @admin.display(description="Report")
+    def report(self, obj):
+        return format_html("<pre>{}</pre>", obj.as_text())
+
+    def download(self, request, content, content_type, filename):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        response = HttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def download_report(self, request, pk):
+        report = get_object_or_404(ProfileReport, pk=pk)
+        return self.download(
+            request, report.as_text(), "text/plain; charset=utf-8", f"profile_report_{pk}.txt"
+        )
+
+    def download_stats(self, request, pk):
+        report = get_object_or_404(ProfileReport, pk=pk)
+        return self.download(
+            request, bytes(report.stats), "application/octet-stream", f"profile_report_{pk}.prof"
+        )
+
 
-admin.site.register(Entry, EntryAdmin)
-admin.site.register(Glossary, GlossaryAdmin)
-admin.site.register(Translation, TranslationAdmin)
-admin.site.register(Segment, SegmentAdmin)
 admin.site.register(Item, ItemAdmin)
 admin.site.register(Resource, ResourceAdmin)
+admin.site.register(ProfileReport, ProfileReportAdmin)
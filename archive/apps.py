@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ArchiveConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "archive"
+
+    def ready(self):
+        from .db import apply_sqlite_pragmas
+        from .profiling import install_query_capture
+        from .timing import install_query_timer
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="archive_sqlite_pragmas")
+        # capture_query() is installed first so that it is the outermost
+        # wrapper, and the time spent explaining queries is not counted by
+        # time_query().
+        connection_created.connect(install_query_capture, dispatch_uid="archive_query_capture")
+        connection_created.connect(install_query_timer, dispatch_uid="archive_query_timer")
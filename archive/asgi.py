@@ -0,0 +1,136 @@
+"""
+Support for serving the archive through config.asgi.
+
+When the project is served with config.asgi, settings.ASYNC_VIEWS is enabled
+and the search, resource content and export views are replaced by async
+versions (see archive/urls.py), so that a slow search does not tie up a
+worker thread while the database is being read.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.core.handlers.asgi import ASGIHandler
+from django.http import StreamingHttpResponse
+
+# Returned by next() when a synchronous iterator is exhausted.
+_END = object()
+
+
+class AsyncStreamingHttpResponse(StreamingHttpResponse):
+    """
+    StreamingHttpResponse whose content is an async iterator.
+    Can only be sent by ArchiveASGIHandler.
+    """
+
+    is_async = True
+
+    @property
+    def streaming_content(self):
+        return self._make_bytes_async(self._iterator)
+
+    @streaming_content.setter
+    def streaming_content(self, value):
+        self._set_streaming_content(value)
+
+    def _set_streaming_content(self, value):
+        self._iterator = aiter(value)
+
+    async def _make_bytes_async(self, iterator):
+        async for chunk in iterator:
+            yield self.make_bytes(chunk)
+
+    def __iter__(self):
+        raise TypeError("AsyncStreamingHttpResponse can only be sent by ArchiveASGIHandler.")
+
+    def __aiter__(self):
+        return self.streaming_content
+
+    def getvalue(self):
+        raise TypeError("The content of AsyncStreamingHttpResponse can only be read asynchronously.")
+
+
+class ArchiveASGIHandler(ASGIHandler):
+    """
+    ASGIHandler that can also send AsyncStreamingHttpResponse objects.
+    Synchronous streaming content (e.g. static files, or the content of
+    responses from synchronous views) is read in a thread, so that reading
+    it does not block the event loop.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": self.encode_headers(response),
+            }
+        )
+
+        if getattr(response, "is_async", False):
+            async for part in response:
+                await self.send_body(part, send)
+        else:
+            iterator = iter(response)
+            while True:
+                part = await sync_to_async(next, thread_sensitive=True)(iterator, _END)
+                if part is _END:
+                    break
+                await self.send_body(part, send)
+
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
+
+    async def send_body(self, part, send):
+        for chunk, _ in self.chunk_bytes(part):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    @staticmethod
+    def encode_headers(response):
+        """Returns the headers and cookies of response, encoded for ASGI."""
+
+        headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode("ascii")
+            if isinstance(value, str):
+                value = value.encode("latin1")
+            headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            headers.append((b"Set-Cookie", cookie.output(header="").encode("ascii").strip()))
+        return headers
+
+
+async def is_authenticated(request):
+    """
+    Returns whether the user making the request is logged in.
+    request.user is loaded from the database the first time it is used, so
+    it cannot be used directly in async code before this has been called.
+    """
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """LoginRequiredMixin for class-based views with async handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not await is_authenticated(request):
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+def async_login_required(view_func):
+    """login_required for async function-based views."""
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not await is_authenticated(request):
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,121 @@
+"""
+Caching layer shared by the parts of the archive app that cache data
+(statistics, navbar lists, searches and the term index).
+
+Values are grouped in namespaces. Keys are prefixed with the namespace and
+settings.ARCHIVE_CACHE_VERSION, and each namespace has a generation number
+(stored in the cache itself) that is used as the cache version of its keys.
+invalidate() moves a namespace to a new generation, so that all of its values
+become stale at once without the keys having to be known or deleted. Stale
+values are left to expire or be evicted by the cache backend.
+
+Works with any backend configured in settings.CACHES (see CACHE_URL).
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import metrics
+
+# Namespaces used by the archive app. Nothing is cached in ARCHIVE, whose
+# generation changes whenever the archive changes (see models.archive_generation()).
+ARCHIVE = "archive"
+STATS = "stats"
+NAVBAR = "navbar"
+SEARCH = "search"
+TERM_INDEX = "term_index"
+
+# Returned by cache.get() on a miss, so that None can be cached as a value.
+_MISSING = object()
+
+
+def make_key(namespace, key):
+    return f"archive:{settings.ARCHIVE_CACHE_VERSION}:{namespace}:{key}"
+
+
+def generation_key(namespace):
+    return make_key(namespace, "generation")
+
+
+def new_generation():
+    """
+    Returns the generation number used when a namespace has no generation in
+    the cache (e.g. after the cache was cleared or the key was evicted).
+    Based on the current time so that values cached under an earlier
+    generation of the same namespace cannot be reused.
+    """
+    return time.time_ns() // 1000
+
+
+def get_generation(namespace):
+    key = generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # add() does nothing if another process has just set the generation.
+        cache.add(key, new_generation(), None)
+        generation = cache.get(key, new_generation())
+    return generation
+
+
+def get(namespace, key, default=None):
+    value = cache.get(make_key(namespace, key), _MISSING, version=get_generation(namespace))
+    record_lookup(namespace, value is not _MISSING)
+    return default if value is _MISSING else value
+
+
+def set(namespace, key, value, timeout=None):
+    """
+    Caches value in namespace. The default timeout of None caches the value
+    until the namespace is invalidated.
+    """
+    cache.set(make_key(namespace, key), value, timeout, version=get_generation(namespace))
+
+
+def delete(namespace, key):
+    cache.delete(make_key(namespace, key), version=get_generation(namespace))
+
+
+def get_or_set(namespace, key, default, timeout=None):
+    """
+    Returns the value cached for key in namespace. On a miss, default (or the
+    result of calling it, if it is callable) is cached and returned.
+    """
+
+    generation = get_generation(namespace)
+    cache_key = make_key(namespace, key)
+
+    value = cache.get(cache_key, _MISSING, version=generation)
+    record_lookup(namespace, value is not _MISSING)
+    if value is _MISSING:
+        value = default() if callable(default) else default
+        cache.set(cache_key, value, timeout, version=generation)
+
+    return value
+
+
+def record_lookup(namespace, hit):
+    """Counts a lookup in the cache hit ratio metrics (see archive/metrics.py)."""
+    metrics.CACHE_REQUESTS.inc(namespace=namespace, result="hit" if hit else "miss")
+
+
+def invalidate(namespace):
+    """
+    Makes all values cached in namespace stale.
+    Invalidated again when the current transaction is committed, in case
+    values calculated by another request before the commit have been cached
+    in the meantime.
+    """
+    _next_generation(namespace)
+    transaction.on_commit(lambda: _next_generation(namespace))
+
+
+def _next_generation(namespace):
+    key = generation_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not in the cache, so values of the previous generation cannot be found.
+        cache.add(key, new_generation(), None)
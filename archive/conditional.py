@@ -0,0 +1,108 @@
+"""
+Conditional responses (ETag / If-None-Match) for pages showing archive data.
+
+The ETag of a page is calculated before the view runs, from cheap validators
+only: the archive generation (which changes whenever resources or items are
+saved or deleted, see models.archive_generation()) and, for resource pages,
+the updated_on and item_count of the resource. When the browser already has
+the current version of the page, a 304 response is returned without running
+the search or rendering the template.
+
+Last-Modified is not sent, because editing an item does not change
+Resource.updated_on, so the date alone cannot tell if a page has changed.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import Resource, archive_generation
+
+
+def make_etag(request, *validators):
+    """
+    Returns the ETag of the page requested, or None if the page should not
+    be cached (in which case the view always runs).
+    Pages contain the username and CSRF tokens, so the user and the CSRF
+    cookie are part of the ETag. ARCHIVE_CACHE_VERSION is included so that
+    pages can be made stale after a release that changes the templates.
+    """
+
+    # Pending messages are displayed (and consumed) when the page is rendered.
+    if len(messages.get_messages(request)):
+        return None
+
+    values = [
+        settings.ARCHIVE_CACHE_VERSION,
+        archive_generation(),
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        request.get_full_path(),
+        *validators,
+    ]
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def archive_etag(request, *args, **kwargs):
+    """ETag of pages that depend on the whole archive (e.g. search results)."""
+    return make_etag(request)
+
+
+def resource_etag(request, pk, *args, **kwargs):
+    """ETag of pages showing one resource, or None if it does not exist."""
+
+    validators = Resource.objects.filter(pk=pk).values_list("updated_on", "item_count").first()
+    if validators is None:
+        return None
+    return make_etag(request, pk, *validators)
+
+
+def conditional_page(etag_func):
+    """
+    Decorator for views returning pages that the browser may keep, but must
+    revalidate (with If-None-Match) before each use. A 304 response is
+    returned if the ETag returned by etag_func has not changed.
+    Should be applied after login checks, so that the ETag is only
+    calculated for logged-in users.
+    """
+
+    def decorator(view):
+        view = condition(etag_func=etag_func)(view)
+        return cache_control(private=True, no_cache=True)(view)
+
+    return decorator
+
+
+def async_conditional_page(etag_func):
+    """
+    conditional_page() for async views (Django's condition() decorator only
+    supports synchronous views). etag_func is run in a thread, since it
+    reads the database.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag = None
+            if request.method in ("GET", "HEAD"):
+                etag = await sync_to_async(etag_func)(request, *args, **kwargs)
+                etag = quote_etag(etag) if etag else None
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if etag:
+                response.headers.setdefault("ETag", etag)
+
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return inner
+
+    return decorator
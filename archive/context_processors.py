@@ -1,4 +1,4 @@
-from django.db.models.functions import Lower
+from django.utils.functional import SimpleLazyObject
 
 from .models import Resource
 
@@ -7,11 +7,10 @@ def resources_processor(request):
     """
     Provides resources to populate the resource drop-down menu in the search
     form included in the navigation bar on each page.
+    The titles are taken from the cache, and only when a template uses them,
+    so pages (and HTMX fragments) that do not list resources make no queries.
     """
-    glossaries = Resource.objects.filter(resource_type="GLOSSARY").order_by(Lower("title"))
-    translations = Resource.objects.filter(resource_type="TRANSLATION").order_by(Lower("title"))
     data = {
-        "glossaries": glossaries,
-        "translations": translations,
+        "navbar_resources": SimpleLazyObject(Resource.objects.navbar_resources),
     }
     return data
@@ -0,0 +1,29 @@
+"""
+Database connection setup.
+"""
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Receiver of the connection_created signal.
+    Applies settings.SQLITE_PRAGMAS to each new SQLite connection when the
+    SQLite performance profile is enabled. busy_timeout is applied first, so
+    that switching to WAL mode waits for other connections instead of failing.
+    """
+
+    if connection.vendor != "sqlite" or not settings.SQLITE_PERFORMANCE_PROFILE:
+        return
+
+    pragmas = sorted(settings.SQLITE_PRAGMAS.items(), key=lambda pragma: pragma[0] != "busy_timeout")
+
+    # The journal mode cannot be changed through a read-only connection
+    # (e.g. the replica used for local testing). WAL mode is kept in the
+    # database file itself, so read-only connections use it anyway.
+    if "mode=ro" in str(connection.settings_dict["NAME"]):
+        pragmas = [pragma for pragma in pragmas if pragma[0] != "journal_mode"]
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,90 @@
+"""
+Deletion of large resources.
+
+Deleting a Resource with Model.delete() makes Django load every related Item
+to cascade the deletion, all in one transaction. Instead, the resource is
+first marked as pending deletion (which hides it everywhere immediately),
+then its items are deleted in ranges of ids, each range with one DELETE
+statement in its own short transaction, and finally the resource itself.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from .jobs import run_in_background
+from .models import GlossaryCheck, Item, Resource, clear_archive_stats, clear_navbar_resources
+
+
+def delete_resource(resource, background=None):
+    """
+    Hides a resource and deletes it with delete_pending_resource(), in the
+    background if settings.DELETE_RESOURCES_IN_BACKGROUND is set (or if
+    background is True).
+    """
+
+    if background is None:
+        background = settings.DELETE_RESOURCES_IN_BACKGROUND
+
+    mark_for_deletion(resource)
+    if background:
+        run_in_background(delete_pending_resource, resource.pk)
+    else:
+        delete_pending_resource(resource.pk)
+
+
+def mark_for_deletion(resource):
+    Resource.all_objects.filter(pk=resource.pk).update(pending_deletion=True)
+    resource.pending_deletion = True
+    clear_archive_stats()
+    clear_navbar_resources()
+
+
+def delete_pending_resource(resource_id, batch_size=None):
+    """
+    Deletes the items of a resource in batches, then the resource.
+    Memory use does not depend on the number of items, and the database is
+    only locked for the time needed to delete one batch. Can be run again
+    if it is stopped part way.
+    Returns the number of items deleted.
+    """
+
+    batch_size = batch_size or settings.DELETE_BATCH_SIZE
+    table = connection.ops.quote_name(Item._meta.db_table)
+    sql = f"DELETE FROM {table} WHERE resource_id = %s AND id BETWEEN %s AND %s"
+
+    # Glossary checks of the resource refer to its items, so they are
+    # deleted (with their issues) first.
+    GlossaryCheck.objects.filter(resource_id=resource_id).delete()
+
+    id_range = Item.objects.filter(resource_id=resource_id).aggregate(first=Min("id"), last=Max("id"))
+    deleted = 0
+
+    if id_range["first"] is not None:
+        for start in range(id_range["first"], id_range["last"] + 1, batch_size):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, [resource_id, start, start + batch_size - 1])
+                    deleted += cursor.rowcount
+
+    # The resource has no items left, so deleting it cascades to nothing.
+    Resource.all_objects.filter(pk=resource_id, pending_deletion=True).delete()
+    clear_archive_stats()
+    clear_navbar_resources()
+
+    return deleted
+
+
+def delete_all_pending_resources(batch_size=None):
+    """
+    Finishes deleting every resource marked as pending deletion, e.g. after
+    the process running a background deletion was stopped.
+    Returns the number of resources deleted.
+    """
+
+    resource_ids = list(
+        Resource.all_objects.filter(pending_deletion=True).values_list("id", flat=True)
+    )
+    for resource_id in resource_ids:
+        delete_pending_resource(resource_id, batch_size=batch_size)
+    return len(resource_ids)
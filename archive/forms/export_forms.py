@@ -0,0 +1,67 @@
+from django import forms
+from django.db.models.functions import Lower
+
+from ..models import Resource
+
+
+class ResourceExportForm(forms.Form):
+    """
+    Form used for choosing the resources to be exported as a single zip file.
+    Resources can be chosen individually, by client, or both.
+    """
+    resources = forms.ModelMultipleChoiceField(
+        label="① エクスポートするリソースを選択してください。",
+        queryset=Resource.objects.order_by("resource_type", Lower("title")),
+        required=False,
+    )
+    client = forms.CharField(
+        label="② または、クライアントのリソースをすべてエクスポートしますか？",
+        widget=forms.TextInput(attrs={"placeholder": "クライアント名を入力してください。"}),
+        required=False,
+        error_messages={"max_length": "100文字以下になるように変更してください。"},
+        max_length=100,
+    )
+    resource_type = forms.ChoiceField(
+        label="③ リソースの種類",
+        choices=(("", "すべての種類"),) + Resource.RESOURCE_TYPES,
+        required=False,
+    )
+
+    def clean(self):
+        """
+        Overridden to check that at least one of the resources and the client
+        fields has been entered.
+        """
+
+        cleaned_data = super().clean()
+        resources = cleaned_data.get("resources")
+        client = cleaned_data.get("client")
+
+        if not resources and not client:
+            msg = "①または②のいずれかを入力してください。"
+            self.add_error("resources", msg)
+            self.add_error("client", msg)
+
+        return cleaned_data
+
+    def get_resources(self):
+        """
+        Returns a queryset of the Resource objects chosen in the form.
+        Should only be called after the form has been validated.
+        """
+
+        queryset = Resource.objects.none()
+
+        resources = self.cleaned_data.get("resources")
+        if resources:
+            queryset = queryset | resources
+
+        client = self.cleaned_data.get("client")
+        if client:
+            queryset = queryset | Resource.objects.filter(client__iexact=client)
+
+        resource_type = self.cleaned_data.get("resource_type")
+        if resource_type:
+            queryset = queryset.filter(resource_type=resource_type)
+
+        return queryset
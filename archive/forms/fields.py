@@ -0,0 +1,122 @@
+from django import forms
+
+from ..models import Resource
+
+
+class ResourceAutocompleteWidget(forms.Widget):
+    """
+    Widget used for choosing a single resource by entering part of its title.
+    Consists of a text field, in which matching resources are loaded from the
+    resource_autocomplete view as the user types, and a hidden field holding
+    the pk of the chosen resource (the value that is submitted).
+    Unlike a Select widget, the resources are never all rendered.
+    """
+    template_name = "widgets/resource_autocomplete.html"
+
+    def __init__(self, attrs=None, resource_type="GLOSSARY"):
+        super().__init__(attrs)
+        self.resource_type = resource_type
+
+    def get_context(self, name, value, attrs):
+        """
+        Overridden to add the title of the chosen resource (if any), which is
+        displayed in the text field.
+        """
+
+        context = super().get_context(name, value, attrs)
+
+        title = ""
+        if value is not None and str(value).isdigit():
+            title = (
+                Resource.objects
+                .filter(pk=value, resource_type=self.resource_type)
+                .values_list("title", flat=True)
+                .first()
+            ) or ""
+        if not title:
+            context["widget"]["value"] = ""
+
+        context["widget"].update(
+            {
+                "title": title,
+                "resource_type": self.resource_type,
+            }
+        )
+        return context
+
+
+class ResourceAutocompleteField(forms.ModelChoiceField):
+    """
+    Field used with ResourceAutocompleteWidget.
+    The submitted pk is validated with a single lookup of that pk, restricted
+    to resources of the given type.
+    """
+    widget = ResourceAutocompleteWidget
+
+    def __init__(self, resource_type="GLOSSARY", **kwargs):
+        queryset = Resource.objects.filter(resource_type=resource_type)
+        super().__init__(queryset=queryset, **kwargs)
+        self.widget.resource_type = resource_type
+
+
+class ResourceMultipleAutocompleteWidget(ResourceAutocompleteWidget):
+    """
+    Widget used for choosing several resources by entering part of their
+    titles. Each resource chosen from the results of the text field is added
+    to a list of chosen resources, with a hidden field holding its pk (the
+    values that are submitted).
+    """
+    template_name = "widgets/resource_multiple_autocomplete.html"
+
+    def get_context(self, name, value, attrs):
+        """
+        Overridden to add the titles of the chosen resources, fetched with a
+        single query.
+        """
+
+        context = forms.Widget.get_context(self, name, value, attrs)
+
+        pks = [str(pk) for pk in (value or []) if str(pk).isdigit()]
+        resources = []
+        if pks:
+            resources = list(
+                Resource.objects
+                .filter(pk__in=pks, resource_type=self.resource_type)
+                .order_by("title")
+                .values("pk", "title")
+            )
+
+        context["widget"].update(
+            {
+                "resources": resources,
+                "resource_type": self.resource_type,
+            }
+        )
+        return context
+
+    def format_value(self, value):
+        return value
+
+    def value_from_datadict(self, data, files, name):
+        try:
+            return data.getlist(name)
+        except AttributeError:
+            return data.get(name)
+
+    def value_omitted_from_data(self, data, files, name):
+        # Nothing is submitted when no resource is chosen.
+        return False
+
+
+class ResourceMultipleAutocompleteField(forms.ModelMultipleChoiceField):
+    """
+    Field used with ResourceMultipleAutocompleteWidget.
+    The submitted pks are validated with a single lookup, restricted to
+    resources of the given type.
+    """
+    widget = ResourceMultipleAutocompleteWidget
+
+    def __init__(self, resource_type="GLOSSARY", **kwargs):
+        queryset = Resource.objects.filter(resource_type=resource_type)
+        super().__init__(queryset=queryset, **kwargs)
+        self.widget.resource_type = resource_type
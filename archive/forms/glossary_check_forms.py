@@ -0,0 +1,15 @@
+from django import forms
+
+from .fields import ResourceMultipleAutocompleteField
+
+
+class GlossaryCheckForm(forms.Form):
+    """
+    Form used for choosing the glossaries that the items of a translation are
+    checked against (see archive/glossary_check.py).
+    """
+    glossaries = ResourceMultipleAutocompleteField(
+        label="① チェックに使う用語集を選択してください。",
+        resource_type="GLOSSARY",
+        error_messages={"required": "用語集を1つ以上選択してください。"},
+    )
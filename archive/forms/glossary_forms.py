@@ -3,6 +3,7 @@ from django.core.validators import FileExtensionValidator
 from django.utils.safestring import mark_safe
 
 from ..models import Resource
+from .fields import ResourceAutocompleteField
 
 
 class GlossaryForm(forms.ModelForm):
@@ -35,9 +36,9 @@ class GlossaryUploadForm(forms.ModelForm):
             )
         ],
     )
-    existing_glossary = forms.ModelChoiceField(
+    existing_glossary = ResourceAutocompleteField(
         label="② 既存の用語集に追加しますか？",
-        queryset=Resource.objects.filter(resource_type="GLOSSARY").order_by("title"),
+        resource_type="GLOSSARY",
         required=False,
     )
     title = forms.CharField(
@@ -88,8 +89,7 @@ class GlossaryUploadForm(forms.ModelForm):
         if title and not existing_glossary:
             if (
                 Resource.objects
-                .filter(resource_type="GLOSSARY")
-                .filter(title__iexact=title)
+                .with_title(title, resource_type="GLOSSARY")
                 .exists()
             ):
                 msg = "このタイトルの用語集はすでに存在しています。"
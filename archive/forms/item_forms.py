@@ -1,6 +1,7 @@
 from django import forms
 
 from ..models import Item, Resource
+from .fields import ResourceAutocompleteField
 
 
 class GlossaryItemForm(forms.ModelForm):
@@ -21,9 +22,9 @@ class GlossaryItemForm(forms.ModelForm):
             "max_length": "255文字以下になるように変更してください。",
         },
     )
-    resource = forms.ModelChoiceField(
+    resource = ResourceAutocompleteField(
         label="③ 既存の用語集に関連付けますか？",
-        queryset=Resource.objects.filter(resource_type="GLOSSARY").order_by("title"),
+        resource_type="GLOSSARY",
         required=False,
     )
     new_resource = forms.CharField(
@@ -76,8 +77,7 @@ class GlossaryItemForm(forms.ModelForm):
                 # If input title for new resource already exists, output error
                 if (
                     Resource.objects
-                    .filter(resource_type="GLOSSARY")
-                    .filter(title__iexact=new_resource)
+                    .with_title(new_resource, resource_type="GLOSSARY")
                     .exists()
                 ):
                     msg = "このタイトルの用語集はすでに存在しています。"
@@ -0,0 +1,37 @@
+from django import forms
+from django.conf import settings
+from django.core.validators import FileExtensionValidator
+
+
+class PretranslationForm(forms.Form):
+    """
+    Form used for uploading a document to be pre-translated with the
+    translations and glossaries in the archive (see archive/pretranslation.py).
+    """
+    upload_file = forms.FileField(
+        label="① 翻訳する原文ファイルを選択してください。",
+        help_text="DOCX又はTMXファイルのみ読み込み可能です。",
+        error_messages={
+            "required": "このフィールドは入力必須です。",
+        },
+        validators=[
+            FileExtensionValidator(
+                allowed_extensions=["docx", "tmx"],
+                message=["拡張子が 「.docx」又は「.tmx」のファイルをお選びください。"],
+            )
+        ],
+    )
+    threshold = forms.IntegerField(
+        label="② 類似一致の最低一致率（%）",
+        min_value=50,
+        max_value=100,
+        error_messages={
+            "required": "このフィールドは入力必須です。",
+            "min_value": "50以上の数値を入力してください。",
+            "max_value": "100以下の数値を入力してください。",
+        },
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["threshold"].initial = settings.PRETRANSLATE_FUZZY_THRESHOLD
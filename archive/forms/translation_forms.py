@@ -3,6 +3,7 @@ from django.core.validators import FileExtensionValidator
 from django.utils.safestring import mark_safe
 
 from ..models import Resource
+from .fields import ResourceMultipleAutocompleteField
 
 
 class TranslationUpdateForm(forms.ModelForm):
@@ -95,6 +96,12 @@ class TranslationUploadForm(forms.ModelForm):
         widget=forms.Textarea(attrs={"rows": 6}),
         required=False,
     )
+    glossaries = ResourceMultipleAutocompleteField(
+        label="⑦ 用語チェックに使う用語集（任意）",
+        help_text="選択すると、アップロード後に訳文に用語集の訳語が使われているかチェックします。",
+        resource_type="GLOSSARY",
+        required=False,
+    )
 
     class Meta:
         model = Resource
@@ -105,8 +112,7 @@ class TranslationUploadForm(forms.ModelForm):
         if title:
             if (
                 Resource.objects
-                .filter(resource_type="TRANSLATION")
-                .filter(title__iexact=title)
+                .with_title(title, resource_type="TRANSLATION")
                 .exists()
             ):
                 msg = "その案件番号の翻訳はすでに存在しています。"
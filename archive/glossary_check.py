@@ -0,0 +1,171 @@
+"""
+Glossary consistency checks of translations.
+
+Each item of a translation is checked against the terms of the chosen
+glossaries: if its source contains a term but its target contains none of
+the translations given for the term, a GlossaryCheckIssue is recorded.
+The terms are found in the sources with a TermIndex of the glossary sources,
+and their translations in the targets with a TermIndex of the glossary
+targets, so each item is checked in one pass over its source and target
+however many terms the glossaries have.
+Checks are run in the background (see archive/jobs.py).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .jobs import run_in_background
+from .models import GlossaryCheck, GlossaryCheckIssue, Item
+from .term_index import MIN_TERM_LENGTH, TermIndex, normalize
+
+# Number of items read from the database at a time.
+CHECK_CHUNK_SIZE = 2000
+
+# Number of issues saved with each INSERT statement.
+ISSUE_BATCH_SIZE = 1000
+
+
+def start_glossary_check(resource, glossaries, user=None):
+    """
+    Creates a GlossaryCheck of a translation against glossaries, and runs it
+    in the background once the current transaction has been committed.
+    """
+
+    with transaction.atomic():
+        glossary_check = GlossaryCheck.objects.create(resource=resource, created_by=user)
+        glossary_check.glossaries.set(glossaries)
+        run_in_background(run_glossary_check, glossary_check.pk)
+    return glossary_check
+
+
+def fail_interrupted_checks(glossary_checks):
+    """
+    Marks the checks in the queryset glossary_checks that have not finished
+    within settings.GLOSSARY_CHECK_TIMEOUT seconds of being created as failed.
+    Checks are run in a thread of the server process, so a check that was
+    pending or running when the process stopped would never finish.
+    Returns the number of checks marked as failed.
+    """
+
+    now = timezone.now()
+    return (
+        glossary_checks
+        .filter(
+            status__in=[GlossaryCheck.PENDING, GlossaryCheck.RUNNING],
+            created_on__lt=now - timedelta(seconds=settings.GLOSSARY_CHECK_TIMEOUT),
+        )
+        .update(status=GlossaryCheck.FAILED, finished_on=now)
+    )
+
+
+class GlossaryTerms:
+    """
+    Terms of a set of glossaries, with a TermIndex of their sources and a
+    TermIndex of their translations.
+    """
+
+    def __init__(self, glossaries):
+        # Translations and glossary titles of each term, by normalized source.
+        terms = {}
+        rows = (
+            Item.objects
+            .filter(resource__in=glossaries)
+            .exclude(source="")
+            .exclude(target="")
+            .order_by("resource__title", "id")
+            .values_list("source", "target", "resource__title")
+        )
+        for source, target, title in rows.iterator(chunk_size=CHECK_CHUNK_SIZE):
+            key = normalize(source).lower()
+            if len(key) < MIN_TERM_LENGTH:
+                continue
+            term = terms.setdefault(key, {"source": source, "targets": {}, "titles": {}})
+            term["targets"].setdefault(normalize(target).lower(), target)
+            term["titles"].setdefault(title)
+
+        self.terms = list(terms.values())
+        self.source_index = TermIndex(terms)
+
+        # Numbers of the translations (in target_index) of each term.
+        targets = {}
+        self.term_targets = [
+            {targets.setdefault(key, len(targets)) for key in term["targets"]}
+            for term in self.terms
+        ]
+        self.target_index = TermIndex(targets)
+
+    def missing_terms(self, source, target):
+        """
+        Returns the terms found in source whose translations are all missing
+        from target.
+        """
+
+        found = self.source_index.find(source)
+        if not found:
+            return []
+        translations = {number for _, _, number in self.target_index.find(target, overlapping=True)}
+
+        missing = []
+        for _, _, number in found:
+            if not self.term_targets[number] & translations and self.terms[number] not in missing:
+                missing.append(self.terms[number])
+        return missing
+
+
+def run_glossary_check(glossary_check_id):
+    """
+    Runs a GlossaryCheck, replacing any issues recorded by a previous run.
+    Memory use does not depend on the number of items of the translation.
+    """
+
+    glossary_check = GlossaryCheck.objects.get(pk=glossary_check_id)
+    glossary_check.status = GlossaryCheck.RUNNING
+    glossary_check.save(update_fields=["status"])
+
+    try:
+        glossary_check.issues.all().delete()
+        terms = GlossaryTerms(glossary_check.glossaries.all())
+
+        item_count = 0
+        issue_count = 0
+        issues = []
+        items = (
+            Item.objects
+            .filter(resource_id=glossary_check.resource_id)
+            .order_by("id")
+            .values_list("id", "source", "target")
+        )
+        for item_id, source, target in items.iterator(chunk_size=CHECK_CHUNK_SIZE):
+            item_count += 1
+            for term in terms.missing_terms(source, target):
+                issues.append(
+                    GlossaryCheckIssue(
+                        glossary_check=glossary_check,
+                        item_id=item_id,
+                        term_source=term["source"],
+                        term_target=" / ".join(term["targets"].values()),
+                        glossary_title="、".join(term["titles"])[:100],
+                    )
+                )
+            if len(issues) >= ISSUE_BATCH_SIZE:
+                GlossaryCheckIssue.objects.bulk_create(issues)
+                issue_count += len(issues)
+                issues = []
+        GlossaryCheckIssue.objects.bulk_create(issues)
+        issue_count += len(issues)
+
+    except Exception:
+        GlossaryCheck.objects.filter(pk=glossary_check_id).update(
+            status=GlossaryCheck.FAILED, finished_on=timezone.now()
+        )
+        raise
+
+    glossary_check.status = GlossaryCheck.DONE
+    glossary_check.item_count = item_count
+    glossary_check.issue_count = issue_count
+    glossary_check.finished_on = timezone.now()
+    glossary_check.save(update_fields=["status", "item_count", "issue_count", "finished_on"])
+    return issue_count
@@ -0,0 +1,51 @@
+"""
+Background jobs.
+
+Runs functions in a background thread of the current process, so that slow
+work (such as deleting a large resource) does not hold up the response.
+Jobs are not persisted: work that must be finished even if the process stops
+should be resumable (see the purge_deleted_resources command).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-job")
+    return _executor
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Runs func(*args, **kwargs) in the background thread, after the current
+    transaction (if any) has been committed so the job sees its changes.
+    """
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
+
+
+def submit(func, *args, **kwargs):
+    metrics.QUEUED_JOBS.inc()
+    return get_executor().submit(run_job, func, *args, **kwargs)
+
+
+def run_job(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background job %s failed.", func.__name__)
+        raise
+    finally:
+        metrics.QUEUED_JOBS.dec()
+        # Each job gets fresh connections, as a request would.
+        connections.close_all()
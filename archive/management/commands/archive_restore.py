@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Item, Resource
+from ...snapshot import SnapshotError, restore_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Restores resources and their items from a snapshot file written by "
+        "the archive_snapshot command. The archive must be empty unless "
+        "--flush is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the snapshot file to be restored.")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete all existing resources and items before restoring.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per INSERT statement batch.",
+        )
+
+    def handle(self, *args, **options):
+        if Resource.all_objects.exists() or Item.objects.exists():
+            if not options["flush"]:
+                raise CommandError(
+                    "The archive is not empty. Use --flush to delete the existing data."
+                )
+
+        start_time = time.monotonic()
+
+        try:
+            with open(options["path"], "rb") as f:
+                num_of_resources, num_of_items, missing_usernames = restore_snapshot(
+                    f, batch_size=options["batch_size"], flush=options["flush"]
+                )
+        except (OSError, SnapshotError) as e:
+            raise CommandError(f"Restore failed: {e}")
+
+        if missing_usernames:
+            self.stdout.write(
+                self.style.WARNING(
+                    "The following users do not exist in this database, so their "
+                    "resources and items were restored without a user: "
+                    + ", ".join(sorted(missing_usernames))
+                )
+            )
+
+        elapsed_time = time.monotonic() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Restored {num_of_resources} resources and {num_of_items} items "
+                f"from {options['path']} in {elapsed_time:.1f}s."
+            )
+        )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...snapshot import write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes all resources and their items to a compressed snapshot file. "
+        "The snapshot can be loaded with the archive_restore command."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the snapshot file to be written.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of rows read from the database and compressed at a time.",
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.monotonic()
+
+        with open(options["path"], "wb") as f:
+            num_of_resources, num_of_items = write_snapshot(f, chunk_size=options["chunk_size"])
+
+        elapsed_time = time.monotonic() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {num_of_resources} resources and {num_of_items} items "
+                f"to {options['path']} in {elapsed_time:.1f}s."
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ...deletion import delete_all_pending_resources
+
+
+class Command(BaseCommand):
+    help = (
+        "Finishes deleting resources that are marked as pending deletion, "
+        "e.g. when a background deletion was stopped by a server restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of items deleted in each transaction (default: DELETE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        num_of_resources = delete_all_pending_resources(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {num_of_resources} resources."))
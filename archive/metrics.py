@@ -0,0 +1,333 @@
+"""
+In-process metrics, exposed in the Prometheus text format at /metrics.
+
+Counters, gauges and histograms are defined at the bottom of this module and
+updated by the code they measure (searches, uploads, the cache layer and
+background jobs). Each process keeps its values in memory. If
+settings.METRICS_DIR is set, each process also writes its values to its own
+file in that directory (at most every settings.METRICS_FLUSH_INTERVAL
+seconds, and when it exits), and /metrics adds up the files of all the
+processes, so that the worker processes of a server are aggregated whichever
+one serves the request.
+Counters and histograms of processes that have stopped are kept, so they
+stay cumulative until the directory is emptied (e.g. when the server is
+redeployed). Gauges only include the processes that are still running.
+"""
+
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Metrics by name, in the order they were defined.
+_registry = {}
+
+# Held while values are read or changed (by request threads, background
+# jobs and the flusher thread).
+_lock = threading.RLock()
+
+# Process the values belong to. Checked before values are changed, so that a
+# process forked after values were recorded (e.g. by a prefork server) does
+# not count the values of its parent again.
+_pid = os.getpid()
+
+# Whether values have changed since they were last written to METRICS_DIR.
+_dirty = False
+_flusher = None
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Values by tuple of label values.
+        self.values = {}
+        _registry[name] = self
+
+    def key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def get(self, **labels):
+        """Returns the value of this process for labels (used by tests)."""
+        with _lock:
+            return self.values.get(self.key(labels), self.zero())
+
+    def zero(self):
+        return 0
+
+    def merge(self, total, value):
+        """Adds value (read from the file of a process) to total."""
+        return value if total is None else total + value
+
+    def samples(self, key, value):
+        """Returns (name, labels, value) tuples of the lines of a value."""
+        return [(self.name, dict(zip(self.labelnames, key)), value)]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with _lock:
+            _changed()
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with _lock:
+            _changed()
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with _lock:
+            _changed()
+            self.values[self.key(labels)] = value
+
+
+class Histogram(Metric):
+    """
+    Histogram of observed values. Each value is stored as a list of the
+    (non-cumulative) count of each bucket, followed by the sum and the count
+    of the observed values.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def zero(self):
+        return [0] * len(self.buckets) + [0, 0]
+
+    def get(self, **labels):
+        # A copy, since observe() changes the stored list in place.
+        return list(super().get(**labels))
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with _lock:
+            _changed()
+            counts = self.values.setdefault(key, self.zero())
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def merge(self, total, value):
+        if len(value) != len(self.buckets) + 2:
+            # Written with other buckets (before a redeployment).
+            return total
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def samples(self, key, value):
+        labels = dict(zip(self.labelnames, key))
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, value):
+            cumulative += count
+            samples.append((f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative))
+        samples.append((f"{self.name}_sum", labels, value[-2]))
+        samples.append((f"{self.name}_count", labels, value[-1]))
+        return samples
+
+
+def _check_fork():
+    global _pid, _flusher
+    if os.getpid() != _pid:
+        _pid = os.getpid()
+        _flusher = None
+        for metric in _registry.values():
+            metric.values.clear()
+
+
+def _changed():
+    """Called (with _lock held) before values are changed."""
+    global _dirty, _flusher
+    _check_fork()
+    _dirty = True
+    if _flusher is None and settings.METRICS_DIR:
+        _flusher = threading.Thread(target=_flush_periodically, name="archive-metrics", daemon=True)
+        _flusher.start()
+
+
+def _flush_periodically():
+    atexit.register(flush)
+    while True:
+        time.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            logger.exception("Metrics could not be written to %s.", settings.METRICS_DIR)
+
+
+def _snapshot():
+    """Returns the values of this process in a JSON-serializable form."""
+    return {
+        name: [[list(key), value] for key, value in metric.values.items()]
+        for name, metric in _registry.items()
+    }
+
+
+def flush():
+    """Writes the values of this process to its file in METRICS_DIR, if they have changed."""
+
+    global _dirty
+    directory = settings.METRICS_DIR
+    if not directory:
+        return
+
+    with _lock:
+        _check_fork()
+        if not _dirty:
+            return
+        data = json.dumps({"pid": _pid, "metrics": _snapshot()})
+        pid = _pid
+        _dirty = False
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{pid}.json")
+    # Written to a temporary file first, so that other processes never read
+    # a partly written file.
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+
+
+def is_running(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill() would stop the process.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect():
+    """
+    Returns the values of all the processes, as a dict of {label values:
+    value} dicts by metric name.
+    """
+
+    directory = settings.METRICS_DIR
+    if not directory:
+        with _lock:
+            _check_fork()
+            return {name: dict(metric.values) for name, metric in _registry.items()}
+
+    flush()
+    totals = {name: {} for name in _registry}
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        running = is_running(data["pid"])
+        for name, values in data["metrics"].items():
+            metric = _registry.get(name)
+            if metric is None or (metric.type == "gauge" and not running):
+                continue
+            for key, value in values:
+                key = tuple(key)
+                total = metric.merge(totals[name].get(key), value)
+                if total is not None:
+                    totals[name][key] = total
+    return totals
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def escape_label_value(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render():
+    """Returns the values of all the processes in the Prometheus text format."""
+
+    lines = []
+    for name, values in collect().items():
+        metric = _registry[name]
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for key, value in sorted(values.items()):
+            for sample_name, labels, sample_value in metric.samples(key, value):
+                if labels:
+                    label_text = ",".join(f'{label}="{escape_label_value(value)}"' for label, value in labels.items())
+                    sample_name = f"{sample_name}{{{label_text}}}"
+                lines.append(f"{sample_name} {format_value(sample_value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Buckets of durations in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+SEARCHES = Counter(
+    "archive_searches_total",
+    "Searches, by scope and query length.",
+    ["scope", "query_length"],
+)
+SEARCH_DURATION = Histogram(
+    "archive_search_duration_seconds",
+    "Time taken to search and render the results, by scope and query length.",
+    ["scope", "query_length"],
+    DURATION_BUCKETS,
+)
+SEARCH_HITS = Histogram(
+    "archive_search_hits",
+    "Number of items found by searches, by scope.",
+    ["scope"],
+    (0, 1, 10, 100, 1000, 10000, 100000),
+)
+CACHE_REQUESTS = Counter(
+    "archive_cache_requests_total",
+    "Lookups in the archive cache layer, by namespace and result (hit or miss).",
+    ["namespace", "result"],
+)
+IMPORTED_ROWS = Counter(
+    "archive_import_rows_total",
+    "Rows imported from uploaded files, by format.",
+    ["format"],
+)
+IMPORT_DURATION = Histogram(
+    "archive_import_duration_seconds",
+    "Time taken to parse and save uploaded files, by format.",
+    ["format"],
+    DURATION_BUCKETS,
+)
+QUEUED_JOBS = Gauge(
+    "archive_queued_jobs",
+    "Background jobs waiting or running.",
+)
@@ -0,0 +1,103 @@
+import asyncio
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .timing import finish_request, start_request
+
+# Types of content compressed by CompressionMiddleware. Other content (zip
+# files, images) is already compressed, or served compressed by WhiteNoise.
+COMPRESSED_CONTENT_TYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compresses text responses (mainly the HTML tables of the search results
+    and resource pages) with gzip if the browser accepts it.
+    Responses that are too short to benefit from compression are left as
+    they are by GZipMiddleware.
+    """
+
+    def process_response(self, request, response):
+        if getattr(response, "is_async", False):
+            # GZipMiddleware can only compress synchronous streaming content.
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in COMPRESSED_CONTENT_TYPES:
+            return response
+        return super().process_response(request, response)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that can also run in async mode (under config.asgi),
+    so that requests to async views are not passed through a thread.
+    Looking up a static file does not read the database, so it is done in the
+    event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if asyncio.iscoroutinefunction(get_response):
+            # Makes Django call this middleware as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        response = self.process_request(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+
+class TimingMiddleware:
+    """
+    Records the time spent in each request, in SQL queries and in template
+    rendering (see archive/timing.py), and logs it to the "archive.timing"
+    logger. The timings are also sent in a Server-Timing header (shown in the
+    network panel of the browser's developer tools) if settings.SERVER_TIMING
+    is set. The content of streaming responses is not included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Makes Django call this middleware as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        timings, token = start_request()
+        response = self.get_response(request)
+        return self.finish(request, response, timings, token)
+
+    async def __acall__(self, request):
+        timings, token = start_request()
+        response = await self.get_response(request)
+        return self.finish(request, response, timings, token)
+
+    def finish(self, request, response, timings, token):
+        server_timing = finish_request(request, response, timings, token)
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = server_timing
+        return response
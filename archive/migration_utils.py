@@ -0,0 +1,334 @@
+"""
+Helpers used by the migrations of the archive app.
+"""
+
+from django.db import NotSupportedError, transaction
+from django.db.migrations.operations import AddIndex
+
+# Number of ids of the batch model covered by each INSERT ... SELECT statement.
+DEFAULT_BATCH_SIZE = 5000
+
+
+class AddIndexOnline(AddIndex):
+    """
+    AddIndex operation that avoids locking the table for the whole migration.
+    On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY, so reads
+    and writes continue while it is being built. On other databases (SQLite)
+    each index is built in its own short transaction, so the write lock is
+    only held while that one index is built.
+    Migrations using this operation must set atomic = False.
+    """
+
+    def describe(self):
+        return "Create index %s online on %s" % (self.index.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._check_not_atomic(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._check_not_atomic(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                schema_editor.remove_index(model, self.index)
+
+    def _check_not_atomic(self, schema_editor):
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError(
+                "AddIndexOnline cannot be used in an atomic migration. "
+                "Set atomic = False on the migration."
+            )
+
+
+def id_batches(schema_editor, model, batch_size=DEFAULT_BATCH_SIZE, after=0):
+    """
+    Yields (first_id, last_id) tuples covering all the ids of model above
+    after in ranges of batch_size ids. Ranges with no rows are yielded too, so
+    the number of batches only depends on the lowest and highest ids.
+    """
+
+    table = schema_editor.quote_name(model._meta.db_table)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(id), MAX(id) FROM {table} WHERE id > %s", [after])
+        first_id, last_id = cursor.fetchone()
+
+    if first_id is None:
+        return
+
+    for start in range(first_id, last_id + 1, batch_size):
+        yield start, min(start + batch_size - 1, last_id)
+
+
+def insert_select(
+    schema_editor, model, columns, select_sql, batch_model, batch_size=DEFAULT_BATCH_SIZE, after=0, then=()
+):
+    """
+    Copies rows into the table of model with INSERT INTO ... SELECT statements,
+    so that no rows are loaded into Python.
+    select_sql is the SELECT part of the statement, returning the given
+    columns in order. It must contain two %s placeholders, which are given the
+    first and last ids of each batch of batch_model ids (above after). Each
+    batch is run in its own transaction (the migration should set
+    atomic = False), so the tables are only locked for a short time, and a
+    migration that is stopped part way can be run again if select_sql skips
+    rows already copied. The statements in then are run after each INSERT in
+    the same transaction, with the same parameters (e.g. to record what has
+    been copied).
+    Returns the number of rows inserted.
+    """
+
+    table = schema_editor.quote_name(model._meta.db_table)
+    column_list = ", ".join(schema_editor.quote_name(column) for column in columns)
+    sql = f"INSERT INTO {table} ({column_list}) {select_sql}"
+
+    inserted = 0
+    for first_id, last_id in id_batches(schema_editor, batch_model, batch_size, after):
+        with transaction.atomic(using=schema_editor.connection.alias):
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute(sql, [first_id, last_id])
+                inserted += max(cursor.rowcount, 0)
+                for then_sql in then:
+                    cursor.execute(then_sql, [first_id, last_id])
+    return inserted
+
+
+# Copying of the legacy models (Glossary, Entry, Translation and Segment) into
+# Resource and Item. Used by migrations 0036 to 0039, and again by 0043 before
+# the legacy tables are deleted, to copy anything added to them since.
+# What has been copied is recorded in two tables, which 0043 deletes:
+# - COPIED_RESOURCES maps the id of each copied glossary and translation to
+#   its resource, so a glossary or translation is only ever copied once (even
+#   if its resource is renamed or deleted afterwards), and its entries or
+#   segments are copied into that resource;
+# - COPIED_MARKS holds the last entry and segment id of each copied batch, so
+#   only entries and segments added afterwards are copied again. Items edited
+#   or deleted since are left as they are.
+# Legacy rows edited after being copied are not copied again.
+
+COPIED_RESOURCES = "archive_legacy_copied_resource"
+COPIED_MARKS = "archive_legacy_copied_mark"
+
+
+def create_copy_tables(schema_editor):
+    """Creates the tables recording what has been copied, if they do not exist."""
+
+    schema_editor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {COPIED_RESOURCES} (
+            legacy_table varchar(20) NOT NULL,
+            legacy_id integer NOT NULL,
+            resource_id bigint NOT NULL,
+            PRIMARY KEY (legacy_table, legacy_id)
+        )
+        """
+    )
+    schema_editor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {COPIED_MARKS} (
+            legacy_table varchar(20) NOT NULL,
+            last_id integer NOT NULL
+        )
+        """
+    )
+
+
+def copy_tables_exist(schema_editor):
+    return COPIED_MARKS in schema_editor.connection.introspection.table_names()
+
+
+def drop_copy_tables(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {COPIED_RESOURCES}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {COPIED_MARKS}")
+
+
+def last_copied_id(schema_editor, legacy_table):
+    """Returns the last copied id of the entries or segments (0 if none have been copied)."""
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MAX(last_id) FROM {COPIED_MARKS} WHERE legacy_table = %s", [legacy_table])
+        return cursor.fetchone()[0] or 0
+
+
+def resource_columns(Resource):
+    """
+    Returns the columns set when copying a glossary or translation, and the
+    SQL for the values of any columns added to Resource after migration 0039.
+    """
+    columns = [
+        "resource_type", "title", "field", "client", "translator", "notes",
+        "created_on", "created_by_id", "updated_on", "updated_by_id",
+    ]
+    extra_values = ""
+    if any(field.name == "item_count" for field in Resource._meta.fields):
+        # Set by the recount after the items have been copied.
+        columns.append("item_count")
+        extra_values = ", 0"
+    return columns, extra_values
+
+
+def copy_resources(schema_editor, Legacy, Resource, resource_type, legacy_table, values):
+    """
+    Copies the glossaries or translations not copied yet into resources of
+    resource_type, and records the resource of each. A glossary or translation
+    whose title is already used by a resource of the same type (or by an
+    earlier glossary or translation) is mapped to that resource instead.
+    values is the SQL of the values of resource_columns(), from the legacy
+    table aliased as l.
+    """
+
+    create_copy_tables(schema_editor)
+    columns, extra_values = resource_columns(Resource)
+    legacy = Legacy._meta.db_table
+    resources = Resource._meta.db_table
+    not_copied = f"""
+        NOT EXISTS (
+            SELECT 1 FROM {COPIED_RESOURCES} c
+            WHERE c.legacy_table = '{legacy_table}' AND c.legacy_id = l.id
+        )
+    """
+    insert_select(
+        schema_editor,
+        Resource,
+        columns,
+        f"""
+        SELECT {values}{extra_values}
+        FROM {legacy} l
+        WHERE l.id BETWEEN %s AND %s
+          AND {not_copied}
+          AND l.id = (SELECT MIN(l2.id) FROM {legacy} l2 WHERE l2.title = l.title)
+          AND NOT EXISTS (
+              SELECT 1 FROM {resources} r
+              WHERE r.resource_type = '{resource_type}' AND r.title = l.title
+          )
+        ORDER BY l.id
+        """,
+        batch_model=Legacy,
+        then=[
+            f"""
+            INSERT INTO {COPIED_RESOURCES} (legacy_table, legacy_id, resource_id)
+            SELECT '{legacy_table}', l.id, (
+                SELECT MIN(r.id) FROM {resources} r
+                WHERE r.resource_type = '{resource_type}' AND r.title = l.title
+            )
+            FROM {legacy} l
+            WHERE l.id BETWEEN %s AND %s AND {not_copied}
+            """
+        ],
+    )
+
+
+def copy_glossaries(apps, schema_editor):
+    copy_resources(
+        schema_editor,
+        apps.get_model("archive", "Glossary"),
+        apps.get_model("archive", "Resource"),
+        "GLOSSARY",
+        "glossary",
+        """
+        'GLOSSARY', l.title, '', '', '', l.notes,
+        l.created_on, l.created_by_id, l.updated_on, l.updated_by_id
+        """,
+    )
+
+
+def copy_translations(apps, schema_editor):
+    copy_resources(
+        schema_editor,
+        apps.get_model("archive", "Translation"),
+        apps.get_model("archive", "Resource"),
+        "TRANSLATION",
+        "translation",
+        """
+        'TRANSLATION', l.title, l.field, l.client, l.translator, l.notes,
+        l.created_on, l.created_by_id, l.created_on, l.created_by_id
+        """,
+    )
+
+
+def copy_items(schema_editor, Legacy, Item, legacy_table, select_sql):
+    """
+    Copies the entries or segments added since the last copy (of ids above
+    the last recorded mark) into items of the resources recorded for their
+    glossaries or translations, and records the mark of each batch.
+    Entries and segments of glossaries and translations whose resources have
+    been deleted are not copied.
+    """
+
+    create_copy_tables(schema_editor)
+    insert_select(
+        schema_editor,
+        Item,
+        [
+            "resource_id", "source", "target", "notes",
+            "created_on", "created_by_id", "updated_on", "updated_by_id",
+        ],
+        select_sql,
+        batch_model=Legacy,
+        after=last_copied_id(schema_editor, legacy_table),
+        then=[
+            f"""
+            INSERT INTO {COPIED_MARKS} (legacy_table, last_id)
+            SELECT '{legacy_table}', MAX(id) FROM {Legacy._meta.db_table}
+            WHERE id BETWEEN %s AND %s
+            HAVING MAX(id) IS NOT NULL
+            """
+        ],
+    )
+
+
+def copy_entries(apps, schema_editor):
+    Entry = apps.get_model("archive", "Entry")
+    Resource = apps.get_model("archive", "Resource")
+    Item = apps.get_model("archive", "Item")
+
+    copy_items(
+        schema_editor,
+        Entry,
+        Item,
+        "entry",
+        f"""
+        SELECT r.id, e.source, e.target, e.notes,
+               e.created_on, e.created_by_id, e.updated_on, e.updated_by_id
+        FROM {Entry._meta.db_table} e
+        JOIN {COPIED_RESOURCES} c ON c.legacy_table = 'glossary' AND c.legacy_id = e.glossary_id
+        JOIN {Resource._meta.db_table} r ON r.id = c.resource_id
+        WHERE e.id BETWEEN %s AND %s
+        ORDER BY e.id
+        """,
+    )
+
+
+def copy_segments(apps, schema_editor):
+    Segment = apps.get_model("archive", "Segment")
+    Resource = apps.get_model("archive", "Resource")
+    Item = apps.get_model("archive", "Item")
+
+    # Segments have no dates or users of their own, so those of the
+    # resource are used.
+    copy_items(
+        schema_editor,
+        Segment,
+        Item,
+        "segment",
+        f"""
+        SELECT r.id, s.source, s.target, '',
+               r.created_on, r.created_by_id, r.updated_on, r.updated_by_id
+        FROM {Segment._meta.db_table} s
+        JOIN {COPIED_RESOURCES} c ON c.legacy_table = 'translation' AND c.legacy_id = s.translation_id
+        JOIN {Resource._meta.db_table} r ON r.id = c.resource_id
+        WHERE s.id BETWEEN %s AND %s
+        ORDER BY s.id
+        """,
+    )
@@ -2,30 +2,17 @@
 
 from django.db import migrations
 
-
-def add_glossaries_as_resources(apps, schema_editor):
-
-    Glossary = apps.get_model("archive", "Glossary")
-    Resource = apps.get_model("archive", "Resource")
-
-    for glossary in Glossary.objects.all():
-        resource = Resource(
-            resource_type="GLOSSARY",
-            title=glossary.title,
-            notes=glossary.notes,
-            created_on=glossary.created_on,
-            created_by=glossary.created_by,
-            updated_on=glossary.updated_on,
-            updated_by=glossary.updated_by,
-        )
-        resource.save()
+from archive.migration_utils import copy_glossaries
 
 
 class Migration(migrations.Migration):
+    # The rows are copied in batches, each in its own transaction.
+    atomic = False
+
     dependencies = [
         ("archive", "0035_resource_item"),
     ]
 
     operations = [
-        migrations.RunPython(add_glossaries_as_resources)
+        migrations.RunPython(copy_glossaries, migrations.RunPython.noop)
     ]
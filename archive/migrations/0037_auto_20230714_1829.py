@@ -2,33 +2,17 @@
 
 from django.db import migrations
 
-
-def add_translations_as_resources(apps, schema_editor):
-
-    Translation = apps.get_model("archive", "Translation")
-    Resource = apps.get_model("archive", "Resource")
-
-    for translation in Translation.objects.all():
-        resource = Resource(
-            resource_type="TRANSLATION",
-            title=translation.title,
-            field=translation.field,
-            client=translation.client,
-            translator=translation.translator,
-            notes=translation.notes,
-            created_on=translation.created_on,
-            created_by=translation.created_by,
-            updated_on=translation.created_on,
-            updated_by=translation.created_by,
-        )
-        resource.save()
+from archive.migration_utils import copy_translations
 
 
 class Migration(migrations.Migration):
+    # The rows are copied in batches, each in its own transaction.
+    atomic = False
+
     dependencies = [
         ("archive", "0036_auto_20230714_1753"),
     ]
 
     operations = [
-        migrations.RunPython(add_translations_as_resources)
+        migrations.RunPython(copy_translations, migrations.RunPython.noop)
     ]
@@ -2,32 +2,17 @@
 
 from django.db import migrations
 
-
-def add_segments_as_items(apps, schema_editor):
-
-    Item = apps.get_model("archive", "Item")
-    Segment = apps.get_model("archive", "Segment")
-    Resource = apps.get_model("archive", "Resource")
-
-    for segment in Segment.objects.all():
-        resource = Resource.objects.get(title=segment.translation.title)
-        item = Item(
-            resource=resource,
-            source=segment.source,
-            target=segment.target,
-            created_on=resource.created_on,
-            created_by=resource.created_by,
-            updated_on=resource.updated_on,
-            updated_by=resource.updated_by,
-        )
-        item.save()
+from archive.migration_utils import copy_segments
 
 
 class Migration(migrations.Migration):
+    # The rows are copied in batches, each in its own transaction.
+    atomic = False
+
     dependencies = [
         ("archive", "0038_auto_20230715_1004"),
     ]
 
     operations = [
-        migrations.RunPython(add_segments_as_items)
+        migrations.RunPython(copy_segments, migrations.RunPython.noop)
     ]
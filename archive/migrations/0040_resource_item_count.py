@@ -0,0 +1,40 @@
+# Generated by Django 4.1.3 on 2026-10-19 15:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_items(apps, schema_editor):
+    """
+    Sets the item_count of every existing resource with a single UPDATE.
+    """
+
+    Item = apps.get_model("archive", "Item")
+    Resource = apps.get_model("archive", "Resource")
+
+    counts = (
+        Item.objects
+        .filter(resource=OuterRef("pk"))
+        .order_by()
+        .values("resource")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Resource.objects.update(item_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0039_auto_20230715_1110"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_items, migrations.RunPython.noop),
+    ]
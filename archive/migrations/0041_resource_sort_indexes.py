@@ -0,0 +1,40 @@
+# Generated by Django 4.1.3 on 2026-10-19 15:21
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+from archive.migration_utils import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built one at a time outside of a single transaction, so
+    # that the table is not locked while all of them are built
+    # (see AddIndexOnline).
+    atomic = False
+
+    dependencies = [
+        ("archive", "0040_resource_item_count"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="resource",
+            index=models.Index(
+                django.db.models.functions.text.Lower("title"), models.F("id"), name="resource_title_lower_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="resource",
+            index=models.Index(
+                models.F("resource_type"),
+                django.db.models.functions.text.Lower("title"),
+                models.F("id"),
+                name="resource_type_title_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="resource",
+            index=models.Index(fields=["created_on", "id"], name="resource_created_on_idx"),
+        ),
+    ]
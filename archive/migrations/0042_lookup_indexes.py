@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+from archive.migration_utils import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built one at a time outside of a single transaction, so
+    # that the tables are not locked while all of them are built
+    # (see AddIndexOnline).
+    atomic = False
+
+    dependencies = [
+        ("archive", "0041_resource_sort_indexes"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="resource",
+            index=models.Index(fields=["title"], name="resource_title_idx"),
+        ),
+        AddIndexOnline(
+            model_name="item",
+            index=models.Index(fields=["updated_on"], name="item_updated_on_idx"),
+        ),
+    ]
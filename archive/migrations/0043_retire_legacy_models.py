@@ -0,0 +1,68 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from archive.migration_utils import (copy_entries, copy_glossaries,
+                                     copy_segments, copy_tables_exist,
+                                     copy_translations, drop_copy_tables)
+
+
+def copy_remaining_legacy_data(apps, schema_editor):
+    """
+    Copies anything added to the legacy tables since migrations 0036 to 0039
+    were run, before the tables are deleted.
+    Databases copied by earlier versions of those migrations have no record of
+    what was copied, so nothing is copied again there.
+    """
+    if not copy_tables_exist(schema_editor):
+        return
+    copy_glossaries(apps, schema_editor)
+    copy_translations(apps, schema_editor)
+    copy_entries(apps, schema_editor)
+    copy_segments(apps, schema_editor)
+
+
+def recount_items(apps, schema_editor):
+    """
+    Updates the item_count of every resource, in case items were copied above.
+    """
+
+    Item = apps.get_model("archive", "Item")
+    Resource = apps.get_model("archive", "Resource")
+
+    counts = (
+        Item.objects
+        .filter(resource=OuterRef("pk"))
+        .order_by()
+        .values("resource")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Resource.objects.update(item_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+    # The rows are copied in batches, each in its own transaction.
+    atomic = False
+
+    dependencies = [
+        ("archive", "0042_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_remaining_legacy_data, migrations.RunPython.noop),
+        migrations.RunPython(recount_items, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name="Entry",
+        ),
+        migrations.DeleteModel(
+            name="Segment",
+        ),
+        migrations.DeleteModel(
+            name="Glossary",
+        ),
+        migrations.DeleteModel(
+            name="Translation",
+        ),
+        migrations.RunPython(drop_copy_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.3 on 2026-10-19 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0043_retire_legacy_models"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="pending_deletion",
+            field=models.BooleanField(default=False),
+        ),
+    ]
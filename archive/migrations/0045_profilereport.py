@@ -0,0 +1,51 @@
+# Generated by Django 4.1.3 on 2026-10-19 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("archive", "0044_resource_pending_deletion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileReport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.TextField()),
+                ("status_code", models.PositiveSmallIntegerField()),
+                ("duration_ms", models.FloatField()),
+                ("query_count", models.PositiveIntegerField()),
+                ("sql_ms", models.FloatField()),
+                ("functions", models.TextField(blank=True)),
+                ("queries", models.JSONField(default=list)),
+                ("stats", models.BinaryField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="profile_reports",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "profile report",
+                "verbose_name_plural": "profile reports",
+                "ordering": ["-created_on"],
+            },
+        ),
+    ]
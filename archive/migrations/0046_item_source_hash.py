@@ -0,0 +1,51 @@
+# Generated by Django 4.1.3 on 2026-10-19 16:01
+
+from django.db import migrations, models, transaction
+
+from archive.migration_utils import AddIndexOnline, id_batches
+from archive.term_index import segment_hash
+
+
+def hash_sources(apps, schema_editor):
+    """
+    Sets the source_hash of the existing items, one batch of ids per
+    transaction so that the table is only locked for a short time.
+    """
+
+    Item = apps.get_model("archive", "Item")
+
+    for first_id, last_id in id_batches(schema_editor, Item):
+        with transaction.atomic(using=schema_editor.connection.alias):
+            items = list(
+                Item.objects
+                .filter(id__range=(first_id, last_id), source_hash="")
+                .exclude(source="")
+                .only("id", "source")
+            )
+            for item in items:
+                item.source_hash = segment_hash(item.source)
+            Item.objects.bulk_update(items, ["source_hash"])
+
+
+class Migration(migrations.Migration):
+
+    # The hashes are set in batches and the index is built outside of a
+    # single transaction (see AddIndexOnline).
+    atomic = False
+
+    dependencies = [
+        ("archive", "0045_profilereport"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="source_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=40),
+        ),
+        migrations.RunPython(hash_sources, migrations.RunPython.noop),
+        AddIndexOnline(
+            model_name="item",
+            index=models.Index(fields=["source_hash"], name="item_source_hash_idx"),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.1.3 on 2026-10-19 16:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("archive", "0046_item_source_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GlossaryCheck",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "待機中"),
+                            ("RUNNING", "実行中"),
+                            ("DONE", "完了"),
+                            ("FAILED", "失敗"),
+                        ],
+                        default="PENDING",
+                        max_length=10,
+                    ),
+                ),
+                ("item_count", models.PositiveIntegerField(default=0)),
+                ("issue_count", models.PositiveIntegerField(default=0)),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("finished_on", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="glossary_checks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "glossaries",
+                    models.ManyToManyField(related_name="+", to="archive.resource"),
+                ),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="glossary_checks",
+                        to="archive.resource",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "glossary check",
+                "verbose_name_plural": "glossary checks",
+                "ordering": ["-created_on"],
+            },
+        ),
+        migrations.CreateModel(
+            name="GlossaryCheckIssue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("term_source", models.TextField()),
+                ("term_target", models.TextField()),
+                ("glossary_title", models.CharField(max_length=100)),
+                (
+                    "glossary_check",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="issues",
+                        to="archive.glossarycheck",
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="archive.item",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "glossary check issue",
+                "verbose_name_plural": "glossary check issues",
+                "ordering": ["item_id", "id"],
+            },
+        ),
+    ]
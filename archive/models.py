@@ -1,134 +1,132 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Lower
 from django.urls import reverse
 
+from . import cache as archive_cache
+from .term_index import segment_hash
 
-class Glossary(models.Model):
-    glossary_file = models.FileField(
-        null=True,
-        upload_to="glossary_files",
-    )
-    title = models.CharField(max_length=100)
-    notes = models.TextField(blank=True)
-    type = models.CharField(max_length=10)
-
-    created_on = models.DateTimeField(auto_now_add=True)
-    created_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        related_name="created_glossaries",
-        null=True,
-        on_delete=models.SET_NULL,
-    )
-    updated_on = models.DateTimeField(auto_now=True)
-    updated_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        related_name="updated_glossaries",
-        null=True,
-        on_delete=models.SET_NULL,
-    )
 
-    class Meta:
-        verbose_name = "glossary"
-        verbose_name_plural = "glossaries"
-
-    def __str__(self):
-        return self.title
-
-    def get_absolute_url(self):
-        return reverse("glossary_detail", args=[str(self.id)])
-
-
-class Entry(models.Model):
-    glossary = models.ForeignKey(
-        Glossary,
-        related_name="entries",
-        on_delete=models.CASCADE,
-        null=True,
-        blank=True,
-    )
-    source = models.CharField(max_length=255)
-    target = models.CharField(max_length=255)
-    notes = models.TextField(blank=True)
-
-    created_on = models.DateTimeField(auto_now_add=True)
-    created_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        related_name="created_entries",
-        null=True,
-        on_delete=models.SET_NULL,
-    )
-    updated_on = models.DateTimeField(auto_now=True)
-    updated_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        related_name="updated_entries",
-        null=True,
-        on_delete=models.SET_NULL,
-    )
-
-    class Meta:
-        verbose_name = "entry"
-        verbose_name_plural = "entries"
-
-    def __str__(self):
-        return f"{self.source} : {self.target}"
-
-
-class Translation(models.Model):
-    translation_file = models.FileField(
-        null=True,
-        upload_to="translation_files",
-    )
-    title = models.CharField(max_length=100)
-    field = models.CharField(max_length=100, blank=True)
-    client = models.CharField(max_length=100, blank=True)
-    translator = models.CharField(max_length=100, blank=True)
-    type = models.CharField(max_length=10)
-    notes = models.TextField(blank=True)
-
-    created_on = models.DateTimeField(auto_now_add=True)
-    created_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        related_name="created_translations",
-        null=True,
-        on_delete=models.SET_NULL,
-    )
-
-    class Meta:
-        verbose_name = "translation"
-        verbose_name_plural = "translations"
+def archive_generation():
+    """
+    Returns a number that changes whenever resources or items are saved or
+    deleted. Used in the ETags of pages showing archive data (see
+    archive/conditional.py).
+    """
+    return archive_cache.get_generation(archive_cache.ARCHIVE)
 
-    def __str__(self):
-        return self.title
 
-    def get_absolute_url(self):
-        return reverse("translation_detail", args=[str(self.id)])
+def mark_archive_changed():
+    archive_cache.invalidate(archive_cache.ARCHIVE)
 
 
-class Segment(models.Model):
+def clear_archive_stats():
     """
-    Model for a translation segment, i.e. a pair of source and target
-    strings. Used as a child model of the Translation model.
+    Invalidates the cached archive-wide statistics. Called whenever resources
+    or items are created or deleted (including in bulk), so the archive is
+    also marked as changed.
     """
-
-    translation = models.ForeignKey(
-        Translation,
-        related_name="segments",
-        on_delete=models.CASCADE,
-        null=True,
-        blank=True,
-    )
-    source = models.TextField(blank=True)
-    target = models.TextField(blank=True)
-
-    class Meta:
-        verbose_name = "segment"
-        verbose_name_plural = "segments"
-
-    def __str__(self):
-        return f"{self.source} : {self.target}"
+    archive_cache.invalidate(archive_cache.STATS)
+    mark_archive_changed()
 
 
-# --- New models below ---
+def clear_navbar_resources():
+    """
+    Invalidates the cached resource titles listed in the navbar search form.
+    Called whenever resources are created, renamed or deleted.
+    """
+    archive_cache.invalidate(archive_cache.NAVBAR)
+
+
+class ResourceManager(models.Manager):
+
+    def get_queryset(self):
+        """
+        Overridden to leave out resources that are being deleted (see
+        archive/deletion.py). Resource.all_objects includes them.
+        """
+        return super().get_queryset().filter(pending_deletion=False)
+
+    def archive_stats(self):
+        """
+        Returns a dict of the numbers of resources and items in the archive,
+        by type. Calculated with a single aggregate query over the Resource
+        table (using the item_count column), and cached until the next
+        change to the archive.
+        """
+
+        def calculate():
+            glossaries = Q(resource_type="GLOSSARY")
+            translations = Q(resource_type="TRANSLATION")
+            return self.aggregate(
+                num_of_resources=Count("id"),
+                num_of_glossaries=Count("id", filter=glossaries),
+                num_of_translations=Count("id", filter=translations),
+                num_of_all_entries=Coalesce(Sum("item_count"), 0),
+                num_of_gloss_entries=Coalesce(Sum("item_count", filter=glossaries), 0),
+                num_of_trans_segments=Coalesce(Sum("item_count", filter=translations), 0),
+            )
+
+        return archive_cache.get_or_set(archive_cache.STATS, "archive_stats", calculate)
+
+    def navbar_resources(self):
+        """
+        Returns a dict with the titles of all glossaries and all translations,
+        each sorted alphabetically (ignoring case), used for the resource
+        drop-down list in the navbar search form.
+        Cached until a resource is created, renamed or deleted.
+        """
+
+        def calculate():
+            resources = {"glossaries": [], "translations": []}
+            rows = self.order_by(Lower("title")).values_list("resource_type", "title")
+            for resource_type, title in rows:
+                if resource_type == "GLOSSARY":
+                    resources["glossaries"].append(title)
+                elif resource_type == "TRANSLATION":
+                    resources["translations"].append(title)
+            return resources
+
+        return archive_cache.get_or_set(archive_cache.NAVBAR, "resources", calculate)
+
+    def with_title(self, title, resource_type=None):
+        """
+        Returns the resources whose title is the same as title, ignoring case.
+        Compares the lower-cased titles (instead of using title__iexact) so
+        that the index on resource type and lower-cased title is used.
+        """
+        queryset = self.annotate(lower_title=Lower("title")).filter(
+            lower_title=Lower(Value(title))
+        )
+        if resource_type:
+            queryset = queryset.filter(resource_type=resource_type)
+        return queryset
+
+    def adjust_item_count(self, resource_id, delta):
+        """
+        Adds delta to the item_count of a resource. Done with an UPDATE
+        statement (F expression) so that concurrent changes are not lost.
+        """
+        self.filter(pk=resource_id).update(item_count=F("item_count") + delta)
+        clear_archive_stats()
+
+    def recount_items(self):
+        """
+        Recalculates the item_count of every resource from the Item table.
+        Only needed when items have been added or deleted without going
+        through Item.save(), Item.delete() or adjust_item_count().
+        """
+        counts = (
+            Item.objects
+            .filter(resource=OuterRef("pk"))
+            .order_by()
+            .values("resource")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        self.update(item_count=Coalesce(Subquery(counts), 0))
+        clear_archive_stats()
 
 
 class Resource(models.Model):
@@ -153,6 +151,11 @@ class Resource(models.Model):
     translator = models.CharField(max_length=100, blank=True)
     notes = models.TextField(blank=True)
 
+    # Number of Item objects belonging to this resource. Stored to avoid
+    # counting the items every time a page is displayed. Kept up to date by
+    # Item.save(), Item.delete() and ResourceManager.adjust_item_count().
+    item_count = models.PositiveIntegerField(default=0)
+
     created_on = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -168,9 +171,27 @@ class Resource(models.Model):
         on_delete=models.SET_NULL,
     )
 
+    # Set when the resource is to be deleted, so that it is hidden while its
+    # items are being deleted.
+    pending_deletion = models.BooleanField(default=False)
+
+    objects = ResourceManager()
+    all_objects = models.Manager()
+
     class Meta:
         verbose_name = "resource"
         verbose_name_plural = "resources"
+        # Indexes used for sorting the table on the homepage, for the
+        # resource lists and title checks (with_title()), and for searching
+        # a specific resource by its title.
+        indexes = [
+            models.Index(Lower("title"), F("id"), name="resource_title_lower_idx"),
+            models.Index(
+                "resource_type", Lower("title"), F("id"), name="resource_type_title_idx"
+            ),
+            models.Index(fields=["created_on", "id"], name="resource_created_on_idx"),
+            models.Index(fields=["title"], name="resource_title_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -178,6 +199,68 @@ class Resource(models.Model):
     def get_absolute_url(self):
         return reverse("resource_detail", args=[str(self.id)])
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Overridden to remember the title and type of the resource when loaded,
+        so that the navbar resource list is only cleared when they change.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title = instance.__dict__.get("title")
+        instance._loaded_resource_type = instance.__dict__.get("resource_type")
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        renamed = (
+            getattr(self, "_loaded_title", None) != self.title
+            or getattr(self, "_loaded_resource_type", None) != self.resource_type
+        )
+        super().save(*args, **kwargs)
+        mark_archive_changed()
+        if adding:
+            clear_archive_stats()
+        if adding or renamed:
+            clear_navbar_resources()
+        self._loaded_title = self.title
+        self._loaded_resource_type = self.resource_type
+
+    def delete(self, *args, **kwargs):
+        # Items are deleted by cascade, so their count is removed together
+        # with the resource.
+        result = super().delete(*args, **kwargs)
+        clear_archive_stats()
+        clear_navbar_resources()
+        return result
+
+
+class ItemManager(models.Manager):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Overridden to set the source_hash of the items, since bulk_create()
+        does not call Item.save().
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.source_hash = segment_hash(obj.source)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def fill_source_hashes(self, batch_size=5000):
+        """
+        Sets the source_hash of the items inserted without it (e.g. restored
+        from a snapshot with raw INSERT statements).
+        """
+        items = self.filter(source_hash="").exclude(source="").only("id", "source")
+        batch = []
+        for item in items.iterator(chunk_size=batch_size):
+            item.source_hash = segment_hash(item.source)
+            batch.append(item)
+            if len(batch) == batch_size:
+                self.bulk_update(batch, ["source_hash"])
+                batch = []
+        self.bulk_update(batch, ["source_hash"])
+
 
 class Item(models.Model):
 
@@ -193,6 +276,10 @@ class Item(models.Model):
     target = models.TextField(blank=True)
     notes = models.TextField(blank=True)
 
+    # Hash of the normalized source text, used to find exact matches of
+    # segments when pre-translating documents (see archive/pretranslation.py).
+    source_hash = models.CharField(max_length=40, blank=True, default="", editable=False)
+
     created_on = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -208,12 +295,207 @@ class Item(models.Model):
         on_delete=models.SET_NULL,
     )
 
+    objects = ItemManager()
+
     class Meta:
         verbose_name = "item"
         verbose_name_plural = "items"
+        indexes = [
+            models.Index(fields=["updated_on"], name="item_updated_on_idx"),
+            models.Index(fields=["source_hash"], name="item_source_hash_idx"),
+        ]
 
     def __str__(self):
         return f"{self.source} : {self.target}"
 
     def get_absolute_url(self):
         return reverse("item_detail", args=[str(self.id)])
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Overridden to remember the resource the item belonged to when loaded,
+        so that the item counts can be updated if the resource is changed.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_resource_id = instance.__dict__.get("resource_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Overridden to keep Resource.item_count up to date when an item is
+        created or moved to a different resource, and to set source_hash.
+        """
+        self.source_hash = segment_hash(self.source)
+        if self._state.adding:
+            previous_resource_id = None
+        else:
+            previous_resource_id = getattr(self, "_loaded_resource_id", self.resource_id)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous_resource_id != self.resource_id:
+                if previous_resource_id:
+                    Resource.objects.adjust_item_count(previous_resource_id, -1)
+                if self.resource_id:
+                    Resource.objects.adjust_item_count(self.resource_id, 1)
+        mark_archive_changed()
+
+        self._loaded_resource_id = self.resource_id
+
+    def delete(self, *args, **kwargs):
+        """
+        Overridden to keep Resource.item_count up to date.
+        Note that QuerySet.delete() does not call this method, so
+        ResourceManager.adjust_item_count() must be called when deleting items
+        in bulk.
+        """
+        resource_id = self.resource_id
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if resource_id:
+                Resource.objects.adjust_item_count(resource_id, -1)
+        return result
+
+
+class ProfileReport(models.Model):
+    """
+    Profile of one request, captured for a staff user with ?profile=1 (see
+    archive/profiling.py). Viewed and downloaded from the admin.
+    """
+
+    created_on = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="profile_reports",
+        null=True,
+        on_delete=models.SET_NULL,
+    )
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    sql_ms = models.FloatField()
+
+    # Functions with the highest cumulative time, as printed by pstats.
+    functions = models.TextField(blank=True)
+    # Slowest queries (list of {"sql", "params", "duration_ms", "plan"}).
+    queries = models.JSONField(default=list)
+    # Output of pstats.Stats.dump_stats(), for tools such as snakeviz.
+    stats = models.BinaryField(blank=True)
+
+    class Meta:
+        verbose_name = "profile report"
+        verbose_name_plural = "profile reports"
+        ordering = ["-created_on"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    def as_text(self):
+        """Returns the report as plain text (downloaded from the admin)."""
+
+        lines = [
+            f"{self.method} {self.path}",
+            f"Status: {self.status_code}",
+            f"Date: {self.created_on:%Y-%m-%d %H:%M:%S}",
+            f"User: {self.user}",
+            f"Duration: {self.duration_ms:.1f} ms",
+            f"SQL: {self.query_count} queries, {self.sql_ms:.1f} ms",
+            "",
+            "Slowest queries",
+            "===============",
+        ]
+        for number, query in enumerate(self.queries, start=1):
+            lines += [
+                "",
+                f"{number}. {query['duration_ms']:.2f} ms",
+                query["sql"],
+                f"Params: {query['params']}",
+                "Plan:",
+                query["plan"],
+            ]
+        lines += ["", "Functions", "=========", self.functions]
+        return "\n".join(lines)
+
+
+class GlossaryCheck(models.Model):
+    """
+    Check of the items of a translation against glossaries (see
+    archive/glossary_check.py). Run in the background, and reports each item
+    whose source contains a glossary term but whose target does not contain
+    the translation of the term.
+    """
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    STATUSES = (
+        (PENDING, "待機中"),
+        (RUNNING, "実行中"),
+        (DONE, "完了"),
+        (FAILED, "失敗"),
+    )
+
+    resource = models.ForeignKey(
+        Resource,
+        related_name="glossary_checks",
+        on_delete=models.CASCADE,
+    )
+    glossaries = models.ManyToManyField(Resource, related_name="+")
+    status = models.CharField(choices=STATUSES, max_length=10, default=PENDING)
+    item_count = models.PositiveIntegerField(default=0)
+    issue_count = models.PositiveIntegerField(default=0)
+
+    created_on = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="glossary_checks",
+        null=True,
+        on_delete=models.SET_NULL,
+    )
+    finished_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "glossary check"
+        verbose_name_plural = "glossary checks"
+        ordering = ["-created_on"]
+
+    def __str__(self):
+        return f"{self.resource} ({self.get_status_display()})"
+
+    def get_absolute_url(self):
+        return reverse("glossary_check_detail", args=[str(self.id)])
+
+    @property
+    def finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+
+class GlossaryCheckIssue(models.Model):
+    """
+    Item reported by a GlossaryCheck: its source contains the glossary term
+    term_source, but its target contains none of the translations of the
+    term (term_target, separated by " / " if the glossaries give several).
+    """
+
+    glossary_check = models.ForeignKey(
+        GlossaryCheck,
+        related_name="issues",
+        on_delete=models.CASCADE,
+    )
+    item = models.ForeignKey(
+        Item,
+        related_name="+",
+        on_delete=models.CASCADE,
+    )
+    term_source = models.TextField()
+    term_target = models.TextField()
+    glossary_title = models.CharField(max_length=100)
+
+    class Meta:
+        verbose_name = "glossary check issue"
+        verbose_name_plural = "glossary check issues"
+        ordering = ["item_id", "id"]
@@ -0,0 +1,289 @@
+"""
+Pre-translation of documents against the archive.
+
+An uploaded TMX or DOCX file is split into segments, and each distinct
+segment is looked up once:
+- exact matches among the items of all translations, by Item.source_hash,
+  with one query per batch of segments;
+- fuzzy matches, by streaming the items of all translations (of lengths that
+  can reach the threshold) past an n-gram index of the segments without an
+  exact match, scored in parallel by settings.PRETRANSLATE_WORKERS processes;
+- glossary terms, with an Aho-Corasick index of all glossary items that is
+  cached until the archive changes.
+The results are written to a file of the same format as the upload (see
+stream_tmx() and build_docx()).
+"""
+
+import re
+import tempfile
+import zipfile
+from collections import namedtuple
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.db.models.functions import Length
+from docx import Document
+from translate.storage.tmx import tmxfile
+
+from . import cache as archive_cache
+from .models import Item, archive_generation
+from .term_index import MIN_TERM_LENGTH, NgramIndex, TermIndex, normalize, segment_hash
+
+# Number of segment hashes looked up by each exact match query (below the
+# SQLite limit of 999 query parameters).
+EXACT_BATCH_SIZE = 500
+
+# Number of archive items sent to a worker process at a time for fuzzy matching.
+FUZZY_CHUNK_SIZE = 5000
+
+# Texts in the database can be longer than their normalized form (runs of
+# whitespace, half-width katakana with voiced sound marks) or shorter (NFKC
+# expansions such as ㍿), so the length range of fuzzy match candidates is
+# widened by this factor when filtering on the raw texts. The exact range is
+# then checked on the normalized texts (see NgramIndex.best_matches()).
+RAW_LENGTH_FACTOR = 2
+
+# Number of segments written between each chunk of a TMX file being sent.
+TMX_CHUNK_SIZE = 500
+
+# Paragraphs of DOCX files without a table are split into sentences after
+# Japanese sentence endings, and after English ones followed by whitespace.
+SENTENCE_END = re.compile(r"(?<=[。！？])|(?<=[.!?])\s+")
+
+# Best match of a segment. score is 1 for exact matches and None if nothing
+# was found, and source is the matching archive text. terms is a list of
+# (glossary source, glossary target, glossary title) tuples.
+Match = namedtuple("Match", ["score", "source", "target", "terms"])
+
+# Segments of an uploaded file, with its format and (for TMX files) languages.
+SourceDocument = namedtuple("SourceDocument", ["format", "segments", "source_language", "target_language"])
+
+
+class PretranslationError(Exception):
+    pass
+
+
+def read_document(upload_file):
+    """
+    Returns the segments of an uploaded TMX or DOCX file.
+    The segments of a TMX file are the sources of its translation units. The
+    segments of a DOCX file are the cells of the first column of its first
+    table (as for translation uploads), or if it has no table, the sentences
+    of its paragraphs.
+    """
+
+    try:
+        if upload_file.name.lower().endswith(".tmx"):
+            tmx_file = tmxfile(upload_file)
+            return SourceDocument(
+                "tmx",
+                [unit.source or "" for unit in tmx_file.unit_iter()],
+                tmx_file.sourcelanguage or "ja",
+                tmx_file.targetlanguage or "en",
+            )
+
+        document = Document(upload_file)
+    except (zipfile.BadZipFile, KeyError, ValueError, SyntaxError) as e:
+        raise PretranslationError("選択したファイルを読み込めませんでした。") from e
+
+    if document.tables:
+        segments = [row.cells[0].text for row in document.tables[0].rows if row.cells]
+    else:
+        segments = [
+            sentence.strip()
+            for paragraph in document.paragraphs
+            for sentence in SENTENCE_END.split(paragraph.text)
+            if sentence.strip()
+        ]
+    return SourceDocument("docx", segments, "ja", "en")
+
+
+def pretranslate(segments, threshold, workers=None):
+    """
+    Returns a dict of the Match of each distinct normalized segment.
+    threshold is the lowest score of fuzzy matches (between 0 and 1).
+    """
+
+    if workers is None:
+        workers = settings.PRETRANSLATE_WORKERS
+
+    unique = list(dict.fromkeys(normalize(segment) for segment in segments))
+    unique = [segment for segment in unique if segment]
+
+    exact = exact_matches(unique)
+    remaining = [segment for segment in unique if segment not in exact]
+    fuzzy = fuzzy_matches(remaining, threshold, workers)
+    terms = glossary_terms(unique)
+
+    matches = {}
+    for segment in unique:
+        if segment in exact:
+            score, source, target = 1, segment, exact[segment]
+        else:
+            score, source, target = fuzzy.get(segment, (None, "", ""))
+        matches[segment] = Match(score, source, target, terms[segment])
+    return matches
+
+
+def translation_items():
+    """Returns the items of all translations that can be used as matches."""
+    return (
+        Item.objects
+        .filter(resource__resource_type="TRANSLATION", resource__pending_deletion=False)
+        .exclude(target="")
+    )
+
+
+def exact_matches(segments):
+    """
+    Returns {segment: target} of the segments found in translations, using the
+    most recently updated item when a segment has been translated more than once.
+    """
+
+    hashes = {segment_hash(segment): segment for segment in segments}
+    found = {}
+    keys = list(hashes)
+    for start in range(0, len(keys), EXACT_BATCH_SIZE):
+        rows = (
+            translation_items()
+            .filter(source_hash__in=keys[start:start + EXACT_BATCH_SIZE])
+            .order_by("-updated_on", "-id")
+            .values_list("source_hash", "target")
+        )
+        for source_hash, target in rows:
+            found.setdefault(hashes[source_hash], target)
+    return found
+
+
+def fuzzy_matches(segments, threshold, workers):
+    """Returns {segment: (score, source, target)} of the best fuzzy match of each segment."""
+
+    if not segments:
+        return {}
+
+    index = NgramIndex(segments, threshold)
+    shortest, longest = index.length_range()
+    rows = (
+        translation_items()
+        .annotate(source_length=Length("source"))
+        .filter(source_length__range=(shortest // RAW_LENGTH_FACTOR, longest * RAW_LENGTH_FACTOR))
+        .values_list("source", "target")
+        .iterator(chunk_size=FUZZY_CHUNK_SIZE)
+    )
+    best = index.best_matches_in_parallel(chunks(rows, FUZZY_CHUNK_SIZE), workers)
+    return {index.segments[number]: match for number, match in best.items()}
+
+
+def chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def glossary_term_index():
+    """
+    Returns the TermIndex of the glossary items, and for each of its terms,
+    the list of (source, target, glossary title) of the items having that
+    source. Cached until the archive changes.
+    """
+
+    def build():
+        entries = {}
+        rows = (
+            Item.objects
+            .filter(resource__resource_type="GLOSSARY", resource__pending_deletion=False)
+            .exclude(source="")
+            .exclude(target="")
+            .order_by("resource__title", "id")
+            .values_list("source", "target", "resource__title")
+        )
+        for source, target, title in rows.iterator(chunk_size=FUZZY_CHUNK_SIZE):
+            term = normalize(source).lower()
+            if len(term) >= MIN_TERM_LENGTH:
+                entries.setdefault(term, []).append((source, target, title))
+        return TermIndex(entries), list(entries.values())
+
+    return archive_cache.get_or_set(archive_cache.TERM_INDEX, f"glossaries:{archive_generation()}", build)
+
+
+def glossary_terms(segments):
+    """Returns {segment: list of (source, target, glossary title)} of the glossary terms in each segment."""
+
+    index, entries = glossary_term_index()
+    return {
+        segment: [entry for _, _, number in index.find(segment) for entry in entries[number]]
+        for segment in segments
+    }
+
+
+def match_notes(match):
+    """Returns the lines of the notes written next to a pre-translated segment."""
+
+    notes = []
+    if match.score == 1:
+        notes.append("完全一致")
+    elif match.score:
+        notes.append(f"類似一致 {match.score:.0%}（原文: {match.source}）")
+    for source, target, title in match.terms:
+        notes.append(f"用語: {source} → {target}（{title}）")
+    return notes
+
+
+def stream_tmx(document, matches):
+    """
+    Generator that yields a TMX file of the segments of document, with the
+    target of each match and its notes, in chunks.
+    """
+
+    source_language = quoteattr(document.source_language)
+    target_language = quoteattr(document.target_language)
+    chunk = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<tmx version="1.4">\n'
+        f'<header creationtool="honyaku_archive" creationtoolversion="1" datatype="plaintext" '
+        f'segtype="sentence" adminlang="ja" srclang={source_language} o-tmf="honyaku_archive"/>\n'
+        "<body>\n"
+    ]
+    for count, segment in enumerate(document.segments, start=1):
+        match = matches.get(normalize(segment))
+        tu = ["<tu>"]
+        if match:
+            tu += [f"<note>{escape(note)}</note>" for note in match_notes(match)]
+        tu.append(f"<tuv xml:lang={source_language}><seg>{escape(segment)}</seg></tuv>")
+        tu.append(f"<tuv xml:lang={target_language}><seg>{escape(match.target if match else '')}</seg></tuv>")
+        tu.append("</tu>\n")
+        chunk.append("".join(tu))
+        if count % TMX_CHUNK_SIZE == 0:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    chunk.append("</body>\n</tmx>\n")
+    yield "".join(chunk).encode("utf-8")
+
+
+def build_docx(document, matches):
+    """
+    Returns a temporary file containing a DOCX file with a table of the
+    segments of document, their pre-translations and notes. The first two
+    columns have the format accepted by the translation upload form.
+    """
+
+    output = Document()
+    table = output.add_table(rows=0, cols=3)
+    table.style = "Table Grid"
+    for segment in document.segments:
+        match = matches.get(normalize(segment))
+        cells = table.add_row().cells
+        cells[0].text = segment
+        if match:
+            cells[1].text = match.target
+            cells[2].text = "\n".join(match_notes(match))
+
+    file = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+    output.save(file)
+    file.seek(0)
+    return file
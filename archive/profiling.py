@@ -0,0 +1,245 @@
+"""
+On-demand profiling of requests by staff users.
+
+Adding ?profile=1 to the URL of a page runs that request under cProfile.
+?profile=on sets a cookie that profiles all following requests (e.g. the
+HTMX requests made by a page) until ?profile=off is requested.
+Every SQL statement issued while profiling is timed and explained (EXPLAIN
+QUERY PLAN on SQLite), and a ProfileReport is saved with the functions with
+the highest cumulative time and the slowest queries with their plans. Its
+admin URL is returned in the X-Profile-Report header.
+
+When profiling is not requested, ProfilingMiddleware only looks at the query
+string and cookies, and capture_query() returns as soon as it finds that no
+profile is active.
+Only one request is profiled at a time (cProfile cannot profile concurrent
+requests separately); others are served normally meanwhile.
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+
+# Query parameter and cookie turning profiling on.
+PROFILE_PARAMETER = "profile"
+PROFILE_COOKIE = "profile"
+
+# Response header containing the admin URL of the report.
+REPORT_HEADER = "X-Profile-Report"
+
+# Number of functions and queries kept in reports.
+TOP_FUNCTIONS = 50
+SLOWEST_QUERIES = 50
+
+# Statements that can be explained.
+EXPLAINED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# Profile of the current request, or None.
+_profile = ContextVar("profile", default=None)
+
+_lock = threading.Lock()
+
+
+class RequestProfile:
+    """cProfile profiler and SQL statements of one request."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = []
+
+    def start(self):
+        self.token = _profile.set(self)
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        _profile.reset(self.token)
+
+    def save(self, request, response):
+        """Saves and returns a ProfileReport of the request."""
+
+        from .models import ProfileReport
+
+        stats = pstats.Stats(self.profiler)
+        dump = marshal.dumps(stats.stats)
+
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        queries = sorted(self.queries, key=lambda query: query["duration_ms"], reverse=True)
+        return ProfileReport.objects.create(
+            user=request.user,
+            method=request.method,
+            path=request.get_full_path(),
+            status_code=response.status_code,
+            duration_ms=self.duration_ms,
+            query_count=len(queries),
+            sql_ms=sum(query["duration_ms"] for query in queries),
+            functions=stream.getvalue(),
+            queries=queries[:SLOWEST_QUERIES],
+            stats=dump,
+        )
+
+
+def explain(connection, sql, params):
+    """
+    Returns the query plan of a statement, as the rows of the EXPLAIN output
+    (one per line). The statement is explained on a new cursor of the
+    database backend, so that execute wrappers are not called again.
+    """
+
+    if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+        return ""
+
+    try:
+        with connection.wrap_database_errors:
+            cursor = connection.create_cursor()
+            try:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+            finally:
+                cursor.close()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+
+def capture_query(execute, sql, params, many, context):
+    """Execute wrapper recording the SQL statements of profiled requests."""
+
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    if many:
+        # executemany(): the plan is the same for each set of parameters.
+        params = next(iter(params), None)
+    profile.queries.append(
+        {
+            "sql": sql,
+            "params": repr(params),
+            "duration_ms": duration_ms,
+            "plan": explain(context["connection"], sql, params),
+        }
+    )
+    return result
+
+
+def install_query_capture(sender, connection, **kwargs):
+    """
+    Receiver of the connection_created signal. Installs capture_query() on
+    each new connection (see timing.install_query_timer()).
+    """
+    if capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_query)
+
+
+def profiling_switch(request):
+    """
+    Returns the value of the profiling switch for the request ("1", "on",
+    "off", or None if profiling was not requested). Does not read the
+    database, so that it can be called for every request.
+    """
+    value = request.GET.get(PROFILE_PARAMETER)
+    if value in ("1", "on", "off"):
+        return value
+    if request.COOKIES.get(PROFILE_COOKIE):
+        return "1"
+    return None
+
+
+def is_staff(request):
+    return request.user.is_staff
+
+
+def update_cookie(response, switch):
+    if switch == "on":
+        response.set_cookie(PROFILE_COOKIE, "1", httponly=True, samesite="Lax")
+    elif switch == "off":
+        response.delete_cookie(PROFILE_COOKIE, samesite="Lax")
+
+
+def report_url(report):
+    return reverse("admin:archive_profilereport_change", args=[report.pk])
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests of staff users who ask for it (see the module
+    docstring). Must come after AuthenticationMiddleware.
+    The content of streaming responses is not included in profiles.
+    Under ASGI, the profiler runs in the thread of the event loop, so code
+    run in other threads (e.g. database queries) appears as time spent
+    waiting for them, and other requests handled meanwhile are included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Makes Django call this middleware as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        switch = profiling_switch(request)
+        if switch is None or not is_staff(request):
+            return self.get_response(request)
+
+        if switch == "off" or not _lock.acquire(blocking=False):
+            response = self.get_response(request)
+        else:
+            try:
+                profile = RequestProfile()
+                profile.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profile.stop()
+                response[REPORT_HEADER] = report_url(profile.save(request, response))
+            finally:
+                _lock.release()
+
+        update_cookie(response, switch)
+        return response
+
+    async def __acall__(self, request):
+        switch = profiling_switch(request)
+        if switch is None or not await sync_to_async(is_staff)(request):
+            return await self.get_response(request)
+
+        if switch == "off" or not _lock.acquire(blocking=False):
+            response = await self.get_response(request)
+        else:
+            try:
+                profile = RequestProfile()
+                profile.start()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    profile.stop()
+                report = await sync_to_async(profile.save)(request, response)
+                response[REPORT_HEADER] = report_url(report)
+            finally:
+                _lock.release()
+
+        update_cookie(response, switch)
+        return response
@@ -0,0 +1,153 @@
+"""
+Routing of database reads to the optional read replica.
+
+Reads of archive models go to the replica only while read_from_replica() is
+active, which ReplicaRoutingMiddleware does for the views marked as read-only
+(use_replica = True on class-based views, or @replica_reads on functions).
+All writes, and all other reads, go to the primary ("default") database.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Whether reads in the current request (or thread/task) may use the replica.
+_use_replica = ContextVar("use_replica", default=False)
+
+# Cookie set after a request that may have written to the primary database.
+# While it is present, all reads go to the primary, so that users see their
+# own changes even if the replica is behind.
+READ_PRIMARY_COOKIE = "read_primary"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Context manager within which reads of archive models use the replica
+    (if settings.REPLICA_DATABASE is set).
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view_func):
+    """
+    Decorator for function-based views that only read from the database.
+    """
+    view_func.use_replica = True
+    return view_func
+
+
+class ReplicaRouter:
+    """
+    Database router that sends reads of archive models to the replica when
+    allowed (see read_from_replica()), and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = settings.REPLICA_DATABASE
+        if replica and _use_replica.get() and model._meta.app_label == "archive":
+            return replica
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Reads from the replica while running views marked as read-only, unless
+    the user has written to the primary database within the last
+    settings.READ_PRIMARY_SECONDS seconds.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Makes Django call this middleware as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        request.use_replica = False
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, "_replica_token", None)
+            if token is not None:
+                _use_replica.reset(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        """
+        Async version of __call__, used under config.asgi. process_view() is
+        then run in another context, so the replica is disabled by setting
+        the context variable again rather than with its token.
+        """
+        request.use_replica = False
+        try:
+            response = await self.get_response(request)
+        finally:
+            if request.use_replica:
+                _use_replica.set(False)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if request.use_replica and response.streaming:
+            # Streamed content (e.g. exports) is read after the view returns.
+            if getattr(response, "is_async", False):
+                stream = self.astream_from_replica
+            else:
+                stream = self.stream_from_replica
+            response.streaming_content = stream(response.streaming_content)
+
+        if request.method not in SAFE_METHODS and not request.use_replica:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                "1",
+                max_age=settings.READ_PRIMARY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Allows reads from the replica for the rest of the request (including
+        the rendering of template responses) if the view is read-only.
+        """
+        view_class = getattr(view_func, "view_class", None)
+        read_only = getattr(view_func, "use_replica", False) or getattr(view_class, "use_replica", False)
+
+        if read_only and settings.REPLICA_DATABASE and READ_PRIMARY_COOKIE not in request.COOKIES:
+            request.use_replica = True
+            request._replica_token = _use_replica.set(True)
+        return None
+
+    def stream_from_replica(self, content):
+        with read_from_replica():
+            yield from content
+
+    async def astream_from_replica(self, content):
+        with read_from_replica():
+            async for chunk in content:
+                yield chunk
@@ -0,0 +1,81 @@
+import re
+
+from django.conf import settings
+from django.db.models import Q
+
+
+def clean_query(raw_query):
+    """
+    Returns the search query to be used in the database lookup.
+    If the query is surrounded with double quotes, only the quote symbols are
+    removed (i.e. whitespace directly inside the quote symbols is kept).
+    Otherwise, any surrounding whitespace is stripped.
+    """
+
+    if raw_query.startswith('"') and raw_query.endswith('"'):
+        return raw_query[1:-1]
+    return raw_query.strip()
+
+
+def item_query_filter(query):
+    """
+    Returns the filter used to find Item objects containing the query string.
+    Shared by the main search and the filter on the resource detail page so
+    that both give the same results.
+    """
+
+    return Q(source__icontains=query) | Q(target__icontains=query) | Q(notes__icontains=query)
+
+
+def match_offsets(text, query):
+    """
+    Returns the (start, end) offsets of the occurrences of query in text,
+    matched case-insensitively like the database lookup.
+    """
+
+    if not query:
+        return []
+    return [m.span() for m in re.finditer(re.escape(query), text, re.IGNORECASE)]
+
+
+def kwic_snippets(text, query, width):
+    """
+    Returns the keyword-in-context snippets of text shown in the search
+    results instead of long segments: the text from width characters before
+    to width characters after each occurrence of query, with overlapping
+    snippets merged. Each snippet is a (start, end) pair of offsets in text.
+    If query does not occur in text (e.g. the item was found by its notes),
+    the start of the text is returned.
+    """
+
+    snippets = []
+    for start, end in match_offsets(text, query):
+        start, end = max(start - width, 0), min(end + width, len(text))
+        if snippets and start <= snippets[-1][1]:
+            snippets[-1] = (snippets[-1][0], end)
+        else:
+            snippets.append((start, end))
+    return snippets or [(0, min(2 * width, len(text)))]
+
+
+def add_snippets(items, query):
+    """
+    Sets the source_snippets and target_snippets attributes of the items of
+    the search results, used by the template to show the snippets of the
+    segments longer than settings.SEARCH_SNIPPET_MIN_LENGTH. Each snippet is a
+    dict of its text and whether it starts or ends inside the segment. The
+    attributes are None for the segments shown in full.
+    """
+
+    width = settings.SEARCH_SNIPPET_WIDTH
+    for item in items:
+        for field in ("source", "target"):
+            text = getattr(item, field)
+            snippets = None
+            if width and len(text) > settings.SEARCH_SNIPPET_MIN_LENGTH:
+                snippets = [
+                    {"text": text[start:end], "cut_before": start > 0, "cut_after": end < len(text)}
+                    for start, end in kwic_snippets(text, query, width)
+                ]
+            setattr(item, f"{field}_snippets", snippets)
+    return items
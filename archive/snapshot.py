@@ -0,0 +1,469 @@
+"""
+Reading and writing of archive snapshot files.
+
+A snapshot contains every Resource and Item object in a compact binary format.
+Used by the archive_snapshot and archive_restore management commands.
+
+File layout:
+
+    header:  MAGIC, format version (uint16)
+    blocks:  block type (1 byte), row count (uint32), raw length (uint32),
+             compressed length (uint32), CRC32 of raw data (uint32),
+             zlib-compressed raw data
+    footer:  END_BLOCK, resource count (uint64), item count (uint64),
+             SHA-256 digest of all rows (32 bytes)
+
+The raw data of a block is stored column by column (all the titles of a block,
+then all the notes, etc.), which compresses better than storing row by row.
+Each value is stored as a uint32 length followed by UTF-8 bytes, and None is
+stored as NULL_LENGTH with no bytes.
+"""
+
+import hashlib
+import struct
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import GlossaryCheck, GlossaryCheckIssue, Item, Resource, clear_navbar_resources
+
+MAGIC = b"HNYKSNAP"
+FORMAT_VERSION = 1
+
+RESOURCE_BLOCK = b"R"
+ITEM_BLOCK = b"I"
+END_BLOCK = b"E"
+
+NULL_LENGTH = 0xFFFFFFFF
+
+HEADER = struct.Struct("<8sH")
+BLOCK_HEADER = struct.Struct("<IIII")
+FOOTER = struct.Struct("<QQ32s")
+LENGTH = struct.Struct("<I")
+
+# Columns stored for each model, in order. Foreign keys to users are stored
+# as usernames so that a snapshot can be restored into a different database.
+RESOURCE_COLUMNS = (
+    "id",
+    "resource_type",
+    "title",
+    "field",
+    "client",
+    "translator",
+    "notes",
+    "created_on",
+    "created_by",
+    "updated_on",
+    "updated_by",
+)
+ITEM_COLUMNS = (
+    "id",
+    "resource",
+    "source",
+    "target",
+    "notes",
+    "created_on",
+    "created_by",
+    "updated_on",
+    "updated_by",
+)
+USER_COLUMNS = ("created_by", "updated_by")
+INTEGER_COLUMNS = ("id", "resource")
+DATETIME_COLUMNS = ("created_on", "updated_on")
+
+BLOCK_MODELS = {
+    RESOURCE_BLOCK: (Resource, RESOURCE_COLUMNS),
+    ITEM_BLOCK: (Item, ITEM_COLUMNS),
+}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def get_username_map():
+    """
+    Returns a dict mapping the id of each user to their username.
+    """
+    return dict(get_user_model().objects.values_list("id", "username"))
+
+
+def iter_rows(model, columns, username_map, chunk_size):
+    """
+    Yields the rows of a model as tuples of strings (or None), ordered by id.
+    This is the representation that is written to snapshot files and used
+    for the snapshot checksum.
+    """
+
+    db_columns = [f"{column}_id" if column in USER_COLUMNS + ("resource",) else column for column in columns]
+    queryset = model.objects.all()
+    if model is Item:
+        # Resources being deleted are not included, so neither are their items.
+        queryset = queryset.exclude(resource__pending_deletion=True)
+    queryset = queryset.order_by("id").values_list(*db_columns).iterator(chunk_size=chunk_size)
+
+    for row in queryset:
+        yield tuple(
+            encode_value(column, value, username_map)
+            for column, value in zip(columns, row)
+        )
+
+
+def encode_value(column, value, username_map):
+    if value is None:
+        return None
+    if column in USER_COLUMNS:
+        return username_map.get(value)
+    if column in DATETIME_COLUMNS:
+        return value.isoformat()
+    return str(value)
+
+
+def decode_value(column, value, user_id_map):
+    if value is None:
+        return None
+    if column in USER_COLUMNS:
+        return user_id_map.get(value)
+    if column in DATETIME_COLUMNS:
+        return datetime.fromisoformat(value)
+    if column in INTEGER_COLUMNS:
+        return int(value)
+    return value
+
+
+def update_digest(digest, row):
+    """
+    Adds a row to the SHA-256 digest used to verify snapshots.
+    """
+    for value in row:
+        if value is None:
+            digest.update(LENGTH.pack(NULL_LENGTH))
+        else:
+            data = value.encode("utf-8")
+            digest.update(LENGTH.pack(len(data)))
+            digest.update(data)
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_block(rows, num_of_columns):
+    """
+    Encodes a list of rows column by column.
+    """
+
+    parts = []
+    for index in range(num_of_columns):
+        for row in rows:
+            value = row[index]
+            if value is None:
+                parts.append(LENGTH.pack(NULL_LENGTH))
+            else:
+                data = value.encode("utf-8")
+                parts.append(LENGTH.pack(len(data)))
+                parts.append(data)
+    return b"".join(parts)
+
+
+def decode_block(raw, num_of_rows, num_of_columns):
+    """
+    Decodes the raw data of a block back into a list of rows.
+    """
+
+    columns = []
+    position = 0
+    for _ in range(num_of_columns):
+        column = []
+        for _ in range(num_of_rows):
+            (length,) = LENGTH.unpack_from(raw, position)
+            position += LENGTH.size
+            if length == NULL_LENGTH:
+                column.append(None)
+            else:
+                column.append(raw[position:position + length].decode("utf-8"))
+                position += length
+        columns.append(column)
+
+    if position != len(raw):
+        raise SnapshotError("Block data is malformed.")
+
+    return list(zip(*columns))
+
+
+def write_snapshot(file, chunk_size=10000, compression_level=6):
+    """
+    Writes a snapshot of all Resource and Item objects to a binary file object.
+    Rows are read and written in chunks so that memory use does not depend on
+    the size of the archive.
+    Returns a tuple of the number of resources and items written.
+    """
+
+    username_map = get_username_map()
+    digest = hashlib.sha256()
+    counts = {}
+
+    file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    for block_type, (model, columns) in BLOCK_MODELS.items():
+        counts[block_type] = 0
+        rows = iter_rows(model, columns, username_map, chunk_size)
+        for chunk in chunked(rows, chunk_size):
+            for row in chunk:
+                update_digest(digest, row)
+            raw = encode_block(chunk, len(columns))
+            compressed = zlib.compress(raw, compression_level)
+            file.write(block_type)
+            file.write(BLOCK_HEADER.pack(len(chunk), len(raw), len(compressed), zlib.crc32(raw)))
+            file.write(compressed)
+            counts[block_type] += len(chunk)
+
+    file.write(END_BLOCK)
+    file.write(FOOTER.pack(counts[RESOURCE_BLOCK], counts[ITEM_BLOCK], digest.digest()))
+
+    return counts[RESOURCE_BLOCK], counts[ITEM_BLOCK]
+
+
+def read_exactly(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise SnapshotError("Snapshot file is truncated.")
+    return data
+
+
+class SnapshotReader:
+    """
+    Reads a snapshot from a binary file object.
+    The checksum of each block is verified as it is read. The counts and the
+    digest in the footer are available once all the blocks have been read.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.resource_count = None
+        self.item_count = None
+        self.digest = None
+
+        magic, version = HEADER.unpack(read_exactly(file, HEADER.size))
+        if magic != MAGIC:
+            raise SnapshotError("Not a snapshot file.")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format version: {version}")
+
+    def blocks(self):
+        """
+        Yields (model, columns, rows) for each block in the file, where each
+        row is a tuple of strings (or None) as produced by iter_rows().
+        """
+
+        while True:
+            block_type = read_exactly(self.file, 1)
+
+            if block_type == END_BLOCK:
+                self.resource_count, self.item_count, self.digest = FOOTER.unpack(
+                    read_exactly(self.file, FOOTER.size)
+                )
+                return
+
+            if block_type not in BLOCK_MODELS:
+                raise SnapshotError("Unknown block type.")
+
+            num_of_rows, raw_length, compressed_length, crc = BLOCK_HEADER.unpack(
+                read_exactly(self.file, BLOCK_HEADER.size)
+            )
+            try:
+                raw = zlib.decompress(read_exactly(self.file, compressed_length))
+            except zlib.error:
+                raise SnapshotError("Block data cannot be decompressed.")
+            if len(raw) != raw_length or zlib.crc32(raw) != crc:
+                raise SnapshotError("Block checksum does not match.")
+
+            model, columns = BLOCK_MODELS[block_type]
+            yield model, columns, decode_block(raw, num_of_rows, len(columns))
+
+
+def compute_digest(chunk_size=10000):
+    """
+    Computes the snapshot digest of the Resource and Item objects currently in
+    the database. Used to verify a restored archive against its snapshot.
+    """
+
+    username_map = get_username_map()
+    digest = hashlib.sha256()
+    for model, columns in BLOCK_MODELS.values():
+        for row in iter_rows(model, columns, username_map, chunk_size):
+            update_digest(digest, row)
+    return digest.digest()
+
+
+def restore_snapshot(file, batch_size=5000, flush=False):
+    """
+    Restores the Resource and Item objects in a snapshot into an empty archive.
+    If flush is True, existing Resource and Item objects are deleted first.
+    Rows are inserted in batches with raw INSERT statements, and the indexes of
+    the Item table are only built after all the rows have been inserted.
+    The whole restore runs in one transaction, and is rolled back if the
+    restored data does not match the digest stored in the snapshot.
+    Returns a tuple of the number of resources and items restored, and a set
+    of the usernames in the snapshot that do not exist in this database.
+    """
+
+    reader = SnapshotReader(file)
+    user_id_map = {username: id for id, username in get_username_map().items()}
+    missing_usernames = set()
+    digest = hashlib.sha256()
+    counts = {Resource: 0, Item: 0}
+
+    with transaction.atomic():
+        if flush:
+            clear_archive()
+
+        with deferred_indexes(Item):
+            for model, columns, rows in reader.blocks():
+                for row in rows:
+                    update_digest(digest, row)
+                insert_rows(model, columns, rows, user_id_map, missing_usernames, batch_size)
+                counts[model] += len(rows)
+
+            # Not stored in snapshots, since it is derived from the source.
+            Item.objects.fill_source_hashes(batch_size)
+
+        if (
+            digest.digest() != reader.digest
+            or counts[Resource] != reader.resource_count
+            or counts[Item] != reader.item_count
+        ):
+            raise SnapshotError("Snapshot content does not match its digest.")
+
+        reset_sequences()
+        Resource.objects.recount_items()
+        clear_navbar_resources()
+
+        # Users that do not exist in this database are restored as None, in
+        # which case the restored data cannot match the snapshot exactly.
+        if not missing_usernames and compute_digest() != reader.digest:
+            raise SnapshotError("Restored data does not match the snapshot.")
+
+    return counts[Resource], counts[Item], missing_usernames
+
+
+def insert_rows(model, columns, rows, user_id_map, missing_usernames, batch_size):
+    """
+    Inserts rows read from a snapshot with raw INSERT statements.
+    Model.save() and bulk_create() are not used because they would replace the
+    created_on and updated_on values with the current time.
+    """
+
+    fields = [model._meta.get_field(column) for column in columns]
+
+    # Fields that are not stored in snapshots are set to their default values.
+    default_fields = [
+        field for field in model._meta.concrete_fields
+        if field not in fields
+    ]
+    default_values = [
+        field.get_db_prep_save(field.get_default(), connection)
+        for field in default_fields
+    ]
+
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        connection.ops.quote_name(model._meta.db_table),
+        ", ".join(connection.ops.quote_name(field.column) for field in fields + default_fields),
+        ", ".join(["%s"] * (len(fields) + len(default_fields))),
+    )
+
+    for column in USER_COLUMNS:
+        index = columns.index(column)
+        missing_usernames.update(
+            row[index] for row in rows
+            if row[index] is not None and row[index] not in user_id_map
+        )
+
+    with connection.cursor() as cursor:
+        for batch in chunked(rows, batch_size):
+            params = [
+                [
+                    field.get_db_prep_save(decode_value(column, value, user_id_map), connection)
+                    for field, column, value in zip(fields, columns, row)
+                ] + default_values
+                for row in batch
+            ]
+            cursor.executemany(sql, params)
+
+
+@contextmanager
+def deferred_indexes(model):
+    """
+    Context manager that drops the secondary indexes of a model's table, and
+    recreates them on exit. Building an index once after a bulk insert is much
+    faster than updating it for every inserted row.
+    Only supported on SQLite and PostgreSQL. On other databases the indexes
+    are left in place.
+    Should be used inside a transaction, so that the dropped indexes are
+    restored by the rollback if an error occurs.
+    """
+
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+                [table],
+            )
+            indexes = cursor.fetchall()
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename = %s AND indexname NOT IN (SELECT conname FROM pg_constraint)",
+                [table],
+            )
+            indexes = cursor.fetchall()
+        else:
+            indexes = []
+
+        for name, _ in indexes:
+            cursor.execute("DROP INDEX {}".format(connection.ops.quote_name(name)))
+
+    yield
+
+    with connection.cursor() as cursor:
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+
+def reset_sequences():
+    """
+    Resets the primary key sequences after rows have been inserted with
+    explicit ids (only needed on databases that use sequences).
+    """
+
+    statements = connection.ops.sequence_reset_sql(no_style(), [Resource, Item])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def clear_archive():
+    """
+    Deletes all Resource and Item objects with raw DELETE statements.
+    Used before restoring a snapshot into an archive that is not empty.
+    """
+
+    # Glossary checks refer to resources and items, and are deleted first.
+    cleared_models = (GlossaryCheckIssue, GlossaryCheck.glossaries.through, GlossaryCheck, Item, Resource)
+    with connection.cursor() as cursor:
+        for model in cleared_models:
+            cursor.execute("DELETE FROM {}".format(connection.ops.quote_name(model._meta.db_table)))
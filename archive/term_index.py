@@ -0,0 +1,271 @@
+"""
+Indexes used to look up the segments of a document in the archive (see
+archive/pretranslation.py) and glossary terms in translations (see
+archive/glossary_check.py).
+
+- segment_hash() is stored in Item.source_hash, so that exact matches are
+  found with one indexed lookup for a whole batch of segments.
+- TermIndex is an Aho-Corasick automaton of glossary terms, which finds every
+  term contained in a segment in one pass over the segment.
+- NgramIndex maps the character n-grams of a set of segments to the
+  segments containing them, so that only the archive items sharing enough
+  n-grams with a segment are compared with it for fuzzy matches.
+
+Nothing here depends on Django, so the indexes can be pickled (to be cached,
+or sent to worker processes).
+"""
+
+import difflib
+import hashlib
+import itertools
+import multiprocessing
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+WHITESPACE = re.compile(r"\s+")
+
+# Length of the n-grams of NgramIndex. Trigrams are selective enough for both
+# Japanese and English text.
+NGRAM_SIZE = 3
+
+# Glossary terms shorter than this are not looked up, since they would be
+# found in almost every segment.
+MIN_TERM_LENGTH = 2
+
+
+def normalize(text):
+    """
+    Returns text as compared by the exact and fuzzy lookups: NFKC-normalized
+    (so that full-width and half-width characters are the same) with runs of
+    whitespace collapsed and surrounding whitespace removed.
+    """
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def segment_hash(text):
+    """Returns the value of Item.source_hash for a source text ("" for empty texts)."""
+
+    text = normalize(text)
+    if not text:
+        return ""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class TermIndex:
+    """
+    Aho-Corasick automaton of a list of terms, matched case-insensitively.
+    Each state is a dict of the next state by character, with the state
+    reached on a mismatch in fail, and the terms ending in the state in
+    output (as indexes into terms).
+    """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.lengths = []
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for number, term in enumerate(self.terms):
+            state = 0
+            term = normalize(term).lower()
+            self.lengths.append(len(term))
+            for char in term:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            if state:
+                self.output[state].append(number)
+
+        # Failure links, set breadth-first so that the links of shorter
+        # prefixes are set first.
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                fail = self.goto[fail].get(char, 0)
+                self.fail[next_state] = fail
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def find(self, text, overlapping=False):
+        """
+        Returns the (start, end, term index) of the terms found in text, in
+        the order of the text. Unless overlapping is True, only the longest
+        of overlapping terms is kept.
+        Offsets are in the normalized, lower-cased text.
+        """
+
+        matches = []
+        state = 0
+        for position, char in enumerate(normalize(text).lower()):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for number in self.output[state]:
+                matches.append((position + 1 - self.lengths[number], position + 1, number))
+
+        if overlapping:
+            return sorted(matches)
+
+        found = []
+        for start, end, number in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if not found or start >= found[-1][1]:
+                found.append((start, end, number))
+        return found
+
+
+def ngrams(text, size=NGRAM_SIZE):
+    """Returns the set of character n-grams of normalized text (the text itself if it is shorter)."""
+
+    text = normalize(text).lower()
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def similarity(a, b):
+    """Returns the fuzzy match score of two normalized texts, between 0 and 1."""
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class NgramIndex:
+    """
+    Index of the n-grams of a list of segments, used to find the best fuzzy
+    match of each segment among texts streamed from the archive.
+    """
+
+    def __init__(self, segments, threshold):
+        self.segments = [normalize(segment) for segment in segments]
+        self.threshold = threshold
+        self.sizes = []
+        self.postings = {}
+        for number, segment in enumerate(self.segments):
+            grams = ngrams(segment)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(number)
+
+    def length_range(self):
+        """
+        Returns the shortest and longest lengths that a text can have to reach
+        the threshold with one of the segments.
+        """
+        lengths = [len(segment) for segment in self.segments]
+        if not lengths:
+            return 0, 0
+        shortest = int(min(lengths) * self.threshold / (2 - self.threshold))
+        longest = int(max(lengths) * (2 - self.threshold) / self.threshold) + 1
+        return shortest, longest
+
+    def best_matches(self, rows):
+        """
+        Returns {segment number: (score, source, target)} of the best match of
+        each segment in rows of (source, target) texts at or above the
+        threshold.
+        Texts are only compared with the segments sharing enough n-grams
+        (by the Dice coefficient of their n-gram sets) and whose lengths allow
+        the threshold to be reached.
+        """
+
+        best = {}
+        # A low n-gram overlap can still give a high score when the texts
+        # differ in many places by single characters, so the n-gram filter is
+        # looser than the threshold.
+        min_dice = self.threshold * 0.6
+        for source, target in rows:
+            text = normalize(source)
+            grams = ngrams(text)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self.postings.get(gram, ()))
+            for number, count in shared.items():
+                segment = self.segments[number]
+                if 2 * count / (len(grams) + self.sizes[number]) < min_dice:
+                    continue
+                if 2 * min(len(text), len(segment)) / (len(text) + len(segment)) < self.threshold:
+                    continue
+                score = similarity(segment, text)
+                if score >= self.threshold and score > best.get(number, (0,))[0]:
+                    best[number] = (score, source, target)
+        return best
+
+    def best_matches_in_parallel(self, chunks, workers):
+        """
+        Returns the best matches (as best_matches()) in an iterable of chunks
+        of rows, scored by up to workers processes. Only a few chunks are
+        submitted ahead of the workers, so that the rows do not all have to
+        be held in memory.
+        """
+
+        best = {}
+
+        def merge(matches):
+            for number, match in matches.items():
+                if match[0] > best.get(number, (0,))[0]:
+                    best[number] = match
+
+        # The first chunk is scored in this process, and worker processes are
+        # only started if there are more.
+        chunks = iter(chunks)
+        merge(self.best_matches(next(chunks, [])))
+        second = next(chunks, None)
+        if second is None:
+            return best
+        chunks = itertools.chain([second], chunks)
+
+        if workers <= 1:
+            for rows in chunks:
+                merge(self.best_matches(rows))
+            return best
+
+        with ProcessPoolExecutor(
+            workers, mp_context=worker_context(), initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            pending = set()
+            for rows in chunks:
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+                pending.add(executor.submit(_worker_best_matches, rows))
+            for future in pending:
+                merge(future.result())
+        return best
+
+
+def worker_context():
+    """
+    Returns the multiprocessing context used to start worker processes.
+    Forking the server process, which has other threads running (request
+    threads, the background job thread), can deadlock the child process, so
+    workers are started from a fresh forkserver process (or with spawn where
+    forkserver is not available, e.g. on Windows).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# NgramIndex of a worker process of NgramIndex.best_matches_in_parallel(),
+# sent once when the process starts rather than with each chunk.
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _worker_best_matches(rows):
+    return _worker_index.best_matches(rows)
@@ -0,0 +1,18 @@
+"""
+URLconf used by the tests of the async views, matching archive/urls.py when
+settings.ASYNC_VIEWS is enabled.
+"""
+
+from django.urls import path
+
+from config.urls import urlpatterns as sync_urlpatterns
+
+from ..views.resource_export_view import AsyncResourceExportView
+from ..views.resource_views import async_resource_content
+from ..views.search_view import async_search
+
+urlpatterns = [
+    path("search/", async_search, name="search"),
+    path("resource/<int:pk>/content/", async_resource_content, name="resource_content"),
+    path("resource/export/", AsyncResourceExportView.as_view(), name="resource_export"),
+] + sync_urlpatterns
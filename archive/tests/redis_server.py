@@ -0,0 +1,225 @@
+"""
+Minimal Redis-compatible server used by the cache tests.
+
+Speaks enough of the Redis protocol (RESP2) for Django's RedisCache backend,
+so that the archive caching layer can be tested against a Redis cache without
+a Redis server being installed. Data is kept in memory and lost when the
+server is stopped.
+"""
+
+import socketserver
+import threading
+import time
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            try:
+                command = self.read_command()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+
+            try:
+                reply = self.server.execute(command)
+            except RedisError as error:
+                self.wfile.write(f"-ERR {error}\r\n".encode())
+            else:
+                self.wfile.write(encode(reply))
+            self.wfile.flush()
+
+    def read_command(self):
+        """
+        Returns the next command sent by the client as a list of bytes, or
+        None if the connection was closed.
+        """
+
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command (e.g. sent with telnet or redis-cli).
+            return line.split()
+
+        args = []
+        for _ in range(int(line[1:])):
+            header = self.rfile.readline()
+            if not header.startswith(b"$"):
+                raise ValueError("Expected a bulk string.")
+            args.append(self.rfile.read(int(header[1:]) + 2)[:-2])
+        return args
+
+
+def encode(reply):
+    """Encodes the reply to a command in the Redis protocol."""
+
+    if reply is None:
+        return b"$-1\r\n"
+    if reply is True:
+        return b"+OK\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(value) for value in reply)
+    raise TypeError(f"Cannot encode {reply!r}.")
+
+
+class RedisServer(socketserver.ThreadingTCPServer):
+    """
+    Usage:
+        server = RedisServer()
+        server.start()
+        ... connect to server.url ...
+        server.stop()
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), RedisRequestHandler)
+        self.lock = threading.Lock()
+        self.data = {}
+        self.expires = {}
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def execute(self, command):
+        if not command:
+            raise RedisError("empty command")
+        name, args = command[0].decode().lower(), command[1:]
+        method = getattr(self, f"command_{name}", None)
+        if method is None:
+            raise RedisError(f"unknown command '{name}'")
+        with self.lock:
+            return method(*args)
+
+    def lookup(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def expire(self, key, seconds):
+        if seconds is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = time.monotonic() + seconds
+
+    # Commands
+
+    def command_ping(self, message=None):
+        return message if message is not None else "PONG"
+
+    def command_client(self, *args):
+        return True
+
+    def command_select(self, db):
+        return True
+
+    def command_flushdb(self, *args):
+        self.data.clear()
+        self.expires.clear()
+        return True
+
+    def command_get(self, key):
+        return self.lookup(key)
+
+    def command_mget(self, *keys):
+        return [self.lookup(key) for key in keys]
+
+    def command_set(self, key, value, *options):
+        options = [option.decode().upper() for option in options]
+        seconds = None
+        nx = xx = False
+        i = 0
+        while i < len(options):
+            if options[i] == "NX":
+                nx = True
+            elif options[i] == "XX":
+                xx = True
+            elif options[i] == "EX":
+                i += 1
+                seconds = int(options[i])
+            elif options[i] == "PX":
+                i += 1
+                seconds = int(options[i]) / 1000
+            else:
+                raise RedisError("syntax error")
+            i += 1
+
+        exists = self.lookup(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self.data[key] = value
+        self.expire(key, seconds)
+        return True
+
+    def command_del(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.lookup(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def command_exists(self, *keys):
+        return sum(self.lookup(key) is not None for key in keys)
+
+    def command_incrby(self, key, amount):
+        value = self.lookup(key)
+        try:
+            value = int(value or 0) + int(amount)
+        except ValueError:
+            raise RedisError("value is not an integer or out of range")
+        self.data[key] = str(value).encode()
+        return value
+
+    def command_incr(self, key):
+        return self.command_incrby(key, b"1")
+
+    def command_decrby(self, key, amount):
+        return self.command_incrby(key, str(-int(amount)).encode())
+
+    def command_expire(self, key, seconds):
+        if self.lookup(key) is None:
+            return 0
+        self.expire(key, int(seconds))
+        return 1
+
+    def command_persist(self, key):
+        if self.lookup(key) is None or key not in self.expires:
+            return 0
+        self.expire(key, None)
+        return 1
+
+    def command_ttl(self, key):
+        if self.lookup(key) is None:
+            return -2
+        if key not in self.expires:
+            return -1
+        return round(self.expires[key] - time.monotonic())
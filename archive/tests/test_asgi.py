@@ -0,0 +1,158 @@
+import io
+import zipfile
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..asgi import ArchiveASGIHandler
+from ..models import Item, ProfileReport, Resource
+
+CSRF_TOKEN = "a" * 32
+
+
+class ASGIClient:
+    """
+    Sends requests directly to an ASGI application, so that the whole
+    request (middleware, view and streaming of the response) runs in
+    async mode, as under an ASGI server.
+    """
+
+    def __init__(self, application, cookies):
+        self.application = application
+        self.cookies = cookies
+
+    def get(self, path, query="", headers=()):
+        return async_to_sync(self.request)("GET", path, query, b"", headers)
+
+    def post(self, path, data):
+        headers = [
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"x-csrftoken", CSRF_TOKEN.encode()),
+        ]
+        return async_to_sync(self.request)("POST", path, "", urlencode(data, doseq=True).encode(), headers)
+
+    async def request(self, method, path, query, body, headers):
+        cookies = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [(b"host", b"127.0.0.1"), (b"cookie", cookies.encode()), *headers],
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+        }
+        received = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return received.pop(0) if received else {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.application(scope, receive, send)
+
+        start = sent[0]
+        headers = {name.decode().lower(): value.decode() for name, value in start["headers"]}
+        content = b"".join(message.get("body", b"") for message in sent[1:])
+        return start["status"], headers, content
+
+
+class ASGIHandlerTests(TransactionTestCase):
+    """
+    Tests of the views served through ArchiveASGIHandler (config.asgi).
+    A TransactionTestCase is used because the handler runs the synchronous
+    parts of each request in its own thread, with its own connection.
+    """
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="testuser", password="testuser123")
+        self.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        for i in range(3):
+            Item.objects.create(resource=self.glossary, source=f"用語{i}", target=f"term {i}")
+
+        self.client.force_login(self.user)
+        cookies = {"sessionid": self.client.cookies["sessionid"].value, "csrftoken": CSRF_TOKEN}
+        self.asgi_client = ASGIClient(ArchiveASGIHandler(), cookies)
+
+    def read_zip(self, content):
+        with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+            return {name: zip_file.read(name).decode() for name in zip_file.namelist()}
+
+    @override_settings(ROOT_URLCONF="archive.tests.async_urls")
+    def test_async_search(self):
+        query = urlencode({"query": "term", "resource": "すべてのリソース"})
+        status, headers, content = self.asgi_client.get(reverse("search"), query)
+        self.assertEqual(status, 200)
+        self.assertIn("「<strong>3</strong>」件", content.decode())
+        self.assertIn("Test Glossary", content.decode())
+
+        status, _, content = self.asgi_client.get(
+            reverse("search"), query, [(b"if-none-match", headers["etag"].encode())]
+        )
+        self.assertEqual(status, 304)
+        self.assertEqual(content, b"")
+
+    @override_settings(ROOT_URLCONF="archive.tests.async_urls")
+    def test_async_search_is_profiled(self):
+        self.user.is_staff = True
+        self.user.save()
+        query = urlencode({"query": "term", "resource": "すべてのリソース", "profile": "1"})
+        status, headers, _ = self.asgi_client.get(reverse("search"), query)
+        self.assertEqual(status, 200)
+
+        # Queries run in other threads are captured with their plans.
+        report = ProfileReport.objects.get()
+        self.assertEqual(
+            headers["x-profile-report"], reverse("admin:archive_profilereport_change", args=[report.pk])
+        )
+        self.assertTrue(any("archive_item" in query["sql"] and query["plan"] for query in report.queries))
+
+    @override_settings(ROOT_URLCONF="archive.tests.async_urls")
+    def test_async_search_requires_login(self):
+        self.asgi_client.cookies.pop("sessionid")
+        status, headers, _ = self.asgi_client.get(reverse("search"), "query=term")
+        self.assertEqual(status, 302)
+        self.assertIn(reverse("login"), headers["location"])
+
+    @override_settings(ROOT_URLCONF="archive.tests.async_urls", RESOURCE_CONTENT_PAGE_SIZE=2)
+    def test_async_resource_content(self):
+        first = self.glossary.items.order_by("id").first()
+        path = reverse("resource_content", args=[self.glossary.pk])
+        status, _, content = self.asgi_client.get(path, f"after={first.pk}&offset=1")
+        self.assertEqual(status, 200)
+        self.assertIn("term 1", content.decode())
+        self.assertIn("term 2", content.decode())
+        self.assertNotIn("term 0", content.decode())
+
+        status, _, _ = self.asgi_client.get(reverse("resource_content", args=[0]))
+        self.assertEqual(status, 404)
+
+    @override_settings(ROOT_URLCONF="archive.tests.async_urls")
+    def test_async_export_is_streamed(self):
+        status, headers, content = self.asgi_client.post(
+            reverse("resource_export"), {"resources": [self.glossary.pk]}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "application/zip")
+        self.assertEqual(
+            self.read_zip(content),
+            {"用語集/Test Glossary.txt": "用語0\tterm 0\n用語1\tterm 1\n用語2\tterm 2\n"},
+        )
+
+    def test_sync_export_is_streamed(self):
+        # The content of synchronous streaming responses reads the database,
+        # so it must not be read in the event loop.
+        status, _, content = self.asgi_client.post(
+            reverse("resource_export"), {"resources": [self.glossary.pk]}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(list(self.read_zip(content)), ["用語集/Test Glossary.txt"])
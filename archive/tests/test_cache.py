@@ -0,0 +1,176 @@
+import importlib.util
+import shutil
+import socket
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import cache as archive_cache
+from ..models import Resource
+from .redis_server import RedisServer
+
+REDIS_INSTALLED = importlib.util.find_spec("redis") is not None
+
+
+class ArchiveCacheTestsMixin:
+    """
+    Tests of archive/cache.py, run against the cache backend returned by
+    get_cache_settings() in each subclass.
+    """
+
+    @classmethod
+    def get_cache_settings(cls):
+        raise NotImplementedError
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings_override = override_settings(CACHES={"default": cls.get_cache_settings()})
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_get_and_set(self):
+        self.assertIsNone(archive_cache.get("search", "key"))
+        archive_cache.set("search", "key", {"hits": [1, 2]})
+        self.assertEqual(archive_cache.get("search", "key"), {"hits": [1, 2]})
+        archive_cache.delete("search", "key")
+        self.assertEqual(archive_cache.get("search", "key", "default"), "default")
+
+    def test_keys_are_namespaced(self):
+        archive_cache.set("search", "key", "search value")
+        archive_cache.set("stats", "key", "stats value")
+        self.assertEqual(archive_cache.get("search", "key"), "search value")
+        self.assertEqual(archive_cache.get("stats", "key"), "stats value")
+
+    def test_get_or_set_only_calls_default_on_miss(self):
+        calls = []
+
+        def default():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(archive_cache.get_or_set("search", "key", default))
+        self.assertIsNone(archive_cache.get_or_set("search", "key", default))
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_only_affects_its_namespace(self):
+        archive_cache.set("search", "key", "search value")
+        archive_cache.set("stats", "key", "stats value")
+        archive_cache.invalidate("search")
+        self.assertIsNone(archive_cache.get("search", "key"))
+        self.assertEqual(archive_cache.get("stats", "key"), "stats value")
+
+    def test_invalidate_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_cache.invalidate("search")
+            # Cached by another request before the commit.
+            archive_cache.set("search", "key", "stale value")
+        self.assertIsNone(archive_cache.get("search", "key"))
+
+    def test_values_are_not_reused_after_generation_is_lost(self):
+        archive_cache.set("search", "key", "value")
+        cache.delete(archive_cache.generation_key("search"))
+        self.assertIsNone(archive_cache.get("search", "key"))
+
+    @override_settings(ARCHIVE_CACHE_VERSION=2)
+    def test_cache_version_is_part_of_keys(self):
+        self.assertTrue(archive_cache.make_key("search", "key").startswith("archive:2:search:"))
+
+    def test_navbar_resources_are_invalidated_on_rename(self):
+        resource = Resource.objects.create(resource_type="GLOSSARY", title="Glossary")
+        self.assertEqual(Resource.objects.navbar_resources()["glossaries"], ["Glossary"])
+        resource.title = "Renamed Glossary"
+        resource.save()
+        self.assertEqual(Resource.objects.navbar_resources()["glossaries"], ["Renamed Glossary"])
+        with self.assertNumQueries(0):
+            Resource.objects.navbar_resources()
+
+
+class LocMemCacheTests(ArchiveCacheTestsMixin, TestCase):
+
+    @classmethod
+    def get_cache_settings(cls):
+        return {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+
+class FileBasedCacheTests(ArchiveCacheTestsMixin, TestCase):
+
+    @classmethod
+    def get_cache_settings(cls):
+        location = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, location, ignore_errors=True)
+        return {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+
+
+@skipUnless(REDIS_INSTALLED, "The redis package is not installed.")
+class RedisCacheTests(ArchiveCacheTestsMixin, TestCase):
+
+    @classmethod
+    def get_cache_settings(cls):
+        server = RedisServer()
+        server.start()
+        cls.addClassCleanup(server.stop)
+        return {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": server.url}
+
+
+class TestCacheTests(SimpleTestCase):
+
+    def test_tests_do_not_use_the_file_cache(self):
+        # See config/test_runner.py.
+        self.assertEqual(settings.CACHES["default"]["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+
+
+class RedisServerTests(SimpleTestCase):
+    """Tests of the Redis-compatible server used by RedisCacheTests."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = RedisServer()
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        self.connection = socket.create_connection(self.server.server_address)
+        self.addCleanup(self.connection.close)
+        self.file = self.connection.makefile("rb")
+        self.addCleanup(self.file.close)
+        self.send("FLUSHDB")
+
+    def send(self, *args):
+        """Sends a command and returns the first line of the reply."""
+        command = b"*%d\r\n" % len(args)
+        for arg in args:
+            arg = arg.encode() if isinstance(arg, str) else arg
+            command += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self.connection.sendall(command)
+        return self.file.readline()
+
+    def test_set_and_get(self):
+        self.assertEqual(self.send("SET", "key", b"\x80value"), b"+OK\r\n")
+        self.assertEqual(self.send("GET", "key"), b"$6\r\n")
+        self.assertEqual(self.file.readline(), b"\x80value\r\n")
+        self.assertEqual(self.send("GET", "missing"), b"$-1\r\n")
+
+    def test_set_nx(self):
+        self.assertEqual(self.send("SET", "key", "1", "NX"), b"+OK\r\n")
+        self.assertEqual(self.send("SET", "key", "2", "NX"), b"$-1\r\n")
+
+    def test_set_px_expires(self):
+        self.send("SET", "key", "value", "PX", "1")
+        self.server.expires[b"key"] -= 1
+        self.assertEqual(self.send("EXISTS", "key"), b":0\r\n")
+
+    def test_incr_and_del(self):
+        self.send("SET", "key", "5")
+        self.assertEqual(self.send("INCRBY", "key", "2"), b":7\r\n")
+        self.assertEqual(self.send("DEL", "key", "missing"), b":1\r\n")
+
+    def test_unknown_command(self):
+        self.assertEqual(self.send("UNKNOWN"), b"-ERR unknown command 'unknown'\r\n")
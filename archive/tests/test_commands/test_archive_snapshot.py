@@ -0,0 +1,145 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from freezegun import freeze_time
+
+from ...models import Item, Resource
+from ...snapshot import SnapshotError, SnapshotReader, restore_snapshot, write_snapshot
+
+
+class ArchiveSnapshotTests(TestCase):
+
+    @classmethod
+    @freeze_time("2022-11-11 10:30:15.123456")
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(
+            resource_type="GLOSSARY",
+            title="Test Glossary",
+            notes="複数行の\n備考",
+            created_by=cls.user,
+            updated_by=cls.user,
+        )
+        cls.translation = Resource.objects.create(
+            resource_type="TRANSLATION",
+            title="Test Translation",
+            field="Chemical",
+            client="ABC Co., Ltd.",
+            translator="Graham Greene",
+        )
+        for i in range(25):
+            Item.objects.create(
+                resource=cls.glossary,
+                source=f"用語{i}",
+                target=f"term {i}",
+                notes="" if i % 2 else "Test note.",
+                created_by=cls.user,
+            )
+        Item.objects.create(resource=cls.translation, source="", target="Target only")
+
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.snapshot_dir.name, "archive.snapshot")
+
+    def tearDown(self):
+        self.snapshot_dir.cleanup()
+
+    def get_archive_data(self):
+        # Uploaded files are deleted after being read, so are not included in
+        # snapshots.
+        resources = list(Resource.objects.order_by("id").values())
+        for resource in resources:
+            del resource["upload_file"]
+        items = list(Item.objects.order_by("id").values())
+        return resources, items
+
+    def test_snapshot_and_restore_round_trip(self):
+        expected = self.get_archive_data()
+        call_command("archive_snapshot", self.path, "--chunk-size", "7", stdout=io.StringIO())
+        call_command("archive_restore", self.path, "--flush", stdout=io.StringIO())
+        self.assertEqual(self.get_archive_data(), expected)
+
+    def test_timestamps_are_preserved(self):
+        call_command("archive_snapshot", self.path, stdout=io.StringIO())
+        call_command("archive_restore", self.path, "--flush", stdout=io.StringIO())
+        resource = Resource.objects.get(pk=self.glossary.pk)
+        self.assertEqual(resource.created_on.isoformat(), "2022-11-11T10:30:15.123456+00:00")
+
+    def test_restore_into_non_empty_archive_fails_without_flush(self):
+        call_command("archive_snapshot", self.path, stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command("archive_restore", self.path, stdout=io.StringIO())
+
+    def test_restore_into_empty_archive(self):
+        buffer = io.BytesIO()
+        write_snapshot(buffer)
+        Item.objects.all().delete()
+        Resource.objects.all().delete()
+        buffer.seek(0)
+        num_of_resources, num_of_items, missing_usernames = restore_snapshot(buffer)
+        self.assertEqual((num_of_resources, num_of_items), (2, 26))
+        self.assertEqual(missing_usernames, set())
+        self.assertEqual(Item.objects.filter(resource=self.glossary).count(), 25)
+
+    def test_unknown_users_are_restored_as_none(self):
+        buffer = io.BytesIO()
+        write_snapshot(buffer)
+        get_user_model().objects.all().delete()
+        buffer.seek(0)
+        _, _, missing_usernames = restore_snapshot(buffer, flush=True)
+        self.assertEqual(missing_usernames, {"testuser"})
+        self.assertIsNone(Resource.objects.get(pk=self.glossary.pk).created_by)
+
+    def test_footer_contains_counts(self):
+        buffer = io.BytesIO()
+        write_snapshot(buffer, chunk_size=10)
+        buffer.seek(0)
+        reader = SnapshotReader(buffer)
+        num_of_rows = sum(len(rows) for _, _, rows in reader.blocks())
+        self.assertEqual(num_of_rows, 28)
+        self.assertEqual((reader.resource_count, reader.item_count), (2, 26))
+
+    def test_corrupted_snapshot_is_rejected_and_rolled_back(self):
+        buffer = io.BytesIO()
+        write_snapshot(buffer)
+        data = bytearray(buffer.getvalue())
+        data[40] ^= 0xFF
+        with self.assertRaises(SnapshotError):
+            restore_snapshot(io.BytesIO(bytes(data)), flush=True)
+        self.assertEqual(Item.objects.count(), 26)
+
+    def test_truncated_snapshot_is_rejected(self):
+        buffer = io.BytesIO()
+        write_snapshot(buffer)
+        with self.assertRaises(SnapshotError):
+            restore_snapshot(io.BytesIO(buffer.getvalue()[:-10]), flush=True)
+        self.assertEqual(Resource.objects.count(), 2)
+
+    def test_not_a_snapshot_file(self):
+        with self.assertRaises(SnapshotError):
+            SnapshotReader(io.BytesIO(b"not a snapshot file"))
+
+    def test_indexes_are_recreated_after_restore(self):
+        from django.db import connection
+
+        def get_item_indexes():
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, Item._meta.db_table)
+            return sorted(name for name, info in constraints.items() if info["index"])
+
+        expected = get_item_indexes()
+        buffer = io.BytesIO()
+        write_snapshot(buffer)
+        buffer.seek(0)
+        restore_snapshot(buffer, flush=True)
+        self.assertEqual(get_item_indexes(), expected)
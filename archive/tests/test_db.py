@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SQLitePerformanceProfileTests(SimpleTestCase):
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Only applies to SQLite.")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "test.sqlite3")
+
+    def get_pragmas(self):
+        settings_dict = dict(connection.settings_dict, NAME=self.path)
+        wrapper = DatabaseWrapper(settings_dict, alias="pragma_test")
+        try:
+            with wrapper.cursor() as cursor:
+                pragmas = {}
+                for name in ("journal_mode", "synchronous", "temp_store", "busy_timeout", "cache_size"):
+                    cursor.execute(f"PRAGMA {name}")
+                    pragmas[name] = cursor.fetchone()[0]
+        finally:
+            wrapper.close()
+        return pragmas
+
+    @override_settings(SQLITE_PERFORMANCE_PROFILE=True)
+    def test_pragmas_applied_when_enabled(self):
+        pragmas = self.get_pragmas()
+        self.assertEqual(pragmas["journal_mode"], "wal")
+        self.assertEqual(pragmas["synchronous"], 1)  # NORMAL
+        self.assertEqual(pragmas["temp_store"], 2)  # MEMORY
+        self.assertEqual(pragmas["busy_timeout"], 5000)
+        self.assertEqual(pragmas["cache_size"], -64000)
+
+    @override_settings(SQLITE_PERFORMANCE_PROFILE=False)
+    def test_pragmas_not_applied_when_disabled(self):
+        pragmas = self.get_pragmas()
+        self.assertEqual(pragmas["journal_mode"], "delete")
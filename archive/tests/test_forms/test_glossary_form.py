@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.forms.widgets import Textarea
 
-from ...models import Glossary
+from ...models import Resource
 from ...forms.glossary_forms import GlossaryForm
 
 
@@ -64,7 +64,7 @@ class TestGlossaryForm(TestCase):
     # Test Meta fields
 
     def test_meta_model(self):
-        self.assertEqual(self.empty_form._meta.model, Glossary)
+        self.assertEqual(self.empty_form._meta.model, Resource)
 
     def test_meta_fields(self):
         self.assertEqual(self.empty_form._meta.fields, ("title", "notes"))
@@ -4,7 +4,7 @@ from django.core.validators import FileExtensionValidator
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from ...models import Glossary
+from ...models import Resource
 from ...forms.glossary_forms import GlossaryUploadForm
 
 
@@ -20,10 +20,10 @@ class TestGlossaryUploadForm(TestCase):
         )
 
         # Glossary object
-        cls.glossary_obj = Glossary.objects.create(
+        cls.glossary_obj = Resource.objects.create(
+            resource_type="GLOSSARY",
             title="Test Glossary",
             notes="Test note.",
-            type="用語集",
             created_by=cls.testuser,
             updated_by=cls.testuser,
         )
@@ -194,7 +194,7 @@ class TestGlossaryUploadForm(TestCase):
         )
 
     def test_existing_glossary_field_queryset(self):
-        expected = list(Glossary.objects.all().order_by("title"))
+        expected = list(Resource.objects.filter(resource_type="GLOSSARY"))
         existing_glossary_queryset = list(
             self.empty_form.fields["existing_glossary"].queryset
         )
@@ -244,7 +244,7 @@ class TestGlossaryUploadForm(TestCase):
     # Test Meta fields
 
     def test_meta_model(self):
-        self.assertEqual(self.empty_form._meta.model, Glossary)
+        self.assertEqual(self.empty_form._meta.model, Resource)
 
     def test_meta_fields(self):
         self.assertEqual(
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.forms.widgets import Textarea
 
-from ...models import Translation
+from ...models import Resource
 from ...forms.translation_forms import TranslationUpdateForm
 
 
@@ -111,7 +111,7 @@ class TestTranslationUpdateForm(TestCase):
     # Test Meta fields
 
     def test_meta_model(self):
-        self.assertEqual(self.empty_form._meta.model, Translation)
+        self.assertEqual(self.empty_form._meta.model, Resource)
 
     def test_meta_fields(self):
         self.assertEqual(
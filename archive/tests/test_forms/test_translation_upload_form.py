@@ -4,7 +4,7 @@ from django.core.validators import FileExtensionValidator
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from ...models import Translation
+from ...models import Resource
 from ...forms.translation_forms import TranslationUploadForm
 
 
@@ -20,12 +20,12 @@ class TestTranslationUploadForm(TestCase):
         )
 
         # Translation object
-        cls.translation_obj = Translation.objects.create(
+        cls.translation_obj = Resource.objects.create(
+            resource_type="TRANSLATION",
             title="ABC123",
             field="化学",
             client="ABC社",
             translator="田中",
-            type="翻訳",
             notes="Reference translation.",
             created_by=cls.testuser,
         )
@@ -205,7 +205,7 @@ class TestTranslationUploadForm(TestCase):
     # Test Meta fields
 
     def test_meta_model(self):
-        self.assertEqual(self.empty_form._meta.model, Translation)
+        self.assertEqual(self.empty_form._meta.model, Resource)
 
     def test_meta_fields(self):
         self.assertEqual(
@@ -0,0 +1,243 @@
+import csv
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..deletion import delete_pending_resource
+from ..forms.glossary_check_forms import GlossaryCheckForm
+from ..glossary_check import GlossaryTerms, fail_interrupted_checks, run_glossary_check
+from ..models import GlossaryCheck, GlossaryCheckIssue, Item, Resource
+from ..term_index import TermIndex
+from .test_pretranslation import docx_upload
+
+
+class GlossaryCheckTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        Item.objects.bulk_create(
+            [
+                Item(
+                    resource=cls.translation,
+                    source="本発明は情報処理装置に関する。",
+                    target="The invention relates to an information processing apparatus.",
+                ),
+                Item(
+                    resource=cls.translation,
+                    source="表示部は画像を表示する。",
+                    target="The display unit displays an image.",
+                ),
+                Item(
+                    resource=cls.translation,
+                    source="表示部と記憶部を備える。",
+                    target="A display and a memory are provided.",
+                ),
+            ]
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Item.objects.create(resource=cls.glossary, source="情報処理装置", target="information processing device")
+        Item.objects.create(resource=cls.glossary, source="表示部", target="display unit")
+        Item.objects.create(resource=cls.glossary, source="記憶部", target="storage unit")
+        cls.other_glossary = Resource.objects.create(resource_type="GLOSSARY", title="Other Glossary")
+        Item.objects.create(resource=cls.other_glossary, source="記憶部", target="memory")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def check(self, *glossaries):
+        glossary_check = GlossaryCheck.objects.create(resource=self.translation, created_by=self.user)
+        glossary_check.glossaries.set(glossaries)
+        run_glossary_check(glossary_check.pk)
+        glossary_check.refresh_from_db()
+        return glossary_check
+
+    def test_overlapping_terms_are_found(self):
+        index = TermIndex(["display", "display unit"])
+        self.assertEqual(index.find("display unit"), [(0, 12, 1)])
+        self.assertEqual(index.find("display unit", overlapping=True), [(0, 7, 0), (0, 12, 1)])
+
+    def test_missing_terms(self):
+        terms = GlossaryTerms([self.glossary, self.other_glossary])
+        missing = terms.missing_terms("表示部と記憶部を備える。", "A display and a memory are provided.")
+        self.assertEqual([term["source"] for term in missing], ["表示部"])
+        self.assertEqual(list(missing[0]["targets"].values()), ["display unit"])
+
+        self.assertEqual(terms.missing_terms("記憶部を備える。", "A STORAGE UNIT is provided."), [])
+        self.assertEqual(terms.missing_terms("記録媒体", ""), [])
+
+    def test_issues_are_recorded(self):
+        glossary_check = self.check(self.glossary, self.other_glossary)
+        self.assertEqual(glossary_check.status, GlossaryCheck.DONE)
+        self.assertEqual(glossary_check.item_count, 3)
+        self.assertEqual(glossary_check.issue_count, 2)
+        self.assertIsNotNone(glossary_check.finished_on)
+        self.assertEqual(
+            list(glossary_check.issues.values_list("term_source", "term_target", "glossary_title")),
+            [
+                ("情報処理装置", "information processing device", "Test Glossary"),
+                ("表示部", "display unit", "Test Glossary"),
+            ],
+        )
+
+        # Without the second glossary, "memory" is not a translation of 記憶部.
+        Item.objects.filter(resource=self.other_glossary).delete()
+        run_glossary_check(glossary_check.pk)
+        glossary_check.refresh_from_db()
+        self.assertEqual(glossary_check.issue_count, 3)
+        self.assertEqual(glossary_check.issues.count(), 3)
+        issue = glossary_check.issues.get(term_source="記憶部")
+        self.assertEqual(issue.term_target, "storage unit")
+
+    def test_failed_check(self):
+        glossary_check = GlossaryCheck.objects.create(resource=self.translation)
+        with mock.patch("archive.glossary_check.GlossaryTerms", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                run_glossary_check(glossary_check.pk)
+        glossary_check.refresh_from_db()
+        self.assertEqual(glossary_check.status, GlossaryCheck.FAILED)
+        self.assertTrue(glossary_check.finished)
+
+    @override_settings(GLOSSARY_CHECK_TIMEOUT=60)
+    def test_interrupted_check_is_failed(self):
+        interrupted = GlossaryCheck.objects.create(resource=self.translation, status=GlossaryCheck.RUNNING)
+        GlossaryCheck.objects.filter(pk=interrupted.pk).update(created_on=timezone.now() - timedelta(seconds=61))
+        running = GlossaryCheck.objects.create(resource=self.translation, status=GlossaryCheck.RUNNING)
+
+        response = self.client.get(running.get_absolute_url())
+        self.assertContains(response, 'hx-trigger="every 2s"')
+
+        response = self.client.get(interrupted.get_absolute_url())
+        self.assertNotContains(response, 'hx-trigger="every 2s"')
+        self.assertContains(response, "チェックが完了しませんでした。")
+        interrupted.refresh_from_db()
+        self.assertEqual(interrupted.status, GlossaryCheck.FAILED)
+        self.assertIsNotNone(interrupted.finished_on)
+
+        running.refresh_from_db()
+        self.assertEqual(running.status, GlossaryCheck.RUNNING)
+        self.assertEqual(fail_interrupted_checks(GlossaryCheck.objects.all()), 0)
+
+        # A check that finishes after all the same is recorded as done.
+        run_glossary_check(interrupted.pk)
+        interrupted.refresh_from_db()
+        self.assertEqual(interrupted.status, GlossaryCheck.DONE)
+
+    def test_check_is_started(self):
+        url = reverse("glossary_check_create", args=[self.translation.pk])
+        with mock.patch("archive.glossary_check.run_in_background") as run_in_background:
+            response = self.client.post(url, {"glossaries": [self.glossary.pk]})
+        glossary_check = GlossaryCheck.objects.get()
+        self.assertRedirects(response, glossary_check.get_absolute_url())
+        self.assertEqual(glossary_check.status, GlossaryCheck.PENDING)
+        self.assertEqual(list(glossary_check.glossaries.all()), [self.glossary])
+        run_in_background.assert_called_once_with(run_glossary_check, glossary_check.pk)
+
+        response = self.client.get(glossary_check.get_absolute_url())
+        self.assertContains(response, 'hx-trigger="every 2s"')
+
+    def test_form_renders_only_chosen_glossaries(self):
+        with self.assertNumQueries(0):
+            html = str(GlossaryCheckForm()["glossaries"])
+        self.assertNotIn("Test Glossary", html)
+        self.assertIn("multiple=1", html)
+
+        form = GlossaryCheckForm(data={"glossaries": [self.glossary.pk, self.other_glossary.pk]})
+        with self.assertNumQueries(1):
+            html = str(form["glossaries"])
+        self.assertIn(f'<input type="hidden" name="glossaries" value="{self.glossary.pk}"', html)
+        self.assertIn("Other Glossary", html)
+
+    def test_form_validates_chosen_glossaries(self):
+        form = GlossaryCheckForm(data={"glossaries": [self.glossary.pk, self.other_glossary.pk]})
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(set(form.cleaned_data["glossaries"]), {self.glossary, self.other_glossary})
+
+        form = GlossaryCheckForm(data={"glossaries": [self.translation.pk]})
+        self.assertFalse(form.is_valid())
+
+    def test_autocomplete_adds_to_chosen_glossaries(self):
+        response = self.client.get(
+            reverse("resource_autocomplete"), {"q": "test", "target": "id_glossaries", "multiple": "1"}
+        )
+        self.assertContains(response, "addAutocompleteResource(this)")
+
+    def test_create_view(self):
+        url = reverse("glossary_check_create", args=[self.translation.pk])
+        response = self.client.post(url, {})
+        self.assertContains(response, "用語集を1つ以上選択してください。")
+
+        response = self.client.post(url, {"cancel": ""})
+        self.assertRedirects(response, self.translation.get_absolute_url())
+
+        response = self.client.get(reverse("glossary_check_create", args=[self.glossary.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(GLOSSARY_CHECK_PAGE_SIZE=1)
+    def test_issues_are_paginated(self):
+        glossary_check = self.check(self.glossary)
+        first, second, third = glossary_check.issues.order_by("id")
+
+        response = self.client.get(glossary_check.get_absolute_url())
+        self.assertNotContains(response, 'hx-trigger="every 2s"')
+        self.assertContains(response, "情報処理装置 → information processing device")
+        self.assertNotContains(response, "表示部 → display unit")
+        next_url = reverse("glossary_check_issues", args=[glossary_check.pk])
+        self.assertContains(response, f"{next_url}?after={first.pk}&offset=1")
+
+        response = self.client.get(next_url, {"after": first.pk, "offset": 1})
+        self.assertContains(response, "表示部 → display unit")
+        self.assertContains(response, f"?after={second.pk}&offset=2")
+
+        response = self.client.get(next_url, {"after": second.pk, "offset": 2})
+        self.assertContains(response, "記憶部 → storage unit")
+        self.assertNotContains(response, 'hx-trigger="revealed"')
+
+    def test_export(self):
+        glossary_check = self.check(self.glossary, self.other_glossary)
+        response = self.client.get(reverse("glossary_check_export", args=[glossary_check.pk]))
+        self.assertEqual(
+            response["Content-Disposition"], f'attachment; filename="glossary_check_{glossary_check.pk}.csv"'
+        )
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertTrue(content.startswith("\ufeff"))
+        rows = list(csv.reader(io.StringIO(content[1:])))
+        self.assertEqual(rows[0], ["原文", "訳文", "用語", "用語集の訳語", "用語集"])
+        self.assertEqual(
+            rows[2],
+            ["表示部と記憶部を備える。", "A display and a memory are provided.", "表示部", "display unit", "Test Glossary"],
+        )
+        self.assertEqual(len(rows), 3)
+
+    def test_upload_with_glossaries(self):
+        upload = docx_upload(rows=["表示部を備える。"], name="translation.docx")
+        data = {"upload_file": upload, "title": "Uploaded Translation", "glossaries": [self.glossary.pk]}
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with mock.patch("archive.glossary_check.run_in_background") as run_in_background:
+                response = self.client.post(reverse("translation_upload"), data)
+
+        glossary_check = GlossaryCheck.objects.get()
+        self.assertRedirects(response, glossary_check.get_absolute_url(), fetch_redirect_response=False)
+        self.assertEqual(glossary_check.resource.title, "Uploaded Translation")
+        run_in_background.assert_called_once_with(run_glossary_check, glossary_check.pk)
+        self.assertEqual(run_glossary_check(glossary_check.pk), 1)
+
+    def test_checks_are_deleted_with_translation(self):
+        self.check(self.glossary)
+        Resource.objects.filter(pk=self.translation.pk).update(pending_deletion=True)
+        delete_pending_resource(self.translation.pk)
+        self.assertFalse(GlossaryCheck.objects.exists())
+        self.assertFalse(GlossaryCheckIssue.objects.exists())
+        self.assertTrue(Resource.objects.filter(pk=self.glossary.pk).exists())
@@ -2,7 +2,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
-from ..models import Glossary, Entry
+from ..models import Item, Resource
 
 from freezegun import freeze_time
 
@@ -17,33 +17,33 @@ class ResourcesTagTests(TestCase):
             email="testuser@email.com",
             password="testuser1234",
         )
-        cls.test_glossary = Glossary.objects.create(
+        cls.test_glossary = Resource.objects.create(
+            resource_type="GLOSSARY",
             title="Test Glossary",
             notes="Test note.",
-            type="用語集",
             created_by=cls.test_user,
             updated_by=cls.test_user,
         )
-        Entry.objects.create(
-            glossary=cls.test_glossary,
+        Item.objects.create(
+            resource=cls.test_glossary,
             source="情報処理装置",
             target="<Information processing device & display device>",
             notes="Test note.",
         )
-        Entry.objects.create(
-            glossary=cls.test_glossary,
+        Item.objects.create(
+            resource=cls.test_glossary,
             source="鍵情報",
             target="key information",
             notes="Test note.",
         )
-        Entry.objects.create(
-            glossary=cls.test_glossary,
+        Item.objects.create(
+            resource=cls.test_glossary,
             source="! ? # $ % & | = + - * / \\ ~ ^ × ± ≠ ÷ @ [ ] { } ; : , . < > _",
             target="! ? # $ % & | = + - * / \\ ~ ^ × ± ≠ ÷ @ [ ] { } ; : , . < > _",
             notes="Test note.",
         )
-        Entry.objects.create(
-            glossary=cls.test_glossary,
+        Item.objects.create(
+            resource=cls.test_glossary,
             source="【１２３４５６７８９０】",
             target="[1234567890]",
             notes="Test note.",
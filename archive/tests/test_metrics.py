@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import cache as archive_cache
+from .. import metrics
+from ..models import Item, Resource
+from ..views.search_view import query_length_label
+
+
+class MetricsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.staff = User.objects.create_user(
+            username="staffuser",
+            email="staffuser@email.com",
+            password="staffuser123",
+            is_staff=True,
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        for i in range(3):
+            Item.objects.create(resource=cls.glossary, source=f"用語{i}", target=f"term {i}")
+
+    def setUp(self):
+        cache.clear()
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir, ignore_errors=True)
+
+    def test_query_length_label(self):
+        self.assertEqual(query_length_label("a"), "0-1")
+        self.assertEqual(query_length_label("用語"), "2-3")
+        self.assertEqual(query_length_label("term"), "4-7")
+        self.assertEqual(query_length_label("a" * 15), "8-15")
+        self.assertEqual(query_length_label("a" * 16), "16+")
+
+    def test_histogram_values_are_copies(self):
+        metrics.SEARCH_HITS.observe(1, scope="test")
+        before = metrics.SEARCH_HITS.get(scope="test")
+        metrics.SEARCH_HITS.observe(1, scope="test")
+        self.assertEqual(before[-1] + 1, metrics.SEARCH_HITS.get(scope="test")[-1])
+
+    def test_search_is_recorded(self):
+        self.client.force_login(self.user)
+        labels = {"scope": "all", "query_length": "4-7"}
+        searches = metrics.SEARCHES.get(**labels)
+        durations = metrics.SEARCH_DURATION.get(**labels)
+        hits = metrics.SEARCH_HITS.get(scope="all")
+
+        response = self.client.get(reverse("search"), {"query": "term", "resource": "すべてのリソース"})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(metrics.SEARCHES.get(**labels), searches + 1)
+        self.assertEqual(metrics.SEARCH_DURATION.get(**labels)[-1], durations[-1] + 1)
+        # 3 hits are counted in the "10" bucket.
+        bucket = metrics.SEARCH_HITS.buckets.index(10)
+        self.assertEqual(metrics.SEARCH_HITS.get(scope="all")[bucket], hits[bucket] + 1)
+        self.assertEqual(metrics.SEARCH_HITS.get(scope="all")[-2], hits[-2] + 3)
+
+    def test_cache_lookups_are_recorded(self):
+        hits = metrics.CACHE_REQUESTS.get(namespace=archive_cache.STATS, result="hit")
+        misses = metrics.CACHE_REQUESTS.get(namespace=archive_cache.STATS, result="miss")
+
+        archive_cache.get_or_set(archive_cache.STATS, "test", 1)
+        archive_cache.get_or_set(archive_cache.STATS, "test", 1)
+        archive_cache.get(archive_cache.STATS, "other")
+
+        self.assertEqual(metrics.CACHE_REQUESTS.get(namespace=archive_cache.STATS, result="hit"), hits + 1)
+        self.assertEqual(metrics.CACHE_REQUESTS.get(namespace=archive_cache.STATS, result="miss"), misses + 2)
+
+    def test_glossary_upload_is_recorded(self):
+        rows = metrics.IMPORTED_ROWS.get(format="tsv")
+        imports = metrics.IMPORT_DURATION.get(format="tsv")[-1]
+
+        self.client.force_login(self.user)
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            response = self.client.post(
+                reverse("glossary_upload"),
+                {
+                    "title": "Uploaded Glossary",
+                    "notes": "",
+                    "upload_file": SimpleUploadedFile("glossary.txt", "用語\tterm\n原文\tsource\n".encode()),
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(metrics.IMPORTED_ROWS.get(format="tsv"), rows + 2)
+        self.assertEqual(metrics.IMPORT_DURATION.get(format="tsv")[-1], imports + 1)
+
+    def test_metrics_view_permissions(self):
+        url = reverse("metrics")
+        self.assertEqual(url, "/metrics")
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        with self.settings(METRICS_TOKEN="secret"):
+            self.client.logout()
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+            response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+            self.assertEqual(response.status_code, 200)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+    def test_metrics_view_content(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse("search"), {"query": "term", "resource": "Test Glossary"})
+        content = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn("# TYPE archive_searches_total counter\n", content)
+        self.assertIn("# TYPE archive_search_duration_seconds histogram\n", content)
+        self.assertRegex(content, r'archive_searches_total\{scope="resource",query_length="4-7"\} \d+\n')
+        self.assertRegex(
+            content,
+            r'archive_search_duration_seconds_bucket\{scope="resource",query_length="4-7",le="\+Inf"\} \d+\n',
+        )
+        self.assertRegex(content, r'archive_search_hits_sum\{scope="resource"\} \d+\n')
+
+    def write_process_file(self, pid, values):
+        with open(os.path.join(self.metrics_dir, f"{pid}.json"), "w", encoding="utf-8") as f:
+            json.dump({"pid": pid, "metrics": values}, f)
+
+    def stopped_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        return process.pid
+
+    def test_processes_are_aggregated(self):
+        with self.settings(METRICS_DIR=self.metrics_dir):
+            metrics.IMPORTED_ROWS.inc(5, format="tmx")
+            metrics.QUEUED_JOBS.inc()
+            self.addCleanup(metrics.QUEUED_JOBS.dec)
+            own_rows = metrics.IMPORTED_ROWS.get(format="tmx")
+            own_jobs = metrics.QUEUED_JOBS.get()
+            imports = metrics.IMPORT_DURATION.zero()
+            imports[0] = imports[-1] = 1
+
+            # A running process (the parent of this one) and a stopped process.
+            for pid in (os.getppid(), self.stopped_pid()):
+                self.write_process_file(
+                    pid,
+                    {
+                        "archive_import_rows_total": [[["tmx"], 10]],
+                        "archive_import_duration_seconds": [[["tmx"], imports]],
+                        "archive_queued_jobs": [[[], 2]],
+                        "archive_removed_metric": [[[], 1]],
+                    },
+                )
+            totals = metrics.collect()
+
+            self.assertTrue(os.path.exists(os.path.join(self.metrics_dir, f"{os.getpid()}.json")))
+            self.assertEqual(totals["archive_import_rows_total"][("tmx",)], own_rows + 20)
+            self.assertEqual(
+                totals["archive_import_duration_seconds"][("tmx",)][-1],
+                metrics.IMPORT_DURATION.get(format="tmx")[-1] + 2,
+            )
+            # Gauges of stopped processes are not included.
+            self.assertEqual(totals["archive_queued_jobs"][()], own_jobs + 2)
+            self.assertNotIn("archive_removed_metric", totals)
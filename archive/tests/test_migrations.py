@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from ..migration_utils import (COPIED_MARKS, COPIED_RESOURCES, copy_entries, copy_glossaries, copy_segments,
+                               copy_translations, drop_copy_tables)
+
+
+class LegacyDataMigrationTests(TransactionTestCase):
+    """
+    Checks the copying of the legacy models into Resource and Item
+    (migrations 0036 to 0039) and the deletion of the legacy tables (0043).
+    """
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([("archive", target)])
+        return executor.loader.project_state([("archive", target)]).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes("archive")[0][1])
+
+    def create_legacy_data(self, apps):
+        User = apps.get_model(*get_user_model()._meta.label.split("."))
+        Glossary = apps.get_model("archive", "Glossary")
+        Entry = apps.get_model("archive", "Entry")
+        Translation = apps.get_model("archive", "Translation")
+        Segment = apps.get_model("archive", "Segment")
+
+        user = User.objects.create(username="legacyuser")
+        glossary = Glossary.objects.create(title="Test", notes="Glossary notes", type="用語集", created_by=user)
+        Entry.objects.bulk_create(
+            [Entry(glossary=glossary, source=f"原文{i}", target=f"Target {i}", created_by=user) for i in range(3)]
+        )
+        # A translation with the same title as the glossary.
+        translation = Translation.objects.create(title="Test", client="ABC社", type="翻訳", created_by=user)
+        Segment.objects.bulk_create(
+            [Segment(translation=translation, source=f"文{i}", target=f"Sentence {i}") for i in range(2)]
+        )
+        return glossary, translation
+
+    def test_legacy_data_copied(self):
+        apps = self.migrate("0035_resource_item")
+        glossary, translation = self.create_legacy_data(apps)
+
+        apps = self.migrate("0039_auto_20230715_1110")
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+
+        glossary_resource = Resource.objects.get(resource_type="GLOSSARY")
+        self.assertEqual(glossary_resource.title, "Test")
+        self.assertEqual(glossary_resource.notes, "Glossary notes")
+        self.assertEqual(glossary_resource.created_on, glossary.created_on)
+        self.assertEqual(glossary_resource.created_by.username, "legacyuser")
+
+        translation_resource = Resource.objects.get(resource_type="TRANSLATION")
+        self.assertEqual(translation_resource.client, "ABC社")
+
+        self.assertEqual(
+            list(Item.objects.filter(resource=glossary_resource).values_list("source", flat=True).order_by("id")),
+            ["原文0", "原文1", "原文2"],
+        )
+        self.assertEqual(Item.objects.filter(resource=translation_resource).count(), 2)
+
+        # Running the copies again does not copy anything twice.
+        with connection.schema_editor() as schema_editor:
+            for copy in (copy_glossaries, copy_translations, copy_entries, copy_segments):
+                copy(apps, schema_editor)
+        self.assertEqual(Resource.objects.count(), 2)
+        self.assertEqual(Item.objects.count(), 5)
+
+    def test_legacy_tables_deleted_after_copying_remaining_data(self):
+        apps = self.migrate("0035_resource_item")
+        self.create_legacy_data(apps)
+
+        apps = self.migrate("0043_retire_legacy_models")
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+
+        self.assertEqual(Resource.objects.count(), 2)
+        self.assertEqual(Item.objects.count(), 5)
+        self.assertEqual(Resource.objects.get(resource_type="GLOSSARY").item_count, 3)
+
+        tables = connection.introspection.table_names()
+        for table in (
+            "archive_glossary", "archive_entry", "archive_translation", "archive_segment",
+            COPIED_RESOURCES, COPIED_MARKS,
+        ):
+            self.assertNotIn(table, tables)
+
+    def test_legacy_data_added_after_copying_is_not_lost(self):
+        apps = self.migrate("0035_resource_item")
+        glossary, translation = self.create_legacy_data(apps)
+        apps = self.migrate("0039_auto_20230715_1110")
+
+        Glossary = apps.get_model("archive", "Glossary")
+        Entry = apps.get_model("archive", "Entry")
+        Segment = apps.get_model("archive", "Segment")
+        Entry.objects.create(glossary_id=glossary.pk, source="原文3", target="Target 3")
+        Segment.objects.create(translation_id=translation.pk, source="文2", target="Sentence 2")
+        new_glossary = Glossary.objects.create(title="New", type="用語集")
+        Entry.objects.create(glossary=new_glossary, source="新語", target="New term")
+
+        apps = self.migrate("0043_retire_legacy_models")
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+
+        glossary_resource = Resource.objects.get(resource_type="GLOSSARY", title="Test")
+        self.assertEqual(
+            list(Item.objects.filter(resource=glossary_resource).values_list("source", flat=True).order_by("id")),
+            ["原文0", "原文1", "原文2", "原文3"],
+        )
+        self.assertEqual(glossary_resource.item_count, 4)
+        translation_resource = Resource.objects.get(resource_type="TRANSLATION")
+        self.assertEqual(translation_resource.item_count, 3)
+        new_resource = Resource.objects.get(resource_type="GLOSSARY", title="New")
+        self.assertEqual(list(Item.objects.filter(resource=new_resource).values_list("source", flat=True)), ["新語"])
+
+    def test_changes_made_after_copying_are_kept(self):
+        apps = self.migrate("0035_resource_item")
+        glossary, translation = self.create_legacy_data(apps)
+        apps = self.migrate("0039_auto_20230715_1110")
+
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+        glossary_resource = Resource.objects.get(resource_type="GLOSSARY")
+        Resource.objects.filter(pk=glossary_resource.pk).update(title="Renamed")
+        Item.objects.filter(resource=glossary_resource, source="原文0").update(target="Edited target")
+        Item.objects.filter(resource=glossary_resource, source="原文1").delete()
+        Item.objects.filter(resource__resource_type="TRANSLATION").delete()
+        Resource.objects.filter(resource_type="TRANSLATION").delete()
+
+        # Added to the legacy glossary after its resource was renamed.
+        Entry = apps.get_model("archive", "Entry")
+        Entry.objects.create(glossary_id=glossary.pk, source="原文3", target="Target 3")
+
+        apps = self.migrate("0043_retire_legacy_models")
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+
+        # Neither the renamed nor the deleted resource is copied again.
+        self.assertEqual(list(Resource.objects.values_list("resource_type", "title")), [("GLOSSARY", "Renamed")])
+        self.assertEqual(
+            list(Item.objects.values_list("source", "target").order_by("id")),
+            [("原文0", "Edited target"), ("原文2", "Target 2"), ("原文3", "Target 3")],
+        )
+        self.assertEqual(Resource.objects.get().item_count, 3)
+
+    def test_nothing_copied_again_without_record_of_earlier_copy(self):
+        # Databases copied by earlier versions of migrations 0036 to 0039
+        # have no record of what was copied.
+        apps = self.migrate("0035_resource_item")
+        glossary, translation = self.create_legacy_data(apps)
+        apps = self.migrate("0039_auto_20230715_1110")
+        with connection.schema_editor() as schema_editor:
+            drop_copy_tables(apps, schema_editor)
+        Resource = apps.get_model("archive", "Resource")
+        Resource.objects.filter(resource_type="TRANSLATION").delete()
+
+        apps = self.migrate("0043_retire_legacy_models")
+        Resource = apps.get_model("archive", "Resource")
+        Item = apps.get_model("archive", "Item")
+
+        self.assertEqual(Resource.objects.count(), 1)
+        self.assertEqual(Item.objects.count(), 3)
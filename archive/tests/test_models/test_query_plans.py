@@ -0,0 +1,79 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import TestCase
+
+from ...models import Item, Resource
+from ...views.homepage_views import HOME_TABLE_ORDERINGS
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked in the SQLite format.")
+class QueryPlanTests(TestCase):
+    """
+    Checks that the frequently run queries use an index instead of scanning
+    a whole table or sorting the rows after fetching them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.resource = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Item.objects.create(resource=cls.resource, source="電極", target="electrode")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        # A table is only scanned without an index when "SCAN <table>" is not
+        # followed by "USING ... INDEX".
+        self.assertIsNone(re.search(r"SCAN archive_\w+$", plan, re.MULTILINE), plan)
+        self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_homepage_table_orderings(self):
+        index_names = {
+            "title": "resource_title_lower_idx",
+            "type": "resource_type_title_idx",
+            "created_on": "resource_created_on_idx",
+        }
+        for filter, expressions in HOME_TABLE_ORDERINGS.items():
+            for ordering in (
+                [expression.asc() for expression in expressions],
+                [expression.desc() for expression in expressions],
+            ):
+                with self.subTest(filter=filter, ordering=ordering):
+                    queryset = Resource.objects.order_by(*ordering)[:51]
+                    self.assertUsesIndex(queryset, index_names[filter])
+
+    def test_navbar_resources(self):
+        queryset = Resource.objects.order_by(Lower("title")).values_list("resource_type", "title")
+        self.assertUsesIndex(queryset, "resource_title_lower_idx")
+
+    def test_title_check(self):
+        queryset = Resource.objects.with_title("test glossary", resource_type="GLOSSARY")
+        self.assertUsesIndex(queryset, "resource_type_title_idx")
+
+    def test_autocomplete_prefix(self):
+        queryset = (
+            Resource.objects
+            .filter(resource_type="GLOSSARY")
+            .annotate(lower_title=Lower("title"))
+            .filter(lower_title__gte="test", lower_title__lt="test\U0010ffff")
+            .order_by("lower_title", "id")
+        )
+        self.assertUsesIndex(queryset, "resource_type_title_idx")
+
+    def test_search_in_specific_resource(self):
+        queryset = Item.objects.filter(resource__title="Test Glossary")
+        self.assertUsesIndex(queryset, "resource_title_idx")
+
+    def test_resource_content_page(self):
+        queryset = (
+            Item.objects
+            .filter(resource=self.resource, id__gt=0)
+            .order_by("id")
+        )
+        self.assertUsesIndex(queryset, "archive_item_resource_id")
+
+    def test_recently_updated_items(self):
+        queryset = Item.objects.order_by("-updated_on")[:10]
+        self.assertUsesIndex(queryset, "item_updated_on_idx")
@@ -1,7 +1,8 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
-from ...models import Resource
+from ...models import Item, Resource
 
 from freezegun import freeze_time
 
@@ -384,3 +385,81 @@ class ResourceModelTests(TestCase):
         resource = Resource.objects.get(id=1)
         self.assertEqual(resource.get_absolute_url(), "/glossary/1/")
         self.assertNotEqual(resource.get_absolute_url(), "")
+
+
+class ResourceItemCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        cls.translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        for i in range(3):
+            Item.objects.create(resource=cls.glossary, source=f"用語{i}", target=f"term {i}")
+        Item.objects.create(resource=cls.translation, source="原文", target="Target")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_item_count_is_incremented_on_create(self):
+        self.glossary.refresh_from_db()
+        self.assertEqual(self.glossary.item_count, 3)
+
+    def test_item_count_is_decremented_on_delete(self):
+        Item.objects.filter(resource=self.glossary).first().delete()
+        self.glossary.refresh_from_db()
+        self.assertEqual(self.glossary.item_count, 2)
+
+    def test_item_count_is_updated_when_item_is_moved(self):
+        item = Item.objects.filter(resource=self.glossary).first()
+        item.resource = self.translation
+        item.save()
+        self.glossary.refresh_from_db()
+        self.translation.refresh_from_db()
+        self.assertEqual(self.glossary.item_count, 2)
+        self.assertEqual(self.translation.item_count, 2)
+
+    def test_item_count_is_unchanged_when_item_is_edited(self):
+        item = Item.objects.filter(resource=self.glossary).first()
+        item.target = "edited"
+        item.save()
+        item.save()
+        self.glossary.refresh_from_db()
+        self.assertEqual(self.glossary.item_count, 3)
+
+    def test_recount_items(self):
+        Resource.objects.update(item_count=0)
+        Resource.objects.recount_items()
+        self.assertEqual(
+            list(Resource.objects.order_by("id").values_list("item_count", flat=True)),
+            [3, 1],
+        )
+
+    def test_archive_stats(self):
+        self.assertEqual(
+            Resource.objects.archive_stats(),
+            {
+                "num_of_resources": 2,
+                "num_of_glossaries": 1,
+                "num_of_translations": 1,
+                "num_of_all_entries": 4,
+                "num_of_gloss_entries": 3,
+                "num_of_trans_segments": 1,
+            },
+        )
+
+    def test_archive_stats_use_one_query_and_are_cached(self):
+        with self.assertNumQueries(1):
+            Resource.objects.archive_stats()
+        with self.assertNumQueries(0):
+            Resource.objects.archive_stats()
+
+    def test_archive_stats_are_cleared_on_writes(self):
+        Resource.objects.archive_stats()
+        Item.objects.create(resource=self.translation, source="原文2", target="Target 2")
+        self.assertEqual(Resource.objects.archive_stats()["num_of_trans_segments"], 2)
+        Resource.objects.create(resource_type="GLOSSARY", title="New Glossary")
+        self.assertEqual(Resource.objects.archive_stats()["num_of_glossaries"], 2)
+        self.glossary.delete()
+        stats = Resource.objects.archive_stats()
+        self.assertEqual(stats["num_of_glossaries"], 1)
+        self.assertEqual(stats["num_of_gloss_entries"], 0)
@@ -0,0 +1,221 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from docx import Document
+from translate.storage.tmx import tmxfile
+
+from ..models import Item, Resource
+from ..pretranslation import pretranslate
+from ..term_index import NgramIndex, TermIndex, normalize, segment_hash, worker_context
+
+
+def tmx_upload(segments, name="source.tmx"):
+    units = "".join(
+        f'<tu><tuv xml:lang="ja"><seg>{segment}</seg></tuv></tu>' for segment in segments
+    )
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<tmx version="1.4"><header srclang="ja" datatype="plaintext" segtype="sentence" '
+        'adminlang="ja" creationtool="test" creationtoolversion="1" o-tmf="test"/>'
+        f"<body>{units}</body></tmx>"
+    )
+    return SimpleUploadedFile(name, content.encode("utf-8"))
+
+
+def docx_upload(paragraphs=(), rows=(), name="source.docx"):
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    if rows:
+        table = document.add_table(rows=0, cols=2)
+        for row in rows:
+            table.add_row().cells[0].text = row
+    file = io.BytesIO()
+    document.save(file)
+    return SimpleUploadedFile(name, file.getvalue())
+
+
+class TermIndexTests(TestCase):
+
+    def test_normalize_and_hash(self):
+        self.assertEqual(normalize(" ＡＢＣ　 def\n"), "ABC def")
+        self.assertEqual(segment_hash("ＡＢＣ  def"), segment_hash("ABC def"))
+        self.assertNotEqual(segment_hash("ABC def"), segment_hash("abc def"))
+        self.assertEqual(segment_hash(" "), "")
+
+    def test_terms_are_found(self):
+        index = TermIndex(["情報処理", "情報処理装置", "装置", "Display"])
+        self.assertEqual(index.find("情報処理装置とdisplay装置"), [(0, 6, 1), (7, 14, 3), (14, 16, 2)])
+        self.assertEqual(index.find("記録媒体"), [])
+
+    def test_best_fuzzy_matches(self):
+        index = NgramIndex(["情報処理装置を備える。", "表示装置"], 0.75)
+        best = index.best_matches(
+            [("情報処理装置を備えた。", "A"), ("情報処理装置を備える", "B"), ("表示部", "C")]
+        )
+        self.assertEqual(best[0][1:], ("情報処理装置を備える", "B"))
+        self.assertNotIn(1, best)
+
+    def test_parallel_matches_are_the_same(self):
+        index = NgramIndex(["情報処理装置を備える。"], 0.5)
+        chunks = [
+            [("情報処理装置を備えた。", "A")],
+            [("表示装置を備える。", "B")],
+            [("情報処理装置を備える", "C")],
+        ]
+        self.assertEqual(index.best_matches_in_parallel(chunks, 2), index.best_matches_in_parallel(chunks, 1))
+
+    def test_workers_are_not_forked(self):
+        self.assertNotEqual(worker_context().get_start_method(), "fork")
+
+
+class PretranslationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        Item.objects.bulk_create(
+            [
+                Item(
+                    resource=cls.translation,
+                    source="本発明は情報処理装置に関する。",
+                    target="The invention relates to an information processing device.",
+                ),
+                Item(
+                    resource=cls.translation,
+                    source="表示部は画像を表示する。",
+                    target="The display unit displays an image.",
+                ),
+            ]
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Item.objects.create(resource=cls.glossary, source="情報処理装置", target="information processing device")
+        Item.objects.create(resource=cls.glossary, source="表示部", target="display unit")
+        # Not looked up as a term.
+        Item.objects.create(resource=cls.glossary, source="部", target="part")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_source_hash_is_set(self):
+        item = Item.objects.get(source="表示部")
+        self.assertEqual(item.source_hash, segment_hash("表示部"))
+        item.source = "表示装置"
+        item.save()
+        self.assertEqual(Item.objects.get(pk=item.pk).source_hash, segment_hash("表示装置"))
+        self.assertFalse(Item.objects.filter(source_hash="").exists())
+
+        Item.objects.filter(pk=item.pk).update(source_hash="")
+        Item.objects.fill_source_hashes()
+        self.assertEqual(Item.objects.get(pk=item.pk).source_hash, segment_hash("表示装置"))
+
+    def test_matches(self):
+        segments = [
+            "本発明は情報処理装置に関する。",
+            " 本発明は情報処理装置に関する。",
+            "表示部は画像を表示する",
+            "記録媒体",
+        ]
+        with self.assertNumQueries(3):
+            matches = pretranslate(segments, 0.75, workers=1)
+
+        self.assertEqual(len(matches), 3)
+        exact = matches["本発明は情報処理装置に関する。"]
+        self.assertEqual(exact.score, 1)
+        self.assertEqual(exact.target, "The invention relates to an information processing device.")
+        self.assertEqual(exact.terms, [("情報処理装置", "information processing device", "Test Glossary")])
+
+        fuzzy = matches["表示部は画像を表示する"]
+        self.assertGreater(fuzzy.score, 0.75)
+        self.assertLess(fuzzy.score, 1)
+        self.assertEqual(fuzzy.target, "The display unit displays an image.")
+        self.assertEqual(fuzzy.terms, [("表示部", "display unit", "Test Glossary")])
+
+        self.assertIsNone(matches["記録媒体"].score)
+        self.assertEqual(matches["記録媒体"].terms, [])
+
+    def test_fuzzy_match_with_whitespace(self):
+        # Longer than the segment can be to match before being normalized.
+        Item.objects.create(
+            resource=self.translation, source="記録媒体は" + " " * 12 + "画像を記録する。", target="The medium records an image."
+        )
+        matches = pretranslate(["記録媒体は画像を記録する"], 0.75, workers=1)
+        self.assertEqual(matches["記録媒体は画像を記録する"].target, "The medium records an image.")
+
+    def test_glossary_index_is_cached(self):
+        pretranslate(["表示部"], 0.75, workers=1)
+        with self.assertNumQueries(2):
+            pretranslate(["表示部"], 0.75, workers=1)
+
+        Item.objects.create(resource=self.glossary, source="画像", target="image")
+        matches = pretranslate(["表示部の画像"], 0.75, workers=1)
+        self.assertEqual([term[0] for term in matches["表示部の画像"].terms], ["表示部", "画像"])
+
+    def test_tmx_is_pretranslated(self):
+        upload = tmx_upload(["本発明は情報処理装置に関する。", "記録媒体", "表示部は画像を表示する"])
+        response = self.client.post(reverse("pretranslate"), {"upload_file": upload, "threshold": 75})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="source_pretranslated.tmx"')
+
+        output = tmxfile(io.BytesIO(b"".join(response.streaming_content)))
+        units = list(output.unit_iter())
+        self.assertEqual(
+            [unit.source for unit in units], ["本発明は情報処理装置に関する。", "記録媒体", "表示部は画像を表示する"]
+        )
+        self.assertEqual(units[0].target, "The invention relates to an information processing device.")
+        self.assertIn("完全一致", units[0].getnotes())
+        self.assertFalse(units[1].target)
+        self.assertEqual(units[2].target, "The display unit displays an image.")
+        self.assertIn("類似一致", units[2].getnotes())
+        self.assertIn("用語: 表示部 → display unit（Test Glossary）", units[2].getnotes())
+
+    def test_docx_is_pretranslated(self):
+        upload = docx_upload(paragraphs=["本発明は情報処理装置に関する。記録媒体を備える。", ""])
+        response = self.client.post(reverse("pretranslate"), {"upload_file": upload, "threshold": 75})
+        self.assertEqual(response.status_code, 200)
+
+        output = Document(io.BytesIO(b"".join(response.streaming_content)))
+        rows = [[cell.text for cell in row.cells] for row in output.tables[0].rows]
+        self.assertEqual(
+            rows,
+            [
+                [
+                    "本発明は情報処理装置に関する。",
+                    "The invention relates to an information processing device.",
+                    "完全一致\n用語: 情報処理装置 → information processing device（Test Glossary）",
+                ],
+                ["記録媒体を備える。", "", ""],
+            ],
+        )
+
+    def test_docx_table_is_pretranslated(self):
+        upload = docx_upload(rows=["表示部は画像を表示する。"])
+        response = self.client.post(reverse("pretranslate"), {"upload_file": upload, "threshold": 75})
+        output = Document(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(output.tables[0].rows[0].cells[1].text, "The display unit displays an image.")
+
+    def test_invalid_uploads(self):
+        upload = SimpleUploadedFile("source.docx", b"not a docx")
+        response = self.client.post(reverse("pretranslate"), {"upload_file": upload, "threshold": 75})
+        self.assertContains(response, "選択したファイルを読み込めませんでした。")
+
+        response = self.client.post(reverse("pretranslate"), {"upload_file": docx_upload(), "threshold": 75})
+        self.assertContains(response, "選択したファイルに原文が見つかりません。")
+
+        response = self.client.post(reverse("pretranslate"), {"upload_file": tmx_upload(["原文"]), "threshold": 10})
+        self.assertContains(response, "50以上の数値を入力してください。")
+
+    @override_settings(PRETRANSLATE_FUZZY_THRESHOLD=80)
+    def test_form_default_threshold(self):
+        response = self.client.get(reverse("pretranslate"))
+        self.assertContains(response, 'value="80"')
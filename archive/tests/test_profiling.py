@@ -0,0 +1,114 @@
+import marshal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Item, ProfileReport, Resource
+from ..profiling import PROFILE_COOKIE, REPORT_HEADER
+
+
+class ProfilingMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create_user(
+            username="staffuser",
+            email="staffuser@email.com",
+            password="staffuser123",
+            is_staff=True,
+        )
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Item.objects.create(resource=cls.glossary, source="用語", target="term")
+        cls.search_url = reverse("search") + "?query=term&resource=すべてのリソース"
+
+    def setUp(self):
+        cache.clear()
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.search_url + "&profile=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "term")
+
+        report = ProfileReport.objects.get()
+        self.assertEqual(
+            response[REPORT_HEADER], reverse("admin:archive_profilereport_change", args=[report.pk])
+        )
+        self.assertEqual(report.user, self.staff)
+        self.assertEqual(report.method, "GET")
+        self.assertEqual(report.status_code, 200)
+        self.assertIn("profile=1", report.path)
+        self.assertIn("cumulative", report.functions)
+
+        # Queries are sorted from the slowest, each with its plan.
+        self.assertEqual(report.query_count, len(report.queries))
+        durations = [query["duration_ms"] for query in report.queries]
+        self.assertEqual(durations, sorted(durations, reverse=True))
+        search = next(query for query in report.queries if "archive_item" in query["sql"])
+        self.assertIn("SCAN", search["plan"])
+
+        # The stats can be loaded by pstats (e.g. for snakeviz).
+        self.assertIsInstance(marshal.loads(bytes(report.stats)), dict)
+
+    def test_not_profiled_without_switch(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.search_url)
+        self.assertNotIn(REPORT_HEADER, response)
+        self.assertFalse(ProfileReport.objects.exists())
+
+    def test_non_staff_request_is_not_profiled(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.search_url + "&profile=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(REPORT_HEADER, response)
+        self.assertNotIn(PROFILE_COOKIE, response.cookies)
+        self.assertFalse(ProfileReport.objects.exists())
+
+    def test_cookie_profiles_following_requests(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.search_url + "&profile=on")
+        self.assertEqual(response.cookies[PROFILE_COOKIE].value, "1")
+
+        self.client.get(self.glossary.get_absolute_url())
+        self.assertEqual(ProfileReport.objects.count(), 2)
+
+        response = self.client.get(self.search_url + "&profile=off")
+        self.assertNotIn(REPORT_HEADER, response)
+        self.assertEqual(response.cookies[PROFILE_COOKIE].value, "")
+
+        self.client.get(self.glossary.get_absolute_url())
+        self.assertEqual(ProfileReport.objects.count(), 2)
+
+    def test_admin_views_and_downloads(self):
+        self.client.force_login(self.staff)
+        self.client.get(self.search_url + "&profile=1")
+        report = ProfileReport.objects.get()
+
+        admin = get_user_model().objects.create_superuser(
+            username="admin", email="admin@email.com", password="admin123"
+        )
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse("admin:archive_profilereport_change", args=[report.pk]))
+        self.assertContains(response, "Slowest queries")
+
+        response = self.client.get(reverse("admin:archive_profilereport_download", args=[report.pk]))
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertContains(response, "Plan:")
+
+        response = self.client.get(reverse("admin:archive_profilereport_stats", args=[report.pk]))
+        self.assertEqual(response.content, bytes(report.stats))
+
+        # Staff users without the view permission cannot download reports.
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("admin:archive_profilereport_download", args=[report.pk]))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,84 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..models import Item
+from ..routers import (READ_PRIMARY_COOKIE, ReplicaRouter,
+                       ReplicaRoutingMiddleware, read_from_replica,
+                       replica_reads)
+from ..views.search_view import SearchView
+
+
+def database_for_read():
+    return ReplicaRouter().db_for_read(Item)
+
+
+@replica_reads
+def read_only_view(request):
+    return HttpResponse(database_for_read())
+
+
+def other_view(request):
+    return HttpResponse(database_for_read())
+
+
+@replica_reads
+def streaming_view(request):
+    return StreamingHttpResponse(database_for_read() for i in range(2))
+
+
+@override_settings(REPLICA_DATABASE="replica", READ_PRIMARY_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def get_response(self, view, request):
+        def get_response(request):
+            return middleware.process_view(request, view, (), {}) or view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_read_only_view_uses_replica(self):
+        response = self.get_response(read_only_view, RequestFactory().get("/"))
+        self.assertEqual(response.content, b"replica")
+        self.assertEqual(database_for_read(), "default")
+
+    def test_other_view_uses_primary(self):
+        response = self.get_response(other_view, RequestFactory().get("/"))
+        self.assertEqual(response.content, b"default")
+
+    def test_class_based_view_marked_as_read_only(self):
+        self.assertTrue(SearchView.use_replica)
+        view = SearchView.as_view()
+        request = RequestFactory().get("/")
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+        middleware.process_view(request, view, (), {})
+        self.assertTrue(request.use_replica)
+        self.assertEqual(database_for_read(), "replica")
+        request._replica_token.var.reset(request._replica_token)
+
+    def test_write_sets_read_primary_cookie(self):
+        response = self.get_response(other_view, RequestFactory().post("/"))
+        self.assertEqual(response.cookies[READ_PRIMARY_COOKIE]["max-age"], 10)
+
+    def test_primary_used_after_write(self):
+        request = RequestFactory().get("/")
+        request.COOKIES[READ_PRIMARY_COOKIE] = "1"
+        response = self.get_response(read_only_view, request)
+        self.assertEqual(response.content, b"default")
+
+    def test_streamed_content_read_from_replica(self):
+        response = self.get_response(streaming_view, RequestFactory().get("/"))
+        self.assertEqual(b"".join(response.streaming_content), b"replicareplica")
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_primary_used_without_replica(self):
+        response = self.get_response(read_only_view, RequestFactory().get("/"))
+        self.assertEqual(response.content, b"default")
+        with read_from_replica():
+            self.assertEqual(database_for_read(), "default")
+
+    def test_writes_and_migrations_use_primary(self):
+        router = ReplicaRouter()
+        with read_from_replica():
+            self.assertEqual(router.db_for_write(Item), "default")
+        self.assertFalse(router.allow_migrate("replica", "archive"))
+        self.assertTrue(router.allow_migrate("default", "archive"))
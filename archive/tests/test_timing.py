@@ -0,0 +1,84 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Item, Resource
+from ..timing import Timings, finish_request, start_request, timed
+
+
+class TimingMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Item.objects.create(resource=cls.glossary, source="用語", target="term")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(self.glossary.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        metrics = {metric.split(";")[0] for metric in response["Server-Timing"].split(", ")}
+        self.assertEqual(metrics, {"total", "sql", "template"})
+        self.assertRegex(response["Server-Timing"], r'sql;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    @override_settings(SERVER_TIMING=False)
+    def test_no_server_timing_header_when_disabled(self):
+        response = self.client.get(self.glossary.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_timings_logged_as_json(self):
+        url = reverse("search") + "?query=term&resource=すべてのリソース"
+        with self.assertLogs("archive.timing", "INFO") as logs:
+            self.client.get(url)
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["path"], reverse("search"))
+        self.assertEqual(record["view"], "search")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["sql_count"], 0)
+        self.assertEqual(logs.records[-1].timing, record)
+
+
+class TimedTests(TestCase):
+
+    def test_timed_adds_to_current_request(self):
+        timings, token = start_request()
+        try:
+            with timed("parse"):
+                pass
+            with timed("parse"):
+                pass
+            with timed("insert"):
+                Resource.objects.count()
+        finally:
+            record = dict(timings.as_dict())
+            server_timing = finish_request(RequestFactory().post("/"), HttpResponse(), timings, token)
+
+        self.assertIn("parse_ms", record)
+        self.assertIn("insert_ms", record)
+        self.assertEqual(record["sql_count"], 1)
+        self.assertIn("parse;dur=", server_timing)
+        self.assertIn("insert;dur=", server_timing)
+
+    def test_timed_outside_requests_records_nothing(self):
+        with timed("parse"):
+            Resource.objects.count()
+        timings = Timings()
+        self.assertEqual(timings.durations, {})
+        self.assertEqual(timings.sql_count, 0)
@@ -0,0 +1,131 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ...models import Item, Resource
+
+
+class ConditionalResponseTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        cls.item = Item.objects.create(resource=cls.glossary, source="用語", target="term")
+        cls.other = Resource.objects.create(resource_type="GLOSSARY", title="Other Glossary")
+        cls.search_url = reverse("search") + "?query=term&resource=すべてのリソース"
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get_again(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_resource_detail_returns_304_when_unchanged(self):
+        url = self.glossary.get_absolute_url()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+        # Only the validators are queried (session, user and resource).
+        with self.assertNumQueries(3):
+            response = self.get_again(url, response)
+        self.assertEqual(response.status_code, 304)
+
+    def test_search_returns_304_when_unchanged(self):
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "term")
+
+        with self.assertNumQueries(2):
+            response = self.get_again(self.search_url, response)
+        self.assertEqual(response.status_code, 304)
+
+    def test_resource_content_returns_304_when_unchanged(self):
+        url = reverse("resource_content", args=[self.glossary.pk])
+        response = self.client.get(url)
+        self.assertEqual(self.get_again(url, response).status_code, 304)
+
+    def test_item_edit_changes_etags(self):
+        detail = self.client.get(self.glossary.get_absolute_url())
+        search = self.client.get(self.search_url)
+
+        self.item.target = "new term"
+        self.item.save()
+
+        self.assertEqual(self.get_again(self.glossary.get_absolute_url(), detail).status_code, 200)
+        response = self.get_again(self.search_url, search)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "new term")
+
+    def test_change_to_other_resource_changes_search_etag(self):
+        response = self.client.get(self.search_url)
+        Item.objects.create(resource=self.other, source="用語2", target="term 2")
+        self.assertEqual(self.get_again(self.search_url, response).status_code, 200)
+
+    def test_etag_depends_on_query(self):
+        response = self.client.get(self.search_url)
+        other_url = reverse("search") + "?query=other&resource=すべてのリソース"
+        self.assertEqual(self.get_again(other_url, response).status_code, 200)
+
+    def test_etag_depends_on_user(self):
+        url = self.glossary.get_absolute_url()
+        response = self.client.get(url)
+        other_user = get_user_model().objects.create_user(username="otheruser", password="otheruser123")
+        self.client.force_login(other_user)
+        self.assertEqual(self.get_again(url, response).status_code, 200)
+
+    def test_missing_resource_returns_404(self):
+        response = self.client.get(reverse("resource_detail", args=[0]), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+    def test_logged_out_user_is_redirected(self):
+        response = self.client.get(self.glossary.get_absolute_url())
+        self.client.logout()
+        response = self.get_again(self.glossary.get_absolute_url(), response)
+        self.assertEqual(response.status_code, 302)
+
+
+class CompressionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_html_is_compressed(self):
+        response = self.client.get(self.glossary.get_absolute_url(), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Test Glossary", gzip.decompress(response.content).decode())
+        self.assertTrue(response["ETag"].startswith("W/"))
+
+    def test_html_is_not_compressed_without_accept_encoding(self):
+        response = self.client.get(self.glossary.get_absolute_url())
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_zip_export_is_not_compressed(self):
+        response = self.client.post(
+            reverse("resource_export"),
+            {"resources": [self.glossary.pk]},
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertFalse(response.has_header("Content-Encoding"))
@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ...models import Item, Resource
+
+
+class HomePageViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        Item.objects.bulk_create(
+            [Item(resource=translation, source=f"原文{i}", target=f"Target {i}") for i in range(1200)]
+        )
+        Resource.objects.adjust_item_count(translation.pk, 1200)
+        Item.objects.create(resource=glossary, source="電極", target="electrode")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_homepage_displays_archive_stats(self):
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "総計リソース数：2（用語集数：1、翻訳数：1）")
+        self.assertContains(
+            response, "総計エントリー数：1,201（用語集エントリー数：1、翻訳エントリー数：1,200）"
+        )
+
+    def test_resource_detail_uses_stored_item_count(self):
+        translation = Resource.objects.get(title="Test Translation")
+        response = self.client.get(reverse("resource_detail", args=[translation.pk]))
+        self.assertEqual(response.context["num_of_items"], 1200)
+
+
+@override_settings(HOME_TABLE_PAGE_SIZE=3)
+class HomeTableSortTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        titles = ["delta", "Alpha", "charlie", "Echo", "bravo"]
+        for i, title in enumerate(titles):
+            resource_type = "GLOSSARY" if i % 2 else "TRANSLATION"
+            Resource.objects.create(resource_type=resource_type, title=title)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_titles(self, response):
+        return [resource.title for resource in response.context["resources_list"]]
+
+    def test_sort_by_title_ignores_case(self):
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "ascend"})
+        response = self.client.get(url)
+        self.assertEqual(self.get_titles(response), ["Alpha", "bravo", "charlie"])
+        self.assertEqual(response.context["next_page"], 2)
+
+    def test_second_page(self):
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "descend"})
+        response = self.client.get(url, {"page": 2})
+        self.assertEqual(self.get_titles(response), ["bravo", "Alpha"])
+        self.assertIsNone(response.context["next_page"])
+        self.assertNotContains(response, 'hx-trigger="revealed"')
+
+    def test_sort_by_type(self):
+        url = reverse("home_table_sort", kwargs={"filter": "type", "direction": "ascend"})
+        response = self.client.get(url)
+        self.assertEqual(self.get_titles(response), ["Alpha", "Echo", "bravo"])
+
+    def test_next_page_row_keeps_sort_and_filter(self):
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "ascend"})
+        response = self.client.get(url)
+        self.assertContains(response, f'hx-get="{url}?page=2"')
+
+    def test_filter_by_title(self):
+        url = reverse("home_table_sort", kwargs={"filter": "created_on", "direction": "ascend"})
+        response = self.client.get(url, {"q": "A"})
+        self.assertEqual(self.get_titles(response), ["delta", "Alpha", "charlie"])
+        self.assertContains(response, "page=2&q=A")
+
+    def test_filter_without_matches(self):
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "ascend"})
+        response = self.client.get(url, {"q": "zulu"})
+        self.assertEqual(self.get_titles(response), [])
+        self.assertContains(response, "「zulu」を含むリソースは見つかりませんでした。")
+
+    def test_number_of_queries_does_not_depend_on_page(self):
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "ascend"})
+        self.client.get(url)
+        # Including the session and the user.
+        with self.assertNumQueries(3):
+            self.client.get(url, {"page": 2})
+
+    def test_table_requires_login(self):
+        self.client.logout()
+        url = reverse("home_table_sort", kwargs={"filter": "title", "direction": "ascend"})
+        response = self.client.get(url, {"q": "Test"})
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,241 @@
+"""
+Query-count and wall-time budgets for every route in archive/urls.py.
+
+Each request in BUDGETS is made once, with an empty cache, against a
+synthetic corpus (see benchmarks/corpus.py) large enough for N+1 queries to
+stand out. When a budget is exceeded, the test fails with the SQL issued,
+the queries beyond the budget being marked with "+", followed by the queries
+repeated with different parameters.
+
+New routes must be given a budget (see test_every_route_has_a_budget).
+Time budgets can be scaled on slow machines with QUERY_BUDGET_TIME_FACTOR.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.corpus import generate_rows, populate, write_tmx, write_tsv
+
+from ... import urls as archive_urls
+from ...glossary_check import run_glossary_check
+from ...models import GlossaryCheck, Item
+
+TIME_BUDGET_FACTOR = float(os.environ.get("QUERY_BUDGET_TIME_FACTOR", 1))
+
+# (route in archive/urls.py, method, URL, POST data, queries, milliseconds).
+# URLs and data are formatted with the ids of the test objects (see setUpTestData).
+# Requests of logged-in users include 2 queries to load the session and the user.
+BUDGETS = [
+    ("", "GET", "/", None, 4, 500),
+    ("home_table_sort/<filter>/<direction>/", "GET", "/home_table_sort/title/descend/?page=2", None, 3, 300),
+    ("search/", "GET", "/search/?query=signal&resource=すべてのリソース", None, 3, 1000),
+    ("search/", "GET", "/search/?query=signal&resource=すべての用語集", None, 3, 1000),
+    ("search/", "GET", "/search/?query=signal&resource=翻訳 1", None, 3, 1000),
+    ("search/item/<int:pk>/<field>/", "GET", "/search/item/{item}/target/?query=signal", None, 3, 300),
+    ("resource/item/new/", "GET", "/resource/item/new/", None, 2, 300),
+    ("resource/<int:resource>/additem/", "GET", "/resource/{glossary}/additem/", None, 2, 300),
+    ("resource/item/<int:pk>/edit/", "GET", "/resource/item/{item}/edit/", None, 4, 300),
+    ("resource/item/<int:pk>/delete/", "GET", "/resource/item/{item}/delete/", None, 4, 300),
+    ("resource/item/<int:pk>/delete/", "POST", "/resource/item/{item}/delete/", {}, 8, 300),
+    ("resource/new/", "GET", "/resource/new/", None, 2, 300),
+    ("resource/<int:pk>/", "GET", "/resource/{glossary}/", None, 5, 500),
+    ("resource/<int:pk>/", "GET", "/resource/{glossary}/?query=signal", None, 5, 500),
+    ("resource/<int:pk>/content/", "GET", "/resource/{glossary}/content/?after={item}&offset=1", None, 5, 500),
+    ("resource/<int:pk>/edit/", "GET", "/resource/{glossary}/edit/", None, 3, 300),
+    ("resource/<int:pk>/delete/", "GET", "/resource/{glossary}/delete/", None, 3, 300),
+    ("resource/<int:pk>/delete/", "POST", "/resource/{glossary}/delete/", {}, 14, 500),
+    ("resource/export/", "GET", "/resource/export/", None, 3, 300),
+    ("resource/export/", "POST", "/resource/export/", {"resources": ["{glossary}", "{translation}"]}, 6, 1000),
+    ("resource/picker/", "GET", "/resource/picker/?q=用語", None, 3, 300),
+    ("resource/autocomplete/", "GET", "/resource/autocomplete/?q=用語&resource_type=GLOSSARY", None, 3, 300),
+    ("glossary/upload/", "GET", "/glossary/upload/", None, 2, 300),
+    (
+        "glossary/upload/",
+        "POST",
+        "/glossary/upload/",
+        {"upload_file": "{glossary_tsv}", "title": "アップロードした用語集"},
+        18,
+        2000,
+    ),
+    ("translation/upload/", "GET", "/translation/upload/", None, 2, 300),
+    (
+        "translation/upload/",
+        "POST",
+        "/translation/upload/",
+        {"upload_file": "{translation_tmx}", "title": "アップロードした翻訳"},
+        17,
+        2000,
+    ),
+    ("pretranslate/", "GET", "/pretranslate/", None, 2, 300),
+    ("pretranslate/", "POST", "/pretranslate/", {"upload_file": "{tmx}", "threshold": 75}, 5, 2000),
+    ("resource/<int:pk>/glossary_check/", "GET", "/resource/{translation}/glossary_check/", None, 5, 300),
+    (
+        "resource/<int:pk>/glossary_check/",
+        "POST",
+        "/resource/{translation}/glossary_check/",
+        {"glossaries": ["{glossary}"]},
+        9,
+        300,
+    ),
+    ("glossary_check/<int:pk>/", "GET", "/glossary_check/{check}/", None, 5, 500),
+    ("glossary_check/<int:pk>/issues/", "GET", "/glossary_check/{check}/issues/?after=1&offset=1", None, 4, 500),
+    ("glossary_check/<int:pk>/export/", "GET", "/glossary_check/{check}/export/", None, 4, 1000),
+    ("metrics", "GET", "/metrics", None, 2, 300),
+]
+
+# Number of rows of the files uploaded by the "{glossary_tsv}" and
+# "{translation_tmx}" POST data (see corpus_upload()). Items are inserted 100
+# at a time on SQLite, so the upload budgets include 10 INSERT statements.
+UPLOAD_ITEMS = 1000
+
+# Document pre-translated by the "{tmx}" POST data, from segments of the corpus.
+PRETRANSLATION_TMX = (
+    '<?xml version="1.0" encoding="UTF-8"?><tmx version="1.4">'
+    '<header srclang="ja" datatype="plaintext" segtype="sentence" adminlang="ja" '
+    'creationtool="test" creationtoolversion="1" o-tmf="test"/><body>{units}</body></tmx>'
+)
+
+# Literals replaced when grouping queries that differ only by their parameters.
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def budget_report(description, queries, budget):
+    """Returns the message shown when a request exceeds its query budget."""
+
+    lines = [f"{description}: {len(queries)} queries, budget {budget} (+{len(queries) - budget})", ""]
+    for number, query in enumerate(queries, start=1):
+        marker = "+" if number > budget else " "
+        lines.append(f"{marker} {number:>3}. {query['sql']}")
+
+    repeated = Counter(LITERALS.sub("?", query["sql"]) for query in queries)
+    repeated = [(count, sql) for sql, count in repeated.most_common() if count > 1]
+    if repeated:
+        lines += ["", "Repeated queries:"]
+        lines += [f"  {count} x {sql}" for count, sql in repeated]
+    return "\n".join(lines)
+
+
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Uploaded files are saved to MEDIA_ROOT until they have been read.
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root)
+        settings_override = override_settings(MEDIA_ROOT=cls.media_root)
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+            is_staff=True,
+        )
+        # 3 glossaries and 3 translations of 100 items.
+        resources = populate(600, glossary_ratio=0.5, items_per_resource=100)
+        cls.ids = {
+            "glossary": resources[0].pk,
+            "translation": resources[-1].pk,
+            "item": Item.objects.filter(resource=resources[0]).order_by("id").values_list("id", flat=True)[1],
+        }
+        glossary_check = GlossaryCheck.objects.create(resource=resources[-1])
+        glossary_check.glossaries.set(resources[:3])
+        run_glossary_check(glossary_check.pk)
+        cls.ids["check"] = glossary_check.pk
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def format(self, value):
+        if value == "{tmx}":
+            return self.tmx_upload()
+        if value == "{glossary_tsv}":
+            return self.corpus_upload("glossary.txt", write_tsv, "GLOSSARY")
+        if value == "{translation_tmx}":
+            return self.corpus_upload("translation.tmx", write_tmx, "TRANSLATION")
+        if isinstance(value, str):
+            return value.format(**self.ids)
+        if isinstance(value, list):
+            return [self.format(v) for v in value]
+        return value
+
+    def tmx_upload(self):
+        sources = Item.objects.filter(resource__resource_type="TRANSLATION").values_list("source", flat=True)[:50]
+        units = "".join(f'<tu><tuv xml:lang="ja"><seg>{source}</seg></tuv></tu>' for source in sources)
+        return SimpleUploadedFile("source.tmx", PRETRANSLATION_TMX.format(units=units).encode("utf-8"))
+
+    def corpus_upload(self, name, write, resource_type):
+        """Returns an upload of UPLOAD_ITEMS rows of the corpus, written by write()."""
+        path = os.path.join(self.media_root, name)
+        write(path, generate_rows(UPLOAD_ITEMS, resource_type, seed=1))
+        with open(path, "rb") as f:
+            return SimpleUploadedFile(name, f.read())
+
+    def measure(self, method, url, data):
+        """Makes a request with an empty cache. Returns (response, queries, milliseconds)."""
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            if method == "POST":
+                response = self.client.post(url, {key: self.format(value) for key, value in data.items()})
+            else:
+                response = self.client.get(url)
+            # Streaming responses run their queries while being read.
+            if response.streaming:
+                b"".join(response.streaming_content)
+            milliseconds = (time.perf_counter() - started) * 1000
+        return response, context.captured_queries, milliseconds
+
+    def test_every_route_has_a_budget(self):
+        routes = {str(pattern.pattern) for pattern in archive_urls.urlpatterns}
+        self.assertEqual(routes - {budget[0] for budget in BUDGETS}, set(), "Routes without a budget.")
+
+    def test_budgets(self):
+        for route, method, url, data, max_queries, max_ms in BUDGETS:
+            url = self.format(url)
+            description = f"{method} {url}"
+            with self.subTest(description), transaction.atomic():
+                response, queries, milliseconds = self.measure(method, url, data)
+                self.assertLess(response.status_code, 400, description)
+                self.assertLessEqual(len(queries), max_queries, budget_report(description, queries, max_queries))
+                self.assertLessEqual(
+                    milliseconds,
+                    max_ms * TIME_BUDGET_FACTOR,
+                    f"{description}: {milliseconds:.0f} ms, budget {max_ms * TIME_BUDGET_FACTOR:.0f} ms",
+                )
+                # Changes made by POST requests are not seen by the next requests.
+                transaction.set_rollback(True)
+
+    def test_budget_report(self):
+        queries = [
+            {"sql": "SELECT 1"},
+            {"sql": "SELECT title FROM archive_resource WHERE id = 1"},
+            {"sql": "SELECT title FROM archive_resource WHERE id = 2"},
+        ]
+        self.assertEqual(
+            budget_report("GET /", queries, 1),
+            "GET /: 3 queries, budget 1 (+2)\n"
+            "\n"
+            "    1. SELECT 1\n"
+            "+   2. SELECT title FROM archive_resource WHERE id = 1\n"
+            "+   3. SELECT title FROM archive_resource WHERE id = 2\n"
+            "\n"
+            "Repeated queries:\n"
+            "  2 x SELECT title FROM archive_resource WHERE id = ?",
+        )
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ...forms.glossary_forms import GlossaryUploadForm
+from ...forms.item_forms import GlossaryItemForm
+from ...models import Item, Resource
+
+
+class ResourceAutocompleteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        Resource.objects.create(resource_type="GLOSSARY", title="test glossary 2")
+        Resource.objects.create(resource_type="GLOSSARY", title="Other Glossary")
+        cls.translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_titles_starting_with_query(self):
+        response = self.client.get(
+            reverse("resource_autocomplete"),
+            {"q": "TEST", "resource_type": "GLOSSARY", "target": "id_resource"},
+        )
+        titles = [resource.title for resource in response.context["resources"]]
+        self.assertEqual(titles, ["Test Glossary", "test glossary 2"])
+        self.assertContains(response, f'data-pk="{self.glossary.pk}"')
+        self.assertContains(response, 'data-target="id_resource"')
+
+    def test_titles_starting_with_non_ascii_letters(self):
+        Resource.objects.create(resource_type="GLOSSARY", title="Éclair Glossary")
+        Resource.objects.create(resource_type="GLOSSARY", title="Ｔｅｓｔ Glossary")
+        for q, title in (("Écl", "Éclair Glossary"), ("ÉCLAIR", "Éclair Glossary"), ("Ｔｅ", "Ｔｅｓｔ Glossary")):
+            response = self.client.get(reverse("resource_autocomplete"), {"q": q, "resource_type": "GLOSSARY"})
+            self.assertEqual([resource.title for resource in response.context["resources"]], [title], q)
+
+    def test_no_matches(self):
+        response = self.client.get(reverse("resource_autocomplete"), {"q": "zzz"})
+        self.assertContains(response, "「zzz」で始まる用語集は見つかりませんでした。")
+
+    @override_settings(AUTOCOMPLETE_RESULTS=1)
+    def test_number_of_results_limited(self):
+        response = self.client.get(reverse("resource_autocomplete"), {"q": "t"})
+        self.assertEqual(len(response.context["resources"]), 1)
+
+    def test_prefix_query_uses_index(self):
+        plan = (
+            Resource.objects
+            .filter(resource_type="GLOSSARY")
+            .annotate(lower_title=Lower("title"))
+            .filter(lower_title__gte="test", lower_title__lt="test\U0010ffff")
+            .order_by("lower_title", "id")
+            .explain()
+        )
+        self.assertIn("resource_type_title_idx", plan)
+
+    def test_form_renders_without_listing_resources(self):
+        with self.assertNumQueries(0):
+            html = str(GlossaryUploadForm()["existing_glossary"])
+        self.assertNotIn("Other Glossary", html)
+
+    def test_form_renders_title_of_chosen_resource(self):
+        item = Item.objects.create(resource=self.glossary, source="電極", target="electrode")
+        with self.assertNumQueries(1):
+            html = str(GlossaryItemForm(instance=item)["resource"])
+        self.assertIn('value="Test Glossary"', html)
+        self.assertIn(f'value="{self.glossary.pk}"', html)
+
+    def test_form_validates_chosen_resource(self):
+        form = GlossaryItemForm(
+            data={"source": "電極", "target": "electrode", "resource": self.glossary.pk, "new_resource": ""}
+        )
+        # The pk lookup of the field, and the foreign key check of the model.
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["resource"], self.glossary)
+
+    def test_form_rejects_translation(self):
+        form = GlossaryItemForm(
+            data={"source": "電極", "target": "electrode", "resource": self.translation.pk, "new_resource": ""}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("resource", form.errors)
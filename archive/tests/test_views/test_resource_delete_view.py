@@ -0,0 +1,76 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ...deletion import delete_pending_resource, mark_for_deletion
+from ...models import Item, Resource
+
+
+@override_settings(DELETE_BATCH_SIZE=10, DELETE_RESOURCES_IN_BACKGROUND=False)
+class ResourceDeleteViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.other = Resource.objects.create(resource_type="GLOSSARY", title="Other Glossary")
+        Item.objects.create(resource=cls.other, source="電極", target="electrode")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.resource = Resource.objects.create(resource_type="TRANSLATION", title="Large Translation")
+        Item.objects.bulk_create(
+            [Item(resource=self.resource, source=f"電極{i}", target=f"Electrode {i}") for i in range(35)]
+        )
+
+    def test_delete_resource_and_items(self):
+        response = self.client.post(reverse("resource_delete", args=[self.resource.pk]))
+        self.assertRedirects(response, reverse("home"))
+        self.assertFalse(Resource.all_objects.filter(pk=self.resource.pk).exists())
+        self.assertFalse(Item.objects.filter(resource_id=self.resource.pk).exists())
+        self.assertEqual(Item.objects.filter(resource=self.other).count(), 1)
+
+    def test_items_deleted_in_batches(self):
+        mark_for_deletion(self.resource)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_pending_resource(self.resource.pk), 35)
+        item_deletes = [
+            query for query in queries.captured_queries
+            if query["sql"].startswith('DELETE FROM "archive_item" WHERE resource_id')
+        ]
+        self.assertEqual(len(item_deletes), 4)
+
+    @override_settings(DELETE_RESOURCES_IN_BACKGROUND=True)
+    def test_resource_hidden_until_background_deletion_runs(self):
+        with mock.patch("archive.deletion.run_in_background") as run_in_background:
+            self.client.post(reverse("resource_delete", args=[self.resource.pk]))
+        run_in_background.assert_called_once_with(delete_pending_resource, self.resource.pk)
+
+        # Still in the database, but hidden everywhere.
+        self.assertTrue(Resource.all_objects.filter(pk=self.resource.pk).exists())
+        self.assertFalse(Resource.objects.filter(pk=self.resource.pk).exists())
+        response = self.client.get(reverse("search"), {"query": "電極", "resource": "すべてのリソース"})
+        self.assertEqual(response.context["hits"], 1)
+        response = self.client.get(reverse("resource_detail", args=[self.resource.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Resource.objects.archive_stats()["num_of_resources"], 1)
+        self.assertNotIn("Large Translation", Resource.objects.navbar_resources()["translations"])
+
+    def test_purge_command_finishes_pending_deletions(self):
+        mark_for_deletion(self.resource)
+        call_command("purge_deleted_resources", stdout=io.StringIO())
+        self.assertFalse(Resource.all_objects.filter(pk=self.resource.pk).exists())
+        self.assertFalse(Item.objects.filter(resource_id=self.resource.pk).exists())
+        self.assertTrue(Resource.objects.filter(pk=self.other.pk).exists())
@@ -0,0 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ...models import Item, Resource
+
+
+@override_settings(RESOURCE_CONTENT_PAGE_SIZE=3)
+class ResourceDetailViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.resource = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        cls.other_resource = Resource.objects.create(resource_type="TRANSLATION", title="Other")
+        cls.items = []
+        for i in range(1, 8):
+            cls.items.append(
+                Item.objects.create(resource=cls.resource, source=f"原文{i}", target=f"Target {i}")
+            )
+            Item.objects.create(resource=cls.other_resource, source=f"他の原文{i}", target=f"Other {i}")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_detail_page_shows_first_page_only(self):
+        response = self.client.get(reverse("resource_detail", args=[self.resource.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["items"], self.items[:3])
+        self.assertContains(response, "原文3")
+        self.assertNotContains(response, "原文4")
+        self.assertNotContains(response, "他の原文")
+
+    def test_detail_page_includes_loader_for_next_page(self):
+        response = self.client.get(reverse("resource_detail", args=[self.resource.pk]))
+        next_url = (
+            reverse("resource_content", args=[self.resource.pk])
+            + f"?after={self.items[2].pk}&offset=3"
+        )
+        self.assertContains(response, next_url)
+        self.assertContains(response, 'hx-trigger="revealed"')
+
+    def test_next_page_fragment(self):
+        response = self.client.get(
+            reverse("resource_content", args=[self.resource.pk]),
+            {"after": self.items[2].pk, "offset": 3},
+        )
+        self.assertTemplateUsed(response, "_resource_content_rows.html")
+        self.assertTemplateNotUsed(response, "base.html")
+        self.assertEqual(response.context["items"], self.items[3:6])
+        self.assertEqual(response.context["next_offset"], 6)
+
+    def test_row_numbers_continue_across_pages(self):
+        response = self.client.get(
+            reverse("resource_content", args=[self.resource.pk]),
+            {"after": self.items[2].pk, "offset": 3},
+        )
+        content = response.content.decode()
+        self.assertInHTML('<td class="col-center-align">4</td>', content)
+        self.assertInHTML('<td class="col-center-align">6</td>', content)
+        self.assertNotIn('<td class="col-center-align">1</td>', content)
+
+    def test_last_page_has_no_loader(self):
+        response = self.client.get(
+            reverse("resource_content", args=[self.resource.pk]),
+            {"after": self.items[5].pk, "offset": 6},
+        )
+        self.assertEqual(response.context["items"], self.items[6:])
+        self.assertIsNone(response.context["next_after"])
+        self.assertNotContains(response, 'hx-trigger="revealed"')
+
+    def test_action_links_point_back_to_detail_page(self):
+        response = self.client.get(
+            reverse("resource_content", args=[self.resource.pk]),
+            {"after": self.items[2].pk, "offset": 3},
+        )
+        self.assertContains(response, "previous_url=/resource/{}/".format(self.resource.pk))
+        self.assertNotContains(response, "previous_url=/resource/{}/content/".format(self.resource.pk))
+
+    def test_invalid_cursor_returns_first_page(self):
+        response = self.client.get(
+            reverse("resource_content", args=[self.resource.pk]), {"after": "abc"}
+        )
+        self.assertEqual(response.context["items"], self.items[:3])
+
+    def test_content_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("resource_content", args=[self.resource.pk]))
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(RESOURCE_CONTENT_PAGE_SIZE=2)
+class ResourceContentFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.resource = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        cls.other_resource = Resource.objects.create(resource_type="GLOSSARY", title="Other Glossary")
+        cls.matches = [
+            Item.objects.create(resource=cls.resource, source="情報処理装置", target="information processing device"),
+            Item.objects.create(resource=cls.resource, source="鍵", target="key", notes="Information in notes"),
+            Item.objects.create(resource=cls.resource, source="表示装置の情報", target="display information"),
+        ]
+        Item.objects.create(resource=cls.resource, source="電極", target="electrode")
+        Item.objects.create(resource=cls.other_resource, source="情報", target="information")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("resource_content", args=[self.resource.pk])
+
+    def test_filter_returns_only_matching_items_of_resource(self):
+        response = self.client.get(self.url, {"query": "INFORMATION"})
+        self.assertEqual(response.context["items"], self.matches[:2])
+        self.assertNotContains(response, "electrode")
+
+    def test_filter_results_are_highlighted(self):
+        response = self.client.get(self.url, {"query": "情報"})
+        self.assertContains(response, '<span class="highlight_query">情報</span>処理装置')
+
+    def test_filter_results_are_paginated(self):
+        response = self.client.get(self.url, {"query": "information"})
+        self.assertContains(
+            response,
+            f"?after={self.matches[1].pk}&offset=2&query=information",
+        )
+        response = self.client.get(
+            self.url, {"query": "information", "after": self.matches[1].pk, "offset": 2}
+        )
+        self.assertEqual(response.context["items"], self.matches[2:])
+        self.assertIsNone(response.context["next_after"])
+
+    def test_filter_with_quoted_query(self):
+        response = self.client.get(self.url, {"query": '"key"'})
+        self.assertEqual(response.context["items"], [self.matches[1]])
+
+    def test_filter_without_results(self):
+        response = self.client.get(self.url, {"query": "window"})
+        self.assertEqual(response.context["items"], [])
+        self.assertContains(response, "「window」に該当するエントリーは見つかりませんでした。")
+
+    def test_empty_query_returns_all_items(self):
+        response = self.client.get(self.url, {"query": ""})
+        self.assertEqual(len(response.context["items"]), 2)
+        self.assertIsNotNone(response.context["next_after"])
@@ -0,0 +1,124 @@
+import io
+import zipfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ...models import Item, Resource
+
+
+class ResourceExportViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(
+            resource_type="GLOSSARY",
+            title="Test Glossary",
+            client="ABC Co., Ltd.",
+        )
+        Item.objects.create(resource=cls.glossary, source="電極", target="electrode")
+        Item.objects.create(
+            resource=cls.glossary,
+            source="ガラス基板",
+            target="glass substrate",
+            notes="Line one\nLine two",
+        )
+        cls.translation = Resource.objects.create(
+            resource_type="TRANSLATION",
+            title="Test/Translation",
+            client="ABC Co., Ltd.",
+        )
+        Item.objects.create(resource=cls.translation, source="第1段落", target="First\tparagraph")
+        cls.other_glossary = Resource.objects.create(
+            resource_type="GLOSSARY",
+            title="Other Glossary",
+            client="XYZ Inc.",
+        )
+        Item.objects.create(resource=cls.other_glossary, source="基板", target="substrate")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("resource_export")
+
+    def get_zip_file(self, response):
+        content = b"".join(response.streaming_content)
+        return zipfile.ZipFile(io.BytesIO(content))
+
+    def test_get_displays_form(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "resource_export.html")
+
+    def test_redirects_if_not_logged_in(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_response_is_streamed_zip_file(self):
+        response = self.client.post(self.url, {"resources": [self.glossary.pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_one_member_per_selected_resource(self):
+        response = self.client.post(
+            self.url, {"resources": [self.glossary.pk, self.other_glossary.pk]}
+        )
+        zip_file = self.get_zip_file(response)
+        self.assertEqual(
+            sorted(zip_file.namelist()),
+            ["用語集/Other Glossary.txt", "用語集/Test Glossary.txt"],
+        )
+
+    def test_member_content_uses_upload_format(self):
+        response = self.client.post(self.url, {"resources": [self.glossary.pk]})
+        zip_file = self.get_zip_file(response)
+        content = zip_file.read("用語集/Test Glossary.txt").decode("utf-8")
+        self.assertEqual(
+            content,
+            "電極\telectrode\nガラス基板\tglass substrate\tLine one Line two\n",
+        )
+
+    def test_tabs_and_slashes_are_replaced(self):
+        response = self.client.post(self.url, {"resources": [self.translation.pk]})
+        zip_file = self.get_zip_file(response)
+        content = zip_file.read("翻訳/Test_Translation.txt").decode("utf-8")
+        self.assertEqual(content, "第1段落\tFirst paragraph\n")
+
+    def test_export_by_client(self):
+        response = self.client.post(self.url, {"client": "abc co., ltd."})
+        zip_file = self.get_zip_file(response)
+        self.assertEqual(
+            sorted(zip_file.namelist()),
+            ["用語集/Test Glossary.txt", "翻訳/Test_Translation.txt"],
+        )
+
+    def test_export_by_client_and_resource_type(self):
+        response = self.client.post(
+            self.url, {"client": "ABC Co., Ltd.", "resource_type": "GLOSSARY"}
+        )
+        zip_file = self.get_zip_file(response)
+        self.assertEqual(zip_file.namelist(), ["用語集/Test Glossary.txt"])
+
+    def test_duplicate_titles_are_given_unique_names(self):
+        duplicate = Resource.objects.create(resource_type="GLOSSARY", title="Test Glossary")
+        response = self.client.post(
+            self.url, {"resources": [self.glossary.pk, duplicate.pk]}
+        )
+        zip_file = self.get_zip_file(response)
+        self.assertEqual(len(set(zip_file.namelist())), 2)
+        self.assertIn(f"用語集/Test Glossary ({duplicate.pk}).txt", zip_file.namelist())
+
+    def test_empty_form_is_invalid(self):
+        response = self.client.post(self.url, {})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "resource_export.html")
+        self.assertContains(response, "①または②のいずれかを入力してください。")
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ...models import Resource
+
+
+class ResourcePickerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.glossary = Resource.objects.create(resource_type="GLOSSARY", title="b glossary")
+        Resource.objects.create(resource_type="GLOSSARY", title="A glossary")
+        Resource.objects.create(resource_type="TRANSLATION", title="Test translation")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_navbar_resources_sorted_by_title(self):
+        self.assertEqual(
+            Resource.objects.navbar_resources(),
+            {"glossaries": ["A glossary", "b glossary"], "translations": ["Test translation"]},
+        )
+
+    def test_navbar_resources_cached(self):
+        Resource.objects.navbar_resources()
+        with self.assertNumQueries(0):
+            Resource.objects.navbar_resources()
+
+    def test_cache_cleared_on_create_rename_and_delete(self):
+        Resource.objects.navbar_resources()
+        resource = Resource.objects.create(resource_type="GLOSSARY", title="C glossary")
+        self.assertIn("C glossary", Resource.objects.navbar_resources()["glossaries"])
+
+        resource.title = "D glossary"
+        resource.save()
+        self.assertIn("D glossary", Resource.objects.navbar_resources()["glossaries"])
+
+        resource.delete()
+        self.assertNotIn("D glossary", Resource.objects.navbar_resources()["glossaries"])
+
+    def test_cache_kept_when_title_unchanged(self):
+        Resource.objects.navbar_resources()
+        self.glossary.notes = "Updated notes"
+        self.glossary.save()
+        with self.assertNumQueries(0):
+            Resource.objects.navbar_resources()
+
+    def test_navbar_does_not_include_individual_resources(self):
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, reverse("resource_picker"))
+        self.assertNotContains(response, '<option value="A glossary">')
+
+    def test_navbar_includes_previously_searched_resource(self):
+        response = self.client.get(reverse("search"), {"query": "test", "resource": "A glossary"})
+        self.assertContains(response, '<option value="A glossary" selected>A glossary</option>')
+        self.assertNotContains(response, '<option value="b glossary">')
+
+    def test_picker_lists_resources(self):
+        response = self.client.get(reverse("resource_picker"), {"selected": "b glossary"})
+        self.assertContains(response, '<option value="A glossary">A glossary</option>')
+        self.assertContains(response, '<option value="b glossary" selected>b glossary</option>')
+        self.assertContains(response, '<option value="Test translation">Test translation</option>')
+
+    def test_picker_filters_by_title(self):
+        response = self.client.get(reverse("resource_picker"), {"q": "GLOSS"})
+        self.assertContains(response, '<option value="A glossary">')
+        self.assertNotContains(response, '<option value="Test translation">')
+
+    def test_navbar_includes_filter_field(self):
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, 'id="resource-filter-field"')
+        self.assertContains(response, 'hx-trigger="input changed delay:300ms, search"')
+        self.assertContains(response, "markResourceListLoaded()")
+        self.assertContains(
+            response, 'hx-trigger="mouseenter[!this.dataset.loaded] once, focus[!this.dataset.loaded] once"'
+        )
+
+    def test_picker_filter_keeps_selected_resource(self):
+        response = self.client.get(reverse("resource_picker"), {"q": "glossary", "resource": "b glossary"})
+        self.assertContains(response, '<option value="b glossary" selected>b glossary</option>')
+        self.assertNotContains(response, '<option value="Test translation">')
+
+    def test_picker_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("resource_picker"))
+        self.assertEqual(response.status_code, 302)
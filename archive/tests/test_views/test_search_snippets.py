@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ...models import Item, Resource
+from ...search import kwic_snippets, match_offsets
+
+
+class KwicSnippetTests(TestCase):
+
+    def test_match_offsets(self):
+        self.assertEqual(match_offsets("Signal and signal", "signal"), [(0, 6), (11, 17)])
+        self.assertEqual(match_offsets("a.b", "."), [(1, 2)])
+        self.assertEqual(match_offsets("text", ""), [])
+
+    def test_snippets_around_each_match(self):
+        text = "x" * 20 + "term" + "x" * 40 + "term" + "x" * 20
+        self.assertEqual(kwic_snippets(text, "term", 5), [(15, 29), (59, 73)])
+
+    def test_overlapping_snippets_are_merged(self):
+        text = "x" * 20 + "term" + "x" * 6 + "term" + "x" * 20
+        self.assertEqual(kwic_snippets(text, "term", 5), [(15, 39)])
+
+    def test_snippets_are_cut_at_text_boundaries(self):
+        self.assertEqual(kwic_snippets("term" + "x" * 20, "term", 5), [(0, 9)])
+        self.assertEqual(kwic_snippets("x" * 20 + "term", "term", 5), [(15, 24)])
+
+    def test_start_of_text_without_match(self):
+        self.assertEqual(kwic_snippets("x" * 50, "term", 5), [(0, 10)])
+
+
+@override_settings(SEARCH_SNIPPET_WIDTH=10, SEARCH_SNIPPET_MIN_LENGTH=50)
+class SearchSnippetViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@email.com",
+            password="testuser123",
+        )
+        cls.translation = Resource.objects.create(resource_type="TRANSLATION", title="Test Translation")
+        cls.long_item = Item.objects.create(
+            resource=cls.translation,
+            source="前半" * 50 + "信号" + "後半" * 50,
+            target="first " * 20 + "signal" + " last" * 20,
+        )
+        cls.short_item = Item.objects.create(resource=cls.translation, source="短い信号", target="short signal")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def search(self, query):
+        return self.client.get(reverse("search"), {"query": query, "resource": "すべてのリソース"})
+
+    def test_long_texts_are_shown_as_snippets(self):
+        response = self.search("signal")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, self.long_item.target)
+        self.assertContains(response, '…rst first <span class="highlight_query">signal</span> last last…')
+        self.assertContains(
+            response, reverse("search_segment", args=[self.long_item.pk, "target"]) + "?query=signal"
+        )
+        # The source does not contain the query, so its start is shown.
+        self.assertContains(response, "前半" * 10 + "…")
+        self.assertNotContains(response, self.long_item.source)
+
+    def test_short_texts_are_shown_in_full(self):
+        response = self.search("signal")
+        self.assertContains(response, 'short <span class="highlight_query">signal</span>')
+        self.assertContains(response, "copyText('short signal');")
+        self.assertNotContains(response, reverse("search_segment", args=[self.short_item.pk, "target"]))
+
+    @override_settings(SEARCH_SNIPPET_WIDTH=0)
+    def test_snippets_can_be_disabled(self):
+        response = self.search("signal")
+        self.assertNotContains(response, "search-snippets")
+
+    def test_full_text_is_loaded(self):
+        url = reverse("search_segment", args=[self.long_item.pk, "target"])
+        response = self.client.get(url, {"query": "signal"})
+        self.assertEqual(response.status_code, 200)
+        highlighted = self.long_item.target.replace("signal", '<span class="highlight_query">signal</span>')
+        self.assertContains(response, highlighted)
+        self.assertContains(response, f"copyText('{self.long_item.target}');")
+
+        response = self.client.get(reverse("search_segment", args=[self.long_item.pk, "notes"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_full_text_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("search_segment", args=[self.long_item.pk, "source"]))
+        self.assertEqual(response.status_code, 302)
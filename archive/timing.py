@@ -0,0 +1,161 @@
+"""
+Per-request timing of views, SQL queries, template rendering and other
+phases (e.g. the parsing of uploaded files).
+
+TimingMiddleware (archive/middleware.py) creates a Timings object for each
+request, which the code being timed finds through a context variable:
+SQL queries through an execute wrapper installed on each new database
+connection (see connection.execute_wrapper()), templates through the
+TimedDjangoTemplates backend, and other phases with timed().
+Outside requests (e.g. in management commands or background jobs), nothing
+is recorded.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger(__name__)
+
+# Timings of the current request, or None outside requests.
+_timings = ContextVar("timings", default=None)
+
+
+class Timings:
+    """Durations (in milliseconds) recorded during one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        # Templates rendered inside another template (e.g. form widgets) are
+        # not counted twice.
+        self.template_depth = 0
+
+    def add(self, name, milliseconds):
+        self.durations[name] = self.durations.get(name, 0.0) + milliseconds
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """Returns the value of the Server-Timing header."""
+
+        metrics = [
+            f"total;dur={self.total_ms():.1f}",
+            f'sql;dur={self.sql_ms:.1f};desc="{self.sql_count} queries"',
+            f"template;dur={self.template_ms:.1f}",
+        ]
+        metrics += [f"{name};dur={duration:.1f}" for name, duration in self.durations.items()]
+        return ", ".join(metrics)
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.total_ms(), 1),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_ms, 1),
+            "template_ms": round(self.template_ms, 1),
+            **{f"{name}_ms": round(duration, 1) for name, duration in self.durations.items()},
+        }
+
+
+def start_request():
+    """Starts recording the timings of a request. Returns (timings, token)."""
+    timings = Timings()
+    return timings, _timings.set(timings)
+
+
+def finish_request(request, response, timings, token):
+    """
+    Stops recording the timings of a request, logs them as one JSON line and
+    returns the value of the Server-Timing header.
+    """
+
+    _timings.reset(token)
+    record = {
+        "method": request.method,
+        "path": request.path,
+        "view": getattr(getattr(request, "resolver_match", None), "view_name", None),
+        "status": response.status_code,
+        **timings.as_dict(),
+    }
+    logger.info(json.dumps(record, ensure_ascii=False), extra={"timing": record})
+    return timings.server_timing()
+
+
+@contextmanager
+def timed(name):
+    """
+    Adds the time spent in the with block to the timings of the current
+    request under name (which must be a valid Server-Timing metric name).
+    """
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _timings.get()
+        if timings is not None:
+            timings.add(name, (time.perf_counter() - started) * 1000)
+
+
+def time_query(execute, sql, params, many, context):
+    """Execute wrapper counting the queries and the time spent in them."""
+
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql_count += 1
+        timings.sql_ms += (time.perf_counter() - started) * 1000
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    Receiver of the connection_created signal. Installs time_query() on each
+    new connection, since connections are not shared between threads (e.g.
+    the threads running the database queries of async views).
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        timings = _timings.get()
+        if timings is None:
+            return super().render(context, request)
+
+        timings.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if timings.template_depth == 0:
+                timings.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend recording the time spent rendering templates."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
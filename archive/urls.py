@@ -1,18 +1,41 @@
+from django.conf import settings
 from django.urls import path
 
+from .views.glossary_check_views import (GlossaryCheckCreateView,
+                                         GlossaryCheckDetailView,
+                                         glossary_check_export,
+                                         glossary_check_issues)
 from .views.glossary_upload_view import GlossaryUploadView
 from .views.homepage_views import HomePageView, home_table_sort
 from .views.item_views import ItemCreateView, ItemDeleteView, ItemUpdateView
+from .views.metrics_view import metrics_view
+from .views.pretranslation_view import PretranslationView
 from .views.resource_views import (ResourceCreateView, ResourceDeleteView,
-                                   ResourceDetailView, ResourceUpdateView)
-from .views.search_view import SearchView
+                                   ResourceDetailView, ResourceUpdateView,
+                                   async_resource_content,
+                                   resource_autocomplete, resource_content,
+                                   resource_picker)
+from .views.resource_export_view import (AsyncResourceExportView,
+                                         ResourceExportView)
+from .views.search_view import SearchView, async_search, search_segment
 from .views.translation_upload_view import TranslationUploadView
 
+# Views with an async version, used when served through config.asgi.
+if settings.ASYNC_VIEWS:
+    search_view = async_search
+    resource_content_view = async_resource_content
+    resource_export_view = AsyncResourceExportView.as_view()
+else:
+    search_view = SearchView.as_view()
+    resource_content_view = resource_content
+    resource_export_view = ResourceExportView.as_view()
+
 urlpatterns = [
     path("", HomePageView.as_view(), name="home"),
     path("home_table_sort/<filter>/<direction>/", home_table_sort, name="home_table_sort"),
 
-    path("search/", SearchView.as_view(), name="search"),
+    path("search/", search_view, name="search"),
+    path("search/item/<int:pk>/<field>/", search_segment, name="search_segment"),
 
     path("resource/item/new/", ItemCreateView.as_view(), name="create_item"),
     path("resource/<int:resource>/additem/", ItemCreateView.as_view(), name="create_item"),
@@ -21,9 +44,22 @@ urlpatterns = [
 
     path("resource/new/", ResourceCreateView.as_view(), name="create_resource"),
     path("resource/<int:pk>/", ResourceDetailView.as_view(), name="resource_detail"),
+    path("resource/<int:pk>/content/", resource_content_view, name="resource_content"),
     path("resource/<int:pk>/edit/", ResourceUpdateView.as_view(), name="resource_update"),
     path("resource/<int:pk>/delete/", ResourceDeleteView.as_view(), name="resource_delete"),
+    path("resource/export/", resource_export_view, name="resource_export"),
+    path("resource/picker/", resource_picker, name="resource_picker"),
+    path("resource/autocomplete/", resource_autocomplete, name="resource_autocomplete"),
 
     path("glossary/upload/", GlossaryUploadView.as_view(), name="glossary_upload"),
     path("translation/upload/", TranslationUploadView.as_view(), name="translation_upload"),
+    path("pretranslate/", PretranslationView.as_view(), name="pretranslate"),
+
+    path("resource/<int:pk>/glossary_check/", GlossaryCheckCreateView.as_view(), name="glossary_check_create"),
+    path("glossary_check/<int:pk>/", GlossaryCheckDetailView.as_view(), name="glossary_check_detail"),
+    path("glossary_check/<int:pk>/issues/", glossary_check_issues, name="glossary_check_issues"),
+    path("glossary_check/<int:pk>/export/", glossary_check_export, name="glossary_check_export"),
+
+    # Without a trailing slash, as expected by Prometheus.
+    path("metrics", metrics_view, name="metrics"),
 ]
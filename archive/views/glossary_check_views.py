@@ -0,0 +1,158 @@
+import csv
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.generic import DetailView, View
+
+from ..forms.glossary_check_forms import GlossaryCheckForm
+from ..glossary_check import fail_interrupted_checks, start_glossary_check
+from ..models import GlossaryCheck, Resource
+from ..routers import replica_reads
+from .resource_views import make_content_page
+
+# Number of issues fetched from the database at a time while writing the CSV file.
+EXPORT_CHUNK_SIZE = 2000
+
+
+class GlossaryCheckCreateView(LoginRequiredMixin, View):
+    """
+    View to check the items of a translation against the chosen glossaries.
+    The check is run in the background, and its results are shown by
+    GlossaryCheckDetailView. Previous checks of the translation are listed.
+    """
+    form_class = GlossaryCheckForm
+    template_name = "glossary_check_create.html"
+
+    def get_context(self, resource, form):
+        fail_interrupted_checks(resource.glossary_checks.all())
+        return {
+            "resource": resource,
+            "form": form,
+            "glossary_checks": resource.glossary_checks.all()[:20],
+        }
+
+    def get(self, request, pk, *args, **kwargs):
+        resource = get_object_or_404(Resource, pk=pk, resource_type="TRANSLATION")
+        return render(request, self.template_name, self.get_context(resource, self.form_class()))
+
+    def post(self, request, pk, *args, **kwargs):
+        resource = get_object_or_404(Resource, pk=pk, resource_type="TRANSLATION")
+        if "cancel" in request.POST:
+            return HttpResponseRedirect(resource.get_absolute_url())
+
+        form = self.form_class(request.POST)
+        if form.is_valid():
+            glossary_check = start_glossary_check(resource, form.cleaned_data["glossaries"], request.user)
+            return HttpResponseRedirect(glossary_check.get_absolute_url())
+
+        return render(request, self.template_name, self.get_context(resource, form))
+
+
+class GlossaryCheckDetailView(LoginRequiredMixin, DetailView):
+    """
+    View to display the status of a glossary check and the first page of the
+    items it reported. Further pages are loaded by glossary_check_issues.
+    While the check is running, the page is refreshed using HTMX.
+    """
+    use_replica = True
+    model = GlossaryCheck
+    queryset = GlossaryCheck.objects.select_related("resource")
+    template_name = "glossary_check_detail.html"
+    context_object_name = "glossary_check"
+
+    def get_object(self, queryset=None):
+        glossary_check = super().get_object(queryset)
+        # Checks interrupted by a restart of the server are shown as failed,
+        # rather than being polled forever.
+        if not glossary_check.finished:
+            if fail_interrupted_checks(GlossaryCheck.objects.filter(pk=glossary_check.pk)):
+                glossary_check.refresh_from_db()
+        return glossary_check
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["glossaries"] = self.object.glossaries.order_by("title")
+        context.update(get_issue_page(self.object))
+        return context
+
+
+@replica_reads
+@login_required
+def glossary_check_issues(request, pk):
+    """
+    View to display the next page of the items reported by a glossary check.
+    Receives HTMX ajax calls from the template when the bottom of the table
+    is scrolled into view. "after" and "offset" are used as in resource_content.
+    """
+
+    glossary_check = get_object_or_404(GlossaryCheck, pk=pk)
+
+    try:
+        after = int(request.GET.get("after", 0))
+        offset = int(request.GET.get("offset", 0))
+    except ValueError:
+        after = 0
+        offset = 0
+
+    context = get_issue_page(glossary_check, after=after, offset=offset)
+    context["glossary_check"] = glossary_check
+    return render(request, "_glossary_check_issue_rows.html", context)
+
+
+def get_issue_page(glossary_check, after=0, offset=0):
+    """
+    Helper method for GlossaryCheckDetailView and glossary_check_issues.
+    Returns one page of the issues of a glossary check, starting after the
+    issue having the id "after" (keyset pagination, as for resource content).
+    """
+
+    page_size = settings.GLOSSARY_CHECK_PAGE_SIZE
+    issues = list(
+        glossary_check.issues
+        .filter(id__gt=after)
+        .select_related("item")
+        .order_by("id")[:page_size + 1]
+    )
+    return make_content_page(issues, offset, page_size)
+
+
+@replica_reads
+@login_required
+def glossary_check_export(request, pk):
+    """
+    View to download the items reported by a glossary check as a CSV file.
+    The file is written while it is being sent.
+    """
+
+    glossary_check = get_object_or_404(GlossaryCheck, pk=pk)
+    response = StreamingHttpResponse(stream_csv(glossary_check), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="glossary_check_{glossary_check.pk}.csv"'
+    return response
+
+
+class Echo:
+    """File-like object whose write() returns what is written, used with csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(glossary_check):
+    """
+    Generator that yields the lines of the CSV file of a glossary check.
+    Starts with a byte order mark so that Excel reads the file as UTF-8.
+    """
+
+    writer = csv.writer(Echo())
+    yield "\ufeff" + writer.writerow(["原文", "訳文", "用語", "用語集の訳語", "用語集"])
+
+    rows = (
+        glossary_check.issues
+        .order_by("id")
+        .values_list("item__source", "item__target", "term_source", "term_target", "glossary_title")
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(row)
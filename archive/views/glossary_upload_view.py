@@ -1,13 +1,17 @@
 import csv
+import time
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.utils import timezone
 from django.views.generic import View
 
+from .. import metrics
 from ..forms.glossary_forms import GlossaryUploadForm
 from ..models import Item, Resource
+from ..timing import timed
 
 
 class GlossaryUploadView(LoginRequiredMixin, View):
@@ -77,6 +81,7 @@ def build_entries(resource_obj, request):
     associates these with the Resource object.
     """
 
+    started = time.perf_counter()
     new_items = []
 
     # Regular open() used here to make it possible to set the encoding.
@@ -84,7 +89,7 @@ def build_entries(resource_obj, request):
     # Windows text files.
     # > 'cp932' codec can't decode byte 0xef
 
-    with open(resource_obj.upload_file.path, encoding="utf-8") as f:
+    with open(resource_obj.upload_file.path, encoding="utf-8") as f, timed("parse"):
         reader = csv.reader(f, delimiter="\t")
 
         # Loop for creating new Entry objects from content of uploaded file.
@@ -118,100 +123,13 @@ def build_entries(resource_obj, request):
                 )
                 new_items.append(new_item)
 
-        # Add all new Entry objects to the database in a single write.
+    # Add all new Entry objects to the database in a single write.
+    with timed("insert"), transaction.atomic():
         Item.objects.bulk_create(new_items)
+        Resource.objects.adjust_item_count(resource_obj.pk, len(new_items))
 
     # Delete the uploaded text file, no longer needed.
     resource_obj.upload_file.delete()
 
-
-"""
-class GlossaryAllEntryView(LoginRequiredMixin, DetailView):
-    model = Glossary
-    template_name = "glossary_all.html"
-
-    def get_context_data(self, **kwargs):
-        context = super(GlossaryAllEntryView, self).get_context_data(**kwargs)
-        all_entries = context["glossary"].entries.all()
-        num_of_entries = context["glossary"].entries.all().count()
-        context.update(
-            {
-                "all_entries": all_entries,
-                "num_of_entries": num_of_entries,
-            }
-        )
-        return context
-"""
-
-
-"""
-class GlossaryExportView(LoginRequiredMixin, View):
-    form_class = GlossaryExportForm
-    template_name = "glossary_export.html"
-
-    def get(self, request, *args, **kwargs):
-        form = self.form_class()
-        return render(request, self.template_name, {"form": form})
-
-    def post(self, request, *args, **kwargs):
-
-        # If the cancel button has been pressed in the form, return to the previous URL
-        if "cancel" in request.POST:
-            if request.GET.get("previous_url"):
-                previous_url = request.GET.get("previous_url")
-                return HttpResponseRedirect(previous_url)
-
-        form = self.form_class(request.POST)
-        if form.is_valid():
-            glossaries = form.cleaned_data.get("glossaries")  # Glossary objects to be exported
-            response = build_download(glossaries)
-            return response
-
-        return render(request, self.template_name, {"form": form})
-
-
-def build_download(glossaries):
-
-    # Helper function for GlossaryExportView.
-    # Receives list of Glossary objects.
-    # Converts each object into a text file.
-    # Zips all the text files together.
-    # Returns a FileResponse that causes the browser to download the zip file.
-
-    # Create local temporary folder to hold glossary files to be exported
-    export_folder = "to_export/"
-    if not os.path.isdir(export_folder):
-        os.makedirs(export_folder)
-
-    # Create one tab-delim text file for each Glossary object and save to temporary folder
-    for glossary in glossaries:
-        filename = export_folder + glossary.title + ".txt"
-        with open(filename, "w") as f:
-            for entry in glossary.entries.all():
-                f.write(entry.source + "\t" + entry.target)
-                if entry.notes:
-                    # Replace any newline and carriage return chars and append note
-                    new_note = entry.notes.replace("\r", " ")
-                    new_note = new_note.replace("\n", " ")
-                    new_note = new_note.replace("  ", " ")
-                    f.write("\t" + new_note)
-                f.write("\n")
-
-    # Create single zip file from all files created
-    shutil.make_archive(base_name="exported_files",  # Name of the zip file to create
-                        format="zip",
-                        root_dir=export_folder)  # Path of the directory to compress
-
-    # Add zip file to response
-    download_target = "exported_files.zip"
-    response = FileResponse(open(download_target, "rb"), as_attachment=True)
-    # Force browser to download
-    response["Content-Disposition"] = "filename=exported_files"
-
-    # Delete local temporary folder containing created glossary files
-    shutil.rmtree(export_folder)
-    # Delete local zip file
-    os.remove(download_target)
-
-    return response
-"""
+    metrics.IMPORTED_ROWS.inc(len(new_items), format="tsv")
+    metrics.IMPORT_DURATION.observe(time.perf_counter() - started, format="tsv")
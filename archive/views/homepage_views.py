@@ -1,66 +1,102 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.shortcuts import render
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from ..models import Resource, Item
+from ..models import Resource
+from ..routers import replica_reads
+
+# Orderings used for each column of the homepage table. The id is included
+# last so that the order (and therefore each page) is stable.
+HOME_TABLE_ORDERINGS = {
+    "title": (Lower("title"), F("id")),
+    "type": (F("resource_type"), Lower("title"), F("id")),
+    "created_on": (F("created_on"), F("id")),
+}
 
 
 class HomePageView(LoginRequiredMixin, TemplateView):
+    use_replica = True
     template_name = "home.html"
 
     def get_context_data(self, **kwargs):
-        resources_list = Resource.objects.all()
+        autofocus_searchbar = True
 
-        num_of_resources = Resource.objects.all().count()
-        num_of_glossaries = Resource.objects.filter(resource_type="GLOSSARY").count()
-        num_of_translations = Resource.objects.filter(resource_type="TRANSLATION").count()
+        context = super(HomePageView, self).get_context_data(**kwargs)
 
-        num_of_all_entries = Item.objects.all().count()
-        num_of_gloss_entries = Item.objects.filter(resource__resource_type="GLOSSARY").count()
-        num_of_trans_segments = Item.objects.filter(resource__resource_type="TRANSLATION").count()
+        # Numbers of resources and items, from the cached archive statistics.
+        context.update(Resource.objects.archive_stats())
 
-        autofocus_searchbar = True
+        # First page of the resources table.
+        context.update(get_home_table_page("created_on", "ascend"))
 
-        context = super(HomePageView, self).get_context_data(**kwargs)
         context.update(
             {
-                "resources_list": resources_list,
-                "num_of_glossaries": num_of_glossaries,
-                "num_of_translations": num_of_translations,
-                "num_of_resources": num_of_resources,
-                "num_of_gloss_entries": num_of_gloss_entries,
-                "num_of_trans_segments": num_of_trans_segments,
-                "num_of_all_entries": num_of_all_entries,
                 "autofocus_searchbar": autofocus_searchbar,
             }
         )
         return context
 
 
+@replica_reads
+@login_required
 def home_table_sort(request, filter, direction):
     """
     View to sort and redisplay the glossaries and translations displayed in the
-    table shown on the homepage. Receives HTMX ajax calls from the template.
+    table shown on the homepage. Receives HTMX ajax calls from the template,
+    both when a column is sorted and when the next page of the table is
+    scrolled into view. The optional "q" parameter is used to display only
+    the resources whose titles contain the entered text.
     """
 
-    resources = Resource.objects.all()
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
 
-    if direction == "ascend":
-        direction = False
-    else:
-        direction = True
+    q = request.GET.get("q", "").strip()
 
-    if filter == "title":
-        resources_list = sorted(
-            resources, key=lambda item: item.title, reverse=direction
-        )
-    elif filter == "type":
-        resources_list = sorted(
-            resources, key=lambda item: item.resource_type, reverse=direction
-        )
-    else:
-        resources_list = sorted(
-            resources, key=lambda item: item.created_on, reverse=direction
-        )
+    context = get_home_table_page(filter, direction, page=page, q=q)
+    return render(request, "_home_table_list.html", context)
+
+
+def get_home_table_page(filter, direction, page=1, q=""):
+    """
+    Helper method for HomePageView and home_table_sort.
+    Returns one page of the resources displayed in the homepage table.
+    Sorting is done by the database using the indexes on Resource, so only
+    the resources on the page are loaded.
+    """
+
+    page_size = settings.HOME_TABLE_PAGE_SIZE
+
+    if filter not in HOME_TABLE_ORDERINGS:
+        filter = "created_on"
+    if direction != "descend":
+        direction = "ascend"
+
+    ordering = [
+        expression.desc() if direction == "descend" else expression.asc()
+        for expression in HOME_TABLE_ORDERINGS[filter]
+    ]
+
+    resources = Resource.objects.order_by(*ordering)
+    if q:
+        resources = resources.filter(title__icontains=q)
+
+    # One more resource than the page size is fetched to find out whether
+    # there is a next page.
+    start = (page - 1) * page_size
+    resources_list = list(resources[start:start + page_size + 1])
+    has_next = len(resources_list) > page_size
 
-    return render(request, "_home_table_list.html", {"resources_list": resources_list})
+    return {
+        "resources_list": resources_list[:page_size],
+        "sort_filter": filter,
+        "sort_direction": direction,
+        "q": q,
+        "next_page": page + 1 if has_next else None,
+    }
@@ -84,6 +84,8 @@ class ItemUpdateView(LoginRequiredMixin, UpdateView):
     glossary or a translation.
     """
     model = Item
+    # The resource type decides the form class.
+    queryset = Item.objects.select_related("resource")
     template_name = "item_update.html"
 
     def get_form_class(self):
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from .. import metrics
+
+
+def metrics_view(request):
+    """
+    Returns the metrics of all the processes of the server in the Prometheus
+    text format. Allowed for staff users, and for requests with the token set
+    in settings.METRICS_TOKEN (sent as "Authorization: Bearer <token>").
+    """
+
+    if not can_read_metrics(request):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def can_read_metrics(request):
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        return True
+    return request.user.is_staff
@@ -0,0 +1,75 @@
+import os
+from urllib.parse import quote
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import render
+from django.views.generic import View
+
+from ..forms.pretranslation_forms import PretranslationForm
+from ..pretranslation import (PretranslationError, build_docx, pretranslate,
+                              read_document, stream_tmx)
+from ..timing import timed
+
+
+class PretranslationView(LoginRequiredMixin, View):
+    """
+    View to pre-translate an uploaded TMX or DOCX file with the translations
+    and glossaries in the archive. The pre-translated file is downloaded in
+    the same format.
+    """
+    use_replica = True
+    form_class = PretranslationForm
+    template_name = "pretranslation.html"
+
+    def get(self, request, *args, **kwargs):
+        form = self.form_class()
+        return render(request, self.template_name, {"form": form})
+
+    def post(self, request, *args, **kwargs):
+        if "cancel" in request.POST:
+            if request.GET.get("previous_url"):
+                previous_url = request.GET.get("previous_url")
+                return HttpResponseRedirect(previous_url)
+
+        form = self.form_class(request.POST, request.FILES)
+        if form.is_valid():
+            upload_file = form.cleaned_data["upload_file"]
+            try:
+                with timed("parse"):
+                    document = read_document(upload_file)
+            except PretranslationError as e:
+                form.add_error("upload_file", str(e))
+            else:
+                if any(segment.strip() for segment in document.segments):
+                    matches = pretranslate(document.segments, form.cleaned_data["threshold"] / 100)
+                    return build_response(document, matches, upload_file.name)
+                form.add_error("upload_file", "選択したファイルに原文が見つかりません。")
+
+        return render(request, self.template_name, {"form": form})
+
+
+def build_response(document, matches, file_name):
+    """
+    Helper method for PretranslationView.
+    Returns a response that causes the browser to download the pre-translated
+    file, named after the uploaded file. TMX files are written while they are
+    being sent, and DOCX files (which python-docx can only write whole) are
+    sent from a temporary file in chunks.
+    """
+
+    name = f"{os.path.splitext(file_name)[0]}_pretranslated.{document.format}"
+    if document.format == "tmx":
+        response = StreamingHttpResponse(stream_tmx(document, matches), content_type="application/x-tmx+xml")
+        if name.isascii():
+            response["Content-Disposition"] = f'attachment; filename="{name}"'
+        else:
+            response["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(name)}"
+        return response
+
+    return FileResponse(
+        build_docx(document, matches),
+        as_attachment=True,
+        filename=name,
+        content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    )
@@ -0,0 +1,234 @@
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models.functions import Lower
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.views.generic import View
+
+from ..asgi import AsyncLoginRequiredMixin, AsyncStreamingHttpResponse
+from ..forms.export_forms import ResourceExportForm
+from ..models import Item
+
+# Number of Item objects fetched from the database at a time while writing
+# the zip file. Also the number of rows written between each chunk of the
+# zip file being sent to the browser.
+EXPORT_CHUNK_SIZE = 2000
+
+# Folder names used inside the zip file for each type of resource.
+EXPORT_FOLDERS = {
+    "GLOSSARY": "用語集",
+    "TRANSLATION": "翻訳",
+}
+
+
+class ResourceExportView(LoginRequiredMixin, View):
+    use_replica = True
+    form_class = ResourceExportForm
+    template_name = "resource_export.html"
+
+    def get(self, request, *args, **kwargs):
+        form = self.form_class()
+        return render(request, self.template_name, {"form": form})
+
+    def post(self, request, *args, **kwargs):
+        if "cancel" in request.POST:
+            if request.GET.get("previous_url"):
+                previous_url = request.GET.get("previous_url")
+                return HttpResponseRedirect(previous_url)
+
+        form = self.form_class(request.POST)
+        if form.is_valid():
+            return build_download(form.get_resources())
+
+        return render(request, self.template_name, {"form": form})
+
+
+class AsyncResourceExportView(AsyncLoginRequiredMixin, View):
+    """
+    Async version of ResourceExportView, used when the project is served
+    through config.asgi (see settings.ASYNC_VIEWS). The zip file is built
+    with async iteration over the items while it is being sent.
+    """
+    use_replica = True
+    form_class = ResourceExportForm
+    template_name = "resource_export.html"
+
+    async def get(self, request, *args, **kwargs):
+        form = self.form_class()
+        return await sync_to_async(render)(request, self.template_name, {"form": form})
+
+    async def post(self, request, *args, **kwargs):
+        if "cancel" in request.POST:
+            if request.GET.get("previous_url"):
+                previous_url = request.GET.get("previous_url")
+                return HttpResponseRedirect(previous_url)
+
+        form = self.form_class(request.POST)
+        if await sync_to_async(form.is_valid)():
+            response = AsyncStreamingHttpResponse(
+                astream_zip(form.get_resources()),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = 'attachment; filename="honyaku_archive_export.zip"'
+            return response
+
+        return await sync_to_async(render)(request, self.template_name, {"form": form})
+
+
+def build_download(resources):
+    """
+    Helper method for ResourceExportView.
+    Receives a queryset of Resource objects.
+    Returns a StreamingHttpResponse that causes the browser to download a zip
+    file containing one tab-delimited text file per Resource object.
+    The zip file is built while it is being sent, so nothing is written to
+    disk and memory use does not depend on the size of the resources.
+    """
+
+    response = StreamingHttpResponse(
+        stream_zip(resources),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = 'attachment; filename="honyaku_archive_export.zip"'
+    return response
+
+
+class ZipStreamBuffer:
+    """
+    Write-only file-like object used as the target of a ZipFile.
+    Holds the bytes written by the ZipFile until they are collected by
+    stream_zip(). Since it has no tell() or seek(), ZipFile writes the zip file
+    sequentially (using data descriptors) instead of going back to update
+    the headers of each member.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def collect(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(resources):
+    """
+    Generator that yields the zip file in chunks.
+    Each Resource object becomes one member of the zip file, and the content
+    of each member is written from an iterator over its Item objects.
+    """
+
+    buffer = ZipStreamBuffer()
+    used_names = set()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for resource in export_order(resources).iterator():
+            with open_member(zip_file, resource, used_names) as member:
+                items = export_items(resource).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+                for count, row in enumerate(items, start=1):
+                    member.write(format_row(**row).encode("utf-8"))
+                    if count % EXPORT_CHUNK_SIZE == 0:
+                        yield buffer.collect()
+
+            yield buffer.collect()
+
+    # Remaining data (the central directory) is written when the ZipFile is closed.
+    yield buffer.collect()
+
+
+async def astream_zip(resources):
+    """
+    Async version of stream_zip(), used by AsyncResourceExportView.
+    The database is read with async iteration, so the event loop is free to
+    serve other requests while each chunk of items is fetched.
+    """
+
+    buffer = ZipStreamBuffer()
+    used_names = set()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        async for resource in export_order(resources).aiterator():
+            with open_member(zip_file, resource, used_names) as member:
+                count = 0
+                async for row in export_items(resource).aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+                    member.write(format_row(**row).encode("utf-8"))
+                    count += 1
+                    if count % EXPORT_CHUNK_SIZE == 0:
+                        yield buffer.collect()
+
+            yield buffer.collect()
+
+    yield buffer.collect()
+
+
+def export_order(resources):
+    return resources.order_by("resource_type", Lower("title"))
+
+
+def export_items(resource):
+    # values() rather than values_list(), which cannot be iterated
+    # asynchronously in Django 4.1 (its query is run before the first chunk
+    # is requested, in the event loop).
+    return Item.objects.filter(resource=resource).order_by("id").values("source", "target", "notes")
+
+
+def open_member(zip_file, resource, used_names):
+    """
+    Returns a writable file object for the member of the zip file holding
+    the items of resource.
+    """
+
+    member_info = zipfile.ZipInfo(
+        filename=get_member_name(resource, used_names),
+        date_time=timezone.localtime(resource.updated_on).timetuple()[:6],
+    )
+    member_info.compress_type = zipfile.ZIP_DEFLATED
+
+    # force_zip64 is needed because the size of the member is not known
+    # before it is written, and may be larger than 2 GiB.
+    return zip_file.open(member_info, mode="w", force_zip64=True)
+
+
+def get_member_name(resource, used_names):
+    """
+    Returns the file name used for a Resource object inside the zip file.
+    Characters that cannot be used in file names are replaced, and the id of
+    the resource is appended if the name has already been used.
+    """
+
+    folder = EXPORT_FOLDERS.get(resource.resource_type, "その他")
+    title = resource.title
+    for char in '\\/:*?"<>|':
+        title = title.replace(char, "_")
+
+    name = f"{folder}/{title}.txt"
+    if name.lower() in used_names:
+        name = f"{folder}/{title} ({resource.id}).txt"
+    used_names.add(name.lower())
+
+    return name
+
+
+def format_row(source, target, notes):
+    """
+    Returns one line of the tab-delimited text file for an Item object, using
+    the same format that is accepted by the glossary upload form.
+    Tab, newline and carriage return characters are replaced with spaces.
+    """
+
+    row = [source, target]
+    if notes:
+        row.append(notes)
+
+    row = [value.replace("\t", " ").replace("\r", " ").replace("\n", " ") for value in row]
+    return "\t".join(row) + "\n"
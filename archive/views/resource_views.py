@@ -1,11 +1,29 @@
+import string
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.db import connections
+from django.db.models.functions import Lower
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
 
+from ..asgi import async_login_required
+from ..conditional import async_conditional_page, conditional_page, resource_etag
+from ..deletion import delete_resource
 from ..forms.glossary_forms import GlossaryForm
 from ..forms.translation_forms import TranslationUpdateForm
-from ..models import Resource
+from ..models import Item, Resource
+from ..routers import replica_reads
+from ..search import clean_query, item_query_filter
+
+
+# Lower-cases ASCII letters only, as SQLite's LOWER() does.
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 
 class ResourceCreateView(LoginRequiredMixin, CreateView):
@@ -34,22 +52,213 @@ class ResourceCreateView(LoginRequiredMixin, CreateView):
             return super(ResourceCreateView, self).post(request, *args, **kwargs)
 
 
+@method_decorator(conditional_page(resource_etag), name="get")
 class ResourceDetailView(LoginRequiredMixin, DetailView):
+    use_replica = True
     model = Resource
     context_object_name = "resource"
     template_name = "resource_detail.html"
 
     def get_context_data(self, **kwargs):
         context = super(ResourceDetailView, self).get_context_data(**kwargs)
-        num_of_items = context["resource"].items.all().count()
+        num_of_items = context["resource"].item_count
         context.update(
             {
                 "num_of_items": num_of_items,
             }
         )
+        context.update(get_content_page(context["resource"]))
         return context
 
 
+@replica_reads
+@login_required
+@conditional_page(resource_etag)
+def resource_content(request, pk):
+    """
+    View to display the next page of items in the content table shown on the
+    resource detail page. Receives HTMX ajax calls from the template when the
+    bottom of the table is scrolled into view, or when a query is entered in
+    the filter field above the table.
+    "after" is the id of the last item already displayed, "offset" is the
+    number of items already displayed (used for the row numbers), and "query"
+    is used to display only the items containing the query string.
+    """
+
+    resource = get_object_or_404(Resource, pk=pk)
+    query = request.GET.get("query", "").strip()
+
+    try:
+        after = int(request.GET.get("after", 0))
+        offset = int(request.GET.get("offset", 0))
+    except ValueError:
+        after = 0
+        offset = 0
+
+    context = get_content_page(resource, after=after, offset=offset, query=query)
+    context.update(
+        {
+            "resource": resource,
+            "query": query,
+            "previous_url": resource.get_absolute_url(),
+        }
+    )
+    return render(request, "_resource_content_rows.html", context)
+
+
+@replica_reads
+@async_login_required
+@async_conditional_page(resource_etag)
+async def async_resource_content(request, pk):
+    """
+    Async version of resource_content, used when the project is served
+    through config.asgi (see settings.ASYNC_VIEWS).
+    """
+
+    try:
+        resource = await Resource.objects.aget(pk=pk)
+    except Resource.DoesNotExist:
+        raise Http404("No resource matches the given query.")
+
+    query = request.GET.get("query", "").strip()
+
+    try:
+        after = int(request.GET.get("after", 0))
+        offset = int(request.GET.get("offset", 0))
+    except ValueError:
+        after = 0
+        offset = 0
+
+    page_size = settings.RESOURCE_CONTENT_PAGE_SIZE
+    queryset = content_page_queryset(resource, after, query)[:page_size + 1]
+    items = [item async for item in queryset]
+
+    context = make_content_page(items, offset, page_size)
+    context.update(
+        {
+            "resource": resource,
+            "query": query,
+            "previous_url": resource.get_absolute_url(),
+        }
+    )
+    return await sync_to_async(render)(request, "_resource_content_rows.html", context)
+
+
+def get_content_page(resource, after=0, offset=0, query=""):
+    """
+    Helper method for ResourceDetailView and resource_content.
+    Returns one page of the items of a resource, starting after the item
+    having the id "after". Keyset pagination (by id) is used instead of
+    OFFSET so that the cost of loading a page does not increase with the
+    number of pages already loaded.
+    If a query is given, only items matching the query (using the same
+    lookup as the main search) are included.
+    """
+
+    page_size = settings.RESOURCE_CONTENT_PAGE_SIZE
+    items = list(content_page_queryset(resource, after, query)[:page_size + 1])
+    return make_content_page(items, offset, page_size)
+
+
+def content_page_queryset(resource, after, query):
+    queryset = Item.objects.filter(resource=resource, id__gt=after)
+    if query:
+        queryset = queryset.filter(item_query_filter(clean_query(query)))
+    return queryset.order_by("id")
+
+
+def make_content_page(items, offset, page_size):
+    """
+    Returns the context of a page of the content table, from a list of up to
+    page_size + 1 items. One more item than the page size is fetched to find
+    out whether there is a next page.
+    """
+
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_after = items[-1].id
+    else:
+        next_after = None
+
+    return {
+        "items": items,
+        "offset": offset,
+        "next_after": next_after,
+        "next_offset": offset + len(items),
+    }
+
+
+@login_required
+def resource_picker(request):
+    """
+    View to display the individual resources in the drop-down list of the
+    navbar search form. Receives an HTMX ajax call from the template the
+    first time the list is used, so that pages do not have to include an
+    option for every resource.
+    "selected" is the resource to preselect, and the optional "q" parameter
+    is used to list only the resources whose titles contain the text entered
+    in the filter field next to the list. Requests from the filter field
+    include the current value of the list as "resource" instead of "selected".
+    """
+
+    navbar_resources = Resource.objects.navbar_resources()
+
+    q = request.GET.get("q", "").strip().lower()
+    if q:
+        navbar_resources = {
+            key: [title for title in titles if q in title.lower()]
+            for key, titles in navbar_resources.items()
+        }
+
+    context = {
+        "navbar_resources": navbar_resources,
+        "target_resource": request.GET.get("selected", request.GET.get("resource", "")),
+        "load_resources": True,
+    }
+    return render(request, "_navbar_resource_options.html", context)
+
+
+@login_required
+def resource_autocomplete(request):
+    """
+    View to display the resources whose titles start with the text entered in
+    a ResourceAutocompleteWidget. Receives HTMX ajax calls from the widget.
+    The prefix is matched with a range over the lower-cased titles, so that
+    the index on resource type and lower-cased title is used.
+    "target" is the id of the widget's text field, and "multiple" is set by
+    ResourceMultipleAutocompleteWidget, to which the chosen resources are added.
+    """
+
+    q = request.GET.get("q", "").strip()
+    resource_type = request.GET.get("resource_type", "GLOSSARY")
+
+    resources = (
+        Resource.objects
+        .filter(resource_type=resource_type)
+        .annotate(lower_title=Lower("title"))
+        .order_by("lower_title", "id")
+    )
+    if q:
+        # The prefix is lower-cased as the database lower-cases the titles,
+        # otherwise titles starting with non-ASCII letters are not found on
+        # SQLite.
+        if connections[resources.db].vendor == "sqlite":
+            prefix = q.translate(ASCII_LOWER)
+        else:
+            prefix = q.lower()
+        resources = resources.filter(
+            lower_title__gte=prefix, lower_title__lt=prefix + "\U0010ffff"
+        )
+
+    context = {
+        "resources": resources.only("id", "title")[:settings.AUTOCOMPLETE_RESULTS],
+        "target": request.GET.get("target", ""),
+        "multiple": request.GET.get("multiple") == "1",
+        "q": q,
+    }
+    return render(request, "_resource_autocomplete_results.html", context)
+
+
 class ResourceUpdateView(LoginRequiredMixin, UpdateView):
     model = Resource
     context_object_name = "resource"
@@ -72,3 +281,11 @@ class ResourceDeleteView(LoginRequiredMixin, DeleteView):
     context_object_name = "resource"
     success_url = reverse_lazy("home")
     template_name = "resource_delete.html"
+
+    def form_valid(self, form):
+        """
+        Overridden to delete the items of the resource in batches, instead of
+        having Django load them all to cascade the deletion.
+        """
+        delete_resource(self.object)
+        return HttpResponseRedirect(self.get_success_url())
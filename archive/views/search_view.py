@@ -1,68 +1,50 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
 from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
 from django.views.generic import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models.functions import Length
+from django.utils.decorators import method_decorator
 
+from .. import metrics
+from ..asgi import async_login_required
+from ..conditional import archive_etag, async_conditional_page, conditional_page
 from ..models import Item
+from ..routers import replica_reads
+from ..search import add_snippets, clean_query, item_query_filter
 
 
+@method_decorator(conditional_page(archive_etag), name="get")
 class SearchView(LoginRequiredMixin, ListView):
     """
     View to search for Item objects containing a query string.
     """
+    use_replica = True
     template_name = "search_results.html"
 
-    def get_queryset(self):
-        resource = self.request.GET.get("resource")
-        raw_query = self.request.GET.get("query")
-
-        # Check if query is surrounded with double quotes.
-        # If surrounded, remove only the quote symbols.
-        #    (I.e. leave whitespace directly inside quote symbols.)
-        # If not surrounded, strip any surrounding whitespace.
-        if raw_query.startswith('"') and raw_query.endswith('"'):
-            query = raw_query[1:-1]
-        else:
-            query = raw_query.strip()
-
-        # Search all resources
-        if resource == "すべてのリソース":
-            queryset = (
-                Item.objects
-                .filter(Q(source__icontains=query) | Q(target__icontains=query) | Q(notes__icontains=query))
-                .order_by(Length("source"))
-            )
-
-        # Search all glossaries
-        elif resource == "すべての用語集":
-            queryset = (
-                Item.objects
-                .filter(resource__resource_type="GLOSSARY")
-                .filter(Q(source__icontains=query) | Q(target__icontains=query) | Q(notes__icontains=query))
-                .order_by(Length("source"))
-            )
-
-        # Search all translations
-        elif resource == "すべての翻訳":
-            queryset = (
-                Item.objects
-                .filter(resource__resource_type="TRANSLATION")
-                .filter(Q(source__icontains=query) | Q(target__icontains=query) | Q(notes__icontains=query))
-                .order_by(Length("source"))
-            )
-
-        # Search specific resource
-        else:
-            queryset = (
-                Item.objects
-                .filter(
-                    Q(resource__title=resource),
-                    Q(source__icontains=query) | Q(target__icontains=query) | Q(notes__icontains=query),
-                )
-                .order_by(Length("source"))
+    def get(self, request, *args, **kwargs):
+        """
+        Overridden to record the search in the metrics once the results have
+        been rendered (the search query is run while rendering).
+        """
+        started = time.perf_counter()
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda response: record_search(
+                request.GET.get("resource"),
+                clean_query(request.GET.get("query")),
+                response.context_data["hits"],
+                time.perf_counter() - started,
             )
+        )
+        return response
 
-        return queryset
+    def get_queryset(self):
+        return search_items(self.request.GET.get("resource"), clean_query(self.request.GET.get("query")))
 
     def get_context_data(self, **kwargs):
         """
@@ -72,7 +54,10 @@ class SearchView(LoginRequiredMixin, ListView):
 
         query = self.request.GET.get("query").strip()
         target_resource = self.request.GET.get("resource")
-        hits = len(self.get_queryset())
+        # Evaluates object_list, so that the template uses the same results
+        # instead of running the search again.
+        hits = len(self.object_list)
+        add_snippets(self.object_list, clean_query(query))
 
         context.update(
             {
@@ -83,3 +68,139 @@ class SearchView(LoginRequiredMixin, ListView):
         )
 
         return context
+
+
+@replica_reads
+@async_login_required
+@async_conditional_page(archive_etag)
+async def async_search(request):
+    """
+    Async version of SearchView, used when the project is served through
+    config.asgi (see settings.ASYNC_VIEWS). The results are read with async
+    iteration, and the template (whose context processors may read the
+    database) is rendered in a thread.
+    """
+
+    started = time.perf_counter()
+    query = clean_query(request.GET.get("query"))
+    queryset = search_items(request.GET.get("resource"), query)
+    object_list = add_snippets([item async for item in queryset.aiterator()], query)
+
+    context = {
+        "object_list": object_list,
+        "query": request.GET.get("query").strip(),
+        "target_resource": request.GET.get("resource"),
+        "hits": len(object_list),
+    }
+    response = await sync_to_async(render)(request, SearchView.template_name, context)
+    record_search(request.GET.get("resource"), query, len(object_list), time.perf_counter() - started)
+    return response
+
+
+@replica_reads
+@login_required
+@conditional_page(archive_etag)
+def search_segment(request, pk, field):
+    """
+    View to display the full source or target text of an item in the search
+    results, in place of its snippets (see search.add_snippets). Receives
+    HTMX ajax calls from the template when the snippets are clicked.
+    "query" is the search query, highlighted in the text.
+    """
+
+    if field not in ("source", "target"):
+        raise Http404("No such field.")
+    item = get_object_or_404(Item.objects.exclude(resource__pending_deletion=True).only(field), pk=pk)
+
+    context = {
+        "item": item,
+        "field": field,
+        "text": getattr(item, field),
+        "query": request.GET.get("query", "").strip(),
+    }
+    return render(request, "_search_segment.html", context)
+
+
+def search_items(resource, query):
+    """
+    Returns a queryset of the Item objects containing query, in the resource
+    chosen in the navbar search form (a resource title, or one of the
+    options for all resources, all glossaries or all translations).
+    Shared by SearchView and async_search.
+    """
+
+    # Items of resources that are being deleted are not searched.
+    # The resource of each item is shown in the results.
+    items = Item.objects.exclude(resource__pending_deletion=True).select_related("resource")
+
+    # Search all resources
+    if resource == "すべてのリソース":
+        queryset = (
+            items
+            .filter(item_query_filter(query))
+            .order_by(Length("source"))
+        )
+
+    # Search all glossaries
+    elif resource == "すべての用語集":
+        queryset = (
+            items
+            .filter(resource__resource_type="GLOSSARY")
+            .filter(item_query_filter(query))
+            .order_by(Length("source"))
+        )
+
+    # Search all translations
+    elif resource == "すべての翻訳":
+        queryset = (
+            items
+            .filter(resource__resource_type="TRANSLATION")
+            .filter(item_query_filter(query))
+            .order_by(Length("source"))
+        )
+
+    # Search specific resource
+    else:
+        queryset = (
+            items
+            .filter(
+                Q(resource__title=resource),
+                item_query_filter(query),
+            )
+            .order_by(Length("source"))
+        )
+
+    return queryset
+
+
+# Scopes of the search metrics, by option of the navbar search form.
+# Searches of a specific resource have the scope "resource".
+SEARCH_SCOPES = {
+    "すべてのリソース": "all",
+    "すべての用語集": "glossaries",
+    "すべての翻訳": "translations",
+}
+
+# Upper bounds of the query length labels of the search metrics.
+QUERY_LENGTHS = (1, 3, 7, 15)
+
+
+def query_length_label(query):
+    """Returns the label of the length of query, e.g. "4-7" or "16+"."""
+
+    lower = 0
+    for upper in QUERY_LENGTHS:
+        if len(query) <= upper:
+            return f"{lower}-{upper}"
+        lower = upper + 1
+    return f"{lower}+"
+
+
+def record_search(resource, query, hits, duration):
+    """Updates the search metrics (see archive/metrics.py)."""
+
+    scope = SEARCH_SCOPES.get(resource, "resource")
+    query_length = query_length_label(query)
+    metrics.SEARCHES.inc(scope=scope, query_length=query_length)
+    metrics.SEARCH_DURATION.observe(duration, scope=scope, query_length=query_length)
+    metrics.SEARCH_HITS.observe(hits, scope=scope)
@@ -1,5 +1,8 @@
+import time
+
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse_lazy
@@ -8,8 +11,11 @@ from django.views.generic import View
 from docx import Document  # For reading docx files
 from translate.storage.tmx import tmxfile  # For reading tmx files (from translate-toolkit)
 
+from .. import metrics
 from ..forms.translation_forms import TranslationUploadForm
+from ..glossary_check import start_glossary_check
 from ..models import Item, Resource
+from ..timing import timed
 
 
 class TranslationUploadView(LoginRequiredMixin, View):
@@ -40,6 +46,11 @@ class TranslationUploadView(LoginRequiredMixin, View):
             )
             successful = build_items(request, resource_obj)
             if successful:
+                # The glossary check report is shown instead of the resource
+                # if glossaries were chosen.
+                if form.cleaned_data["glossaries"]:
+                    glossary_check = start_glossary_check(resource_obj, form.cleaned_data["glossaries"], request.user)
+                    return HttpResponseRedirect(glossary_check.get_absolute_url())
                 return HttpResponseRedirect(resource_obj.get_absolute_url())
             return HttpResponseRedirect(reverse_lazy("home"))
 
@@ -53,39 +64,27 @@ def build_items(request, resource_obj):
     builds Item objects from the parsed content.
     """
 
-    import time
-
-    st = time.time()  # Test-related
+    started = time.perf_counter()
 
     # Select appropriate parser
-    if resource_obj.upload_file.path.endswith(".tmx"):
-        new_items = tmx_parser(resource_obj)
-    else:
-        new_items = docx_parser(request, resource_obj)
-
-    # Test-related
-    et = time.time()
-    elapsed_time = et - st
-    print("**********")
-    print(elapsed_time)
-    print("**********")
+    with timed("parse"):
+        if resource_obj.upload_file.path.endswith(".tmx"):
+            file_format = "tmx"
+            new_items = tmx_parser(resource_obj)
+        else:
+            file_format = "docx"
+            new_items = docx_parser(request, resource_obj)
 
     # Save content to database
     if new_items:
-        resource_obj.save()
-        Item.objects.bulk_create(new_items)
+        with timed("insert"), transaction.atomic():
+            resource_obj.item_count = len(new_items)
+            resource_obj.save()
+            Item.objects.bulk_create(new_items)
         resource_obj.upload_file.delete()  # Uploaded file no longer needed
 
-        """
-        # Output success message if Translation and Segment objects successfully created in database
-        if Translation.objects.filter(job_number__iexact=translation_obj.job_number).exists():
-            if Segment.objects.filter(
-                    translation__job_number__iexact=translation_obj.job_number
-                ).exists:
-                messages.success(request, '翻訳のアップロードが成功しました。')
-        else:
-            messages.error(request, '翻訳のアップロードに失敗しました。')
-        """
+        metrics.IMPORTED_ROWS.inc(len(new_items), format=file_format)
+        metrics.IMPORT_DURATION.observe(time.perf_counter() - started, format=file_format)
 
         return True
 
@@ -0,0 +1,285 @@
+"""
+Benchmark of the ASGI entry point (config.asgi, with the async views) against
+the WSGI entry point (config.wsgi) under a mix of slow and fast requests.
+
+Slow requests search all resources for a string that is not found (so every
+item is scanned), and fast requests load a page of the resource content
+table. Each client sends its requests one after the other.
+Under WSGI, the requests are handled by --workers threads (like a server
+with that number of sync workers), and clients wait for a free worker.
+Under ASGI, all requests are handled by a single event loop.
+
+Both entry points are called directly (without a server or network), each in
+its own process, using the same new temporary database, so db.sqlite3 is not
+touched.
+
+Usage:
+    python -m benchmarks.asgi_concurrency [--items 100000] [--requests 400] [--clients 16]
+                                          [--workers 4] [--slow-ratio 0.2]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(database_path, async_views):
+    sys.path.insert(0, BASE_DIR)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["ASYNC_VIEWS"] = str(async_views)
+    os.environ["CACHE_URL"] = "locmem://"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("DEBUG", "False")
+    os.environ["ALLOWED_HOSTS"] = "127.0.0.1"
+
+    import django
+
+    django.setup()
+
+
+def prepare(items):
+    """
+    Creates the database used by both runs, and returns the arguments passed
+    to each run (path of the database, session key of a logged-in user and
+    id of the resource).
+    """
+
+    database_path = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+    setup_django(database_path, async_views=False)
+
+    from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                     SESSION_KEY, get_user_model)
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.core.management import call_command
+
+    from archive.models import Item, Resource
+
+    call_command("migrate", verbosity=0)
+
+    user = get_user_model().objects.create_user(username="benchmark", password="benchmark")
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+
+    resource = Resource.objects.create(resource_type="TRANSLATION", title="Benchmark")
+    batch_size = 5000
+    for start in range(0, items, batch_size):
+        Item.objects.bulk_create(
+            [
+                Item(resource=resource, source=f"原文{i}", target=f"Target text {i}")
+                for i in range(start, min(start + batch_size, items))
+            ]
+        )
+    Resource.objects.recount_items()
+
+    return ["--database", database_path, "--session", session.session_key, "--resource", str(resource.pk)]
+
+
+def make_requests(args, first_item_id):
+    """
+    Returns a list of (kind, path, query string) for each client.
+    The same seed is used for both runs, so they send the same requests.
+    """
+
+    rng = random.Random(0)
+    clients = [[] for _ in range(args.clients)]
+    for number in range(args.requests):
+        if rng.random() < args.slow_ratio:
+            query = urlencode({"query": f"見つからない{number}", "resource": "すべてのリソース"})
+            request = ("slow", "/search/", query)
+        else:
+            after = first_item_id + rng.randrange(args.items)
+            request = ("fast", f"/resource/{args.resource}/content/", f"after={after}")
+        clients[number % args.clients].append(request)
+    return clients
+
+
+def run_wsgi(args, clients):
+    from wsgiref.util import setup_testing_defaults
+
+    from django.core.handlers.wsgi import WSGIHandler
+
+    application = WSGIHandler()
+    workers = threading.Semaphore(args.workers)
+    results = []
+    lock = threading.Lock()
+
+    def call(path, query):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_COOKIE": f"sessionid={args.session}",
+            "wsgi.input": io.BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        with workers:
+            body = application(environ, lambda status, headers: statuses.append(status))
+            try:
+                b"".join(body)
+            finally:
+                body.close()
+        return int(statuses[0].split()[0])
+
+    def client(requests):
+        for kind, path, query in requests:
+            started = time.perf_counter()
+            status = call(path, query)
+            with lock:
+                results.append((kind, status, time.perf_counter() - started))
+
+    threads = [threading.Thread(target=client, args=(requests,)) for requests in clients]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def run_asgi(args, clients):
+    from archive.asgi import ArchiveASGIHandler
+
+    application = ArchiveASGIHandler()
+    results = []
+
+    async def call(path, query):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [(b"host", b"127.0.0.1"), (b"cookie", f"sessionid={args.session}".encode())],
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await application(scope, receive, send)
+        return messages[0]["status"]
+
+    async def client(requests):
+        for kind, path, query in requests:
+            started = time.perf_counter()
+            status = await call(path, query)
+            results.append((kind, status, time.perf_counter() - started))
+
+    async def main():
+        await asyncio.gather(*(client(requests) for requests in clients))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    return results, time.perf_counter() - started
+
+
+def run(args):
+    """Runs the requests through one entry point and prints the results as JSON."""
+
+    setup_django(args.database, async_views=args.mode == "asgi")
+
+    from archive.models import Item
+
+    first_item_id = Item.objects.order_by("id").values_list("id", flat=True).first()
+    clients = make_requests(args, first_item_id)
+
+    if args.mode == "asgi":
+        results, elapsed = run_asgi(args, clients)
+    else:
+        results, elapsed = run_wsgi(args, clients)
+
+    summary = {
+        "mode": args.mode,
+        "requests": len(results),
+        "errors": sum(status != 200 for _, status, _ in results),
+        "requests_per_second": len(results) / elapsed,
+    }
+    for kind in ("slow", "fast"):
+        latencies = sorted(latency for k, _, latency in results if k == kind)
+        summary[f"{kind}_p50_ms"] = statistics.median(latencies) * 1000 if latencies else None
+        summary[f"{kind}_p95_ms"] = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000, help="Number of items in the database.")
+    parser.add_argument("--requests", type=int, default=400, help="Total number of requests.")
+    parser.add_argument("--clients", type=int, default=16, help="Number of concurrent clients.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of WSGI worker threads.")
+    parser.add_argument("--slow-ratio", type=float, default=0.2, help="Proportion of slow requests.")
+    # Used when running one entry point in a child process.
+    parser.add_argument("--mode", choices=("wsgi", "asgi"), help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    parser.add_argument("--session", help=argparse.SUPPRESS)
+    parser.add_argument("--resource", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args)
+        return
+
+    run_args = prepare(args.items)
+    shared_args = [
+        "--items", str(args.items),
+        "--requests", str(args.requests),
+        "--clients", str(args.clients),
+        "--workers", str(args.workers),
+        "--slow-ratio", str(args.slow_ratio),
+    ]
+
+    print(
+        f"{'mode':<6}{'requests':>10}{'errors':>8}{'req/s':>9}"
+        f"{'slow p50':>10}{'slow p95':>10}{'fast p50':>10}{'fast p95':>10}  (ms)"
+    )
+    for mode in ("wsgi", "asgi"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.asgi_concurrency", "--mode", mode, *shared_args, *run_args],
+            cwd=BASE_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{result['mode']:<6}"
+            f"{result['requests']:>10}"
+            f"{result['errors']:>8}"
+            f"{result['requests_per_second']:>9.1f}"
+            f"{format_ms(result['slow_p50_ms']):>10}"
+            f"{format_ms(result['slow_p95_ms']):>10}"
+            f"{format_ms(result['fast_p50_ms']):>10}"
+            f"{format_ms(result['fast_p95_ms']):>10}"
+        )
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+if __name__ == "__main__":
+    main()
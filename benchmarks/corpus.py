@@ -0,0 +1,193 @@
+"""
+Deterministic generator of synthetic Japanese/English corpora for benchmarks.
+
+Generates glossaries (short terms, some with notes) and translations
+(sentences) from a fixed vocabulary, so that the same seed always gives the
+same corpus. A corpus can be loaded into the database (populate()) or
+written as the files accepted by the upload views: TSV for glossaries, and
+TMX or DOCX for translations.
+
+Usage:
+    python -m benchmarks.corpus OUTPUT_DIR [--items 10000] [--glossary-ratio 0.3] [--seed 0]
+
+Writes glossary.tsv, translation.tmx and translation.docx to OUTPUT_DIR.
+DOCX files are built in memory by python-docx, so --docx-items limits their size.
+"""
+
+import argparse
+import os
+import random
+from xml.sax.saxutils import escape
+
+# (Japanese, English) pairs used to build terms and sentences.
+VOCABULARY = [
+    ("契約", "contract"), ("特許", "patent"), ("請求項", "claim"), ("発明", "invention"),
+    ("実施形態", "embodiment"), ("装置", "device"), ("方法", "method"), ("基板", "substrate"),
+    ("半導体", "semiconductor"), ("電極", "electrode"), ("回路", "circuit"), ("信号", "signal"),
+    ("制御部", "control unit"), ("記憶部", "storage unit"), ("画像", "image"), ("データ", "data"),
+    ("利用者", "user"), ("端末", "terminal"), ("サーバ", "server"), ("ネットワーク", "network"),
+    ("当事者", "party"), ("期間", "term"), ("義務", "obligation"), ("権利", "right"),
+    ("責任", "liability"), ("損害", "damages"), ("通知", "notice"), ("条項", "clause"),
+    ("秘密情報", "confidential information"), ("対価", "consideration"), ("解除", "termination"),
+    ("保証", "warranty"), ("品質", "quality"), ("検査", "inspection"), ("納品", "delivery"),
+    ("仕様書", "specification"), ("報告書", "report"), ("売上高", "net sales"),
+    ("営業利益", "operating income"), ("株主", "shareholder"), ("取締役会", "board of directors"),
+    ("年度", "fiscal year"), ("見通し", "outlook"), ("温度", "temperature"), ("圧力", "pressure"),
+    ("濃度", "concentration"), ("試料", "sample"), ("測定", "measurement"), ("結果", "result"),
+]
+
+# (Japanese, English) sentence patterns, filled with three vocabulary pairs.
+SENTENCES = [
+    ("{0}の{1}は、{2}に基づいて決定される。", "The {1} of the {0} is determined based on the {2}."),
+    ("{0}は、{1}及び{2}を備える。", "The {0} includes the {1} and the {2}."),
+    ("本{0}において、{1}は{2}に接続されている。", "In this {0}, the {1} is connected to the {2}."),
+    ("{0}は、{1}に関する{2}を速やかに提出しなければならない。",
+     "The {0} shall promptly submit the {2} regarding the {1}."),
+    ("{0}の{1}により、{2}が向上した。", "The {2} improved due to the {1} of the {0}."),
+    ("{0}から受信した{1}を{2}に記憶する。", "The {1} received from the {0} is stored in the {2}."),
+]
+
+NOTES = ["業界標準の訳語", "クライアント指定", "Use lower case.", "旧訳：{0}", "See also: {0}"]
+
+
+def generate_rows(count, resource_type, seed=0):
+    """
+    Generator of (source, target, notes) tuples for a resource of the given
+    type ("GLOSSARY" or "TRANSLATION"). The same arguments always give the
+    same rows.
+    """
+
+    rng = random.Random(f"{resource_type}:{seed}")
+    for number in range(count):
+        if resource_type == "GLOSSARY":
+            first, second = rng.sample(VOCABULARY, 2)
+            source = f"{first[0]}{second[0]}"
+            target = f"{first[1]} {second[1]}"
+            # Numbered every so often so that terms are not all duplicates.
+            if number % 3 == 0:
+                source += str(number)
+                target += f" {number}"
+            notes = rng.choice(NOTES).format(first[1]) if rng.random() < 0.1 else ""
+        else:
+            sentence = rng.choice(SENTENCES)
+            words = rng.sample(VOCABULARY, 3)
+            source = sentence[0].format(*(word[0] for word in words))
+            target = sentence[1].format(*(word[1] for word in words))
+            notes = ""
+        yield source, target, notes
+
+
+def populate(items, glossary_ratio=0.3, items_per_resource=10000, seed=0, batch_size=5000):
+    """
+    Adds a corpus of about the given number of items to the database, split
+    into glossaries and translations of items_per_resource items each.
+    Returns the list of created Resource objects.
+    """
+
+    from django.db import transaction
+
+    from archive.models import Item, Resource
+
+    glossary_items = int(items * glossary_ratio)
+    resources = []
+
+    for resource_type, total in (("GLOSSARY", glossary_items), ("TRANSLATION", items - glossary_items)):
+        rows = generate_rows(total, resource_type, seed)
+        for number, start in enumerate(range(0, total, items_per_resource), start=1):
+            size = min(items_per_resource, total - start)
+            resource = Resource.objects.create(
+                resource_type=resource_type,
+                title=f"{'用語集' if resource_type == 'GLOSSARY' else '翻訳'} {number}",
+                client=f"Client {number % 5}",
+            )
+            for batch_start in range(0, size, batch_size):
+                with transaction.atomic():
+                    Item.objects.bulk_create(
+                        Item(resource=resource, source=source, target=target, notes=notes)
+                        for source, target, notes in (
+                            next(rows) for _ in range(min(batch_size, size - batch_start))
+                        )
+                    )
+            resources.append(resource)
+
+    Resource.objects.recount_items()
+    return resources
+
+
+def write_tsv(path, rows):
+    """Writes rows in the format accepted by the glossary upload form."""
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for source, target, notes in rows:
+            f.write("\t".join([source, target, notes] if notes else [source, target]) + "\n")
+
+
+def write_tmx(path, rows, source_language="ja", target_language="en"):
+    """Writes rows as a TMX file (one translation unit per row)."""
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n')
+        f.write(
+            '<header creationtool="honyaku_archive benchmarks" creationtoolversion="1" '
+            f'segtype="sentence" o-tmf="none" adminlang="en" srclang="{source_language}" '
+            'datatype="plaintext"/>\n<body>\n'
+        )
+        for source, target, notes in rows:
+            f.write(
+                f'<tu><tuv xml:lang="{source_language}"><seg>{escape(source)}</seg></tuv>'
+                f'<tuv xml:lang="{target_language}"><seg>{escape(target)}</seg></tuv></tu>\n'
+            )
+        f.write("</body>\n</tmx>\n")
+
+
+def write_docx(path, rows):
+    """Writes rows as a DOCX file containing one two-column table."""
+
+    from docx import Document
+
+    document = Document()
+    table = document.add_table(rows=0, cols=2)
+    for source, target, notes in rows:
+        cells = table.add_row().cells
+        cells[0].text = source
+        cells[1].text = target
+    document.save(path)
+
+
+def write_files(directory, items, glossary_ratio=0.3, seed=0, docx_items=20000):
+    """
+    Writes glossary.tsv, translation.tmx and translation.docx to directory.
+    Returns a dict of the paths written.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    glossary_items = int(items * glossary_ratio)
+    translation_items = items - glossary_items
+
+    paths = {
+        "tsv": os.path.join(directory, "glossary.tsv"),
+        "tmx": os.path.join(directory, "translation.tmx"),
+        "docx": os.path.join(directory, "translation.docx"),
+    }
+    write_tsv(paths["tsv"], generate_rows(glossary_items, "GLOSSARY", seed))
+    write_tmx(paths["tmx"], generate_rows(translation_items, "TRANSLATION", seed))
+    write_docx(paths["docx"], generate_rows(min(translation_items, docx_items), "TRANSLATION", seed))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", help="Folder the files are written to.")
+    parser.add_argument("--items", type=int, default=10000, help="Total number of items (rows).")
+    parser.add_argument("--glossary-ratio", type=float, default=0.3, help="Proportion of glossary items.")
+    parser.add_argument("--docx-items", type=int, default=20000, help="Maximum number of rows in the DOCX file.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_files(args.output_dir, args.items, args.glossary_ratio, args.seed, args.docx_items)
+    for path in paths.values():
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
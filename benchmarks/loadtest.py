@@ -0,0 +1,415 @@
+"""
+Load test of a running server with a mix of translator traffic.
+
+Virtual users log in and, until --duration has passed, repeatedly pick an
+action from the traffic mix (--mix, as percentages):
+
+    search      burst of 2 to 6 searches, each in a random scope (all
+                resources, all glossaries, all translations or one resource)
+                for a word of the benchmark vocabulary
+    detail      resource detail page, then 1 to 3 more pages of its content
+                table (as loaded by HTMX when scrolling)
+    export      export of 1 to 3 resources
+
+Meanwhile, --uploads TMX files of --upload-items rows are uploaded
+concurrently, and the resources they create are deleted at the end (unless
+--keep-uploads is given). Instead of the synthetic mix, the GET requests of
+a recorded access log (e.g. the output of runserver) can be replayed with
+--replay.
+
+Throughput, error rate and p50/p95/p99 latency are reported for each
+endpoint. This writes to the database of the server (uploads), so only run
+it against a local or staging server.
+
+Usage:
+    python -m benchmarks.loadtest --username USER --password PASSWORD
+                                  [--url http://127.0.0.1:8000] [--users 8] [--duration 60]
+                                  [--mix search=60,detail=30,export=10] [--think 0.5]
+                                  [--uploads 1] [--upload-items 20000] [--keep-uploads]
+                                  [--replay ACCESS_LOG] [--output results.json]
+"""
+
+import argparse
+import html
+import http.cookiejar
+import json
+import math
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from benchmarks.corpus import VOCABULARY, generate_rows, write_tmx
+
+SEARCH_SCOPES = {
+    "all": "すべてのリソース",
+    "glossaries": "すべての用語集",
+    "translations": "すべての翻訳",
+}
+
+DEFAULT_MIX = "search=60,detail=30,export=10"
+
+# Paths of resource pages and links found in their HTML.
+RESOURCE_LINK = re.compile(r'<a href="/resource/(\d+)/">([^<]*)</a>')
+CONTENT_LINK = re.compile(r'content/\?after=(\d+)&(?:amp;)?offset=(\d+)')
+
+# Request line of an access log entry (runserver, nginx, Apache, gunicorn).
+LOG_REQUEST = re.compile(r'"?(GET) (/\S*) HTTP/[\d.]+"?')
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Redirects are returned as they are (e.g. to check that a form was accepted)."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """HTTP client with its own cookies, like one browser."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect()
+        )
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, method, path, data=None, files=None):
+        """
+        Sends a request and reads the whole response.
+        Returns (status, headers, body), with a status of 0 if no response was
+        received.
+        """
+
+        headers = {"Accept-Encoding": "identity"}
+        body = None
+        if method == "POST":
+            headers["X-CSRFToken"] = self.csrf_token()
+            headers["Referer"] = self.base_url + path
+            if files:
+                body, headers["Content-Type"] = encode_multipart(data or {}, files)
+            else:
+                body = urlencode(data or {}, doseq=True).encode()
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with self.opener.open(request, timeout=300) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+        except OSError:
+            return 0, {}, b""
+
+    def login(self, username, password):
+        self.request("GET", "/accounts/login/")
+        status, headers, _ = self.request(
+            "POST",
+            "/accounts/login/",
+            {"username": username, "password": password, "csrfmiddlewaretoken": self.csrf_token()},
+        )
+        if status != 302:
+            sys.exit(f"Login failed (status {status}). Check --url, --username and --password.")
+
+
+def encode_multipart(data, files):
+    """Returns the body and content type of a multipart/form-data request."""
+
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in data.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content) in files.items():
+        parts.append(
+            (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode()
+            + content
+            + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class Results:
+    """Requests made by all the virtual users, as (endpoint, succeeded, seconds)."""
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def timed_request(self, session, endpoint, method, path, data=None, files=None, expected=200):
+        started = time.perf_counter()
+        status, headers, body = session.request(method, path, data, files)
+        with self.lock:
+            self.requests.append((endpoint, status == expected, time.perf_counter() - started))
+        return status, headers, body
+
+
+def endpoint_name(path):
+    """Returns the endpoint that a path is reported under (used for replayed requests)."""
+
+    parts = urlsplit(path)
+    if parts.path == "/search/":
+        resource = parse_qs(parts.query).get("resource", [""])[0]
+        scopes = {value: name for name, value in SEARCH_SCOPES.items()}
+        return f"search:{scopes.get(resource, 'resource')}"
+    for pattern, name in (
+        (r"/resource/\d+/", "resource_detail"),
+        (r"/resource/\d+/content/", "resource_content"),
+        (r"/", "home"),
+        (r"/home_table_sort/.*", "home_table_sort"),
+    ):
+        if re.fullmatch(pattern, parts.path):
+            return name
+    return parts.path
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)]
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ("search", "detail", "export"):
+            raise argparse.ArgumentTypeError(f"Unknown action: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def discover_resources(session):
+    """Returns (id, title) of the resources listed in the homepage table."""
+
+    resources = []
+    page = 1
+    while True:
+        status, _, body = session.request("GET", f"/home_table_sort/title/asc/?page={page}")
+        found = [(int(pk), html.unescape(title)) for pk, title in RESOURCE_LINK.findall(body.decode())]
+        if status != 200 or not found or page > 100:
+            return resources
+        resources += found
+        page += 1
+
+
+class VirtualUser:
+
+    def __init__(self, args, results, resources, replay, seed):
+        self.args = args
+        self.results = results
+        self.resources = resources
+        self.replay = replay
+        self.rng = random.Random(seed)
+        self.session = Session(args.url)
+
+    def run(self, deadline):
+        self.session.login(self.args.username, self.args.password)
+        actions = list(self.args.mix)
+        weights = [self.args.mix[action] for action in actions]
+        while time.monotonic() < deadline:
+            if self.replay:
+                self.replay_next()
+            else:
+                getattr(self, self.rng.choices(actions, weights)[0])()
+            if self.args.think:
+                time.sleep(self.rng.expovariate(1 / self.args.think))
+
+    def replay_next(self):
+        with self.replay["lock"]:
+            path = self.replay["paths"][self.replay["next"] % len(self.replay["paths"])]
+            self.replay["next"] += 1
+        self.results.timed_request(self.session, endpoint_name(path), "GET", path)
+
+    def search(self):
+        for _ in range(self.rng.randint(2, 6)):
+            scope = self.rng.choice(list(SEARCH_SCOPES) + ["resource"])
+            resource = SEARCH_SCOPES.get(scope) or self.rng.choice(self.resources)[1]
+            query = self.rng.choice(self.rng.choice(VOCABULARY))
+            path = "/search/?" + urlencode({"query": query, "resource": resource})
+            self.results.timed_request(self.session, f"search:{scope}", "GET", path)
+
+    def detail(self):
+        pk, _ = self.rng.choice(self.resources)
+        status, _, body = self.results.timed_request(self.session, "resource_detail", "GET", f"/resource/{pk}/")
+        for _ in range(self.rng.randint(1, 3)):
+            next_page = CONTENT_LINK.search(body.decode())
+            if status != 200 or not next_page:
+                return
+            after, offset = next_page.groups()
+            status, _, body = self.results.timed_request(
+                self.session, "resource_content", "GET", f"/resource/{pk}/content/?after={after}&offset={offset}"
+            )
+
+    def export(self):
+        resources = self.rng.sample(self.resources, min(self.rng.randint(1, 3), len(self.resources)))
+        self.results.timed_request(
+            self.session, "export", "POST", "/resource/export/", {"resources": [pk for pk, _ in resources]}
+        )
+
+
+def upload(args, results, path, number, uploaded):
+    """Uploads a TMX file, and remembers the id of the resource created."""
+
+    session = Session(args.url)
+    session.login(args.username, args.password)
+    session.request("GET", "/translation/upload/")
+    with open(path, "rb") as f:
+        content = f.read()
+    data = {"title": f"Load test {uuid.uuid4().hex[:8]} {number}", "notes": "Uploaded by benchmarks.loadtest."}
+    status, headers, _ = results.timed_request(
+        session,
+        "upload:tmx",
+        "POST",
+        "/translation/upload/",
+        data,
+        {"upload_file": ("loadtest.tmx", content)},
+        expected=302,
+    )
+    match = re.search(r"/resource/(\d+)/", headers.get("Location", "") if status == 302 else "")
+    if match:
+        uploaded.append((session, int(match.group(1))))
+
+
+def run(args):
+    results = Results()
+    session = Session(args.url)
+    session.login(args.username, args.password)
+    resources = discover_resources(session)
+    if not resources and not args.replay:
+        sys.exit("No resources found on the homepage. Add some first (e.g. with benchmarks.corpus).")
+
+    replay = None
+    if args.replay:
+        with open(args.replay, encoding="utf-8", errors="replace") as f:
+            paths = [match.group(2) for match in map(LOG_REQUEST.search, f) if match]
+        if not paths:
+            sys.exit(f"No GET requests found in {args.replay}.")
+        replay = {"paths": paths, "next": 0, "lock": threading.Lock()}
+
+    workdir = tempfile.mkdtemp()
+    tmx_path = os.path.join(workdir, "loadtest.tmx")
+    if args.uploads:
+        write_tmx(tmx_path, generate_rows(args.upload_items, "TRANSLATION", seed=args.seed))
+
+    print(
+        f"{args.users} users for {args.duration} s against {args.url} "
+        f"({len(resources)} resources, {args.uploads} uploads of {args.upload_items} rows)"
+    )
+    started = time.monotonic()
+    deadline = started + args.duration
+    users = [VirtualUser(args, results, resources, replay, args.seed + number) for number in range(args.users)]
+    uploaded = []
+    threads = [threading.Thread(target=user.run, args=(deadline,)) for user in users]
+    threads += [
+        threading.Thread(target=upload, args=(args, results, tmx_path, number, uploaded))
+        for number in range(args.uploads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    if not args.keep_uploads:
+        for upload_session, pk in uploaded:
+            upload_session.request("GET", f"/resource/{pk}/delete/")
+            upload_session.request("POST", f"/resource/{pk}/delete/", {})
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return summarize(results.requests, elapsed)
+
+
+def summarize(requests, elapsed):
+    """Returns the throughput, error rate and latencies of each endpoint, and of all requests."""
+
+    endpoints = sorted({endpoint for endpoint, _, _ in requests})
+    summary = {}
+    for endpoint in endpoints + ["total"]:
+        selected = [r for r in requests if endpoint in ("total", r[0])]
+        latencies = sorted(seconds * 1000 for _, _, seconds in selected)
+        errors = sum(not ok for _, ok, _ in selected)
+        summary[endpoint] = {
+            "requests": len(selected),
+            "errors": errors,
+            "error_rate": errors / len(selected) if selected else 0,
+            "requests_per_second": len(selected) / elapsed,
+            "mean_ms": statistics.mean(latencies) if latencies else None,
+            "p50_ms": percentile(latencies, 50) if latencies else None,
+            "p95_ms": percentile(latencies, 95) if latencies else None,
+            "p99_ms": percentile(latencies, 99) if latencies else None,
+        }
+    return {"elapsed_seconds": elapsed, "endpoints": summary}
+
+
+def print_summary(summary):
+    print(
+        f"{'endpoint':<22}{'requests':>9}{'errors':>8}{'err %':>7}{'req/s':>8}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"
+    )
+    for endpoint, result in summary["endpoints"].items():
+        print(
+            f"{endpoint:<22}"
+            f"{result['requests']:>9}"
+            f"{result['errors']:>8}"
+            f"{result['error_rate'] * 100:>7.1f}"
+            f"{result['requests_per_second']:>8.1f}"
+            f"{format_ms(result['p50_ms']):>9}"
+            f"{format_ms(result['p95_ms']):>9}"
+            f"{format_ms(result['p99_ms']):>9}"
+        )
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL of the running server.")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--users", type=int, default=8, help="Number of concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=60, help="Length of the test in seconds.")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=DEFAULT_MIX, help=f"Traffic mix in percent (default: {DEFAULT_MIX})."
+    )
+    parser.add_argument("--think", type=float, default=0.5, help="Mean pause between actions in seconds.")
+    parser.add_argument("--uploads", type=int, default=1, help="Number of concurrent TMX uploads.")
+    parser.add_argument("--upload-items", type=int, default=20000, help="Number of rows in each TMX upload.")
+    parser.add_argument("--keep-uploads", action="store_true", help="Do not delete the uploaded resources.")
+    parser.add_argument("--replay", help="Access log whose GET requests are replayed instead of the mix.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file the results are written to.")
+    args = parser.parse_args()
+
+    summary = run(args)
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark of searches run while a large import is writing to the database.
+
+Runs the same workload twice, with the SQLite performance profile disabled
+and enabled (see SQLITE_PERFORMANCE_PROFILE in config/settings.py):
+one thread imports items in batches, each batch in its own transaction (as
+the upload views do), while several threads run searches at the same time.
+Each run uses a new temporary database, so db.sqlite3 is not touched.
+
+Usage:
+    python -m benchmarks.sqlite_concurrency [--items 200000] [--batch-size 5000] [--searchers 4]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(database_path):
+    sys.path.insert(0, BASE_DIR)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("DEBUG", "False")
+    os.environ.setdefault("ALLOWED_HOSTS", "localhost")
+
+    import django
+
+    django.setup()
+
+
+def run(profile, items, batch_size, searchers):
+    """
+    Runs the workload once and returns a dict of results.
+    """
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection, connections, transaction
+    from django.db.utils import OperationalError
+
+    from archive.models import Item, Resource
+    from archive.search import item_query_filter
+
+    settings.SQLITE_PERFORMANCE_PROFILE = profile
+    settings.DATABASES["default"]["NAME"] = os.path.join(
+        tempfile.mkdtemp(), "benchmark.sqlite3"
+    )
+    connections.close_all()
+    connections["default"].settings_dict["NAME"] = settings.DATABASES["default"]["NAME"]
+
+    call_command("migrate", verbosity=0)
+    resource = Resource.objects.create(resource_type="TRANSLATION", title="Benchmark")
+    # Some existing content for the searches to find.
+    Item.objects.bulk_create(
+        [Item(resource=resource, source=f"既存の原文{i}", target=f"Existing {i}") for i in range(batch_size)]
+    )
+    connection.close()
+
+    importing = threading.Event()
+    importing.set()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def importer():
+        try:
+            for start in range(0, items, batch_size):
+                with transaction.atomic():
+                    Item.objects.bulk_create(
+                        [
+                            Item(resource=resource, source=f"原文{i}", target=f"Target text {i}")
+                            for i in range(start, min(start + batch_size, items))
+                        ]
+                    )
+        finally:
+            importing.clear()
+            connection.close()
+
+    def searcher(number):
+        try:
+            while importing.is_set():
+                query = f"Existing {number}"
+                started = time.perf_counter()
+                try:
+                    list(Item.objects.filter(item_query_filter(query))[:50])
+                except OperationalError as error:
+                    with lock:
+                        errors.append(str(error))
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=importer)]
+    threads += [threading.Thread(target=searcher, args=(n,)) for n in range(searchers)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "profile": "enabled" if profile else "disabled",
+        "import_seconds": elapsed,
+        "searches": len(latencies),
+        "errors": len(errors),
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None,
+        "max_ms": latencies[-1] * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200000, help="Number of items imported.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Items per import transaction.")
+    parser.add_argument("--searchers", type=int, default=4, help="Number of searching threads.")
+    args = parser.parse_args()
+
+    setup_django(os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3"))
+
+    print(f"{'profile':<10}{'import (s)':>12}{'searches':>10}{'errors':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}")
+    for profile in (False, True):
+        result = run(profile, args.items, args.batch_size, args.searchers)
+        print(
+            f"{result['profile']:<10}"
+            f"{result['import_seconds']:>12.2f}"
+            f"{result['searches']:>10}"
+            f"{result['errors']:>8}"
+            f"{format_ms(result['p50_ms']):>10}"
+            f"{format_ms(result['p95_ms']):>10}"
+            f"{format_ms(result['max_ms']):>10}"
+        )
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+if __name__ == "__main__":
+    main()
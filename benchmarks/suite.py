@@ -0,0 +1,286 @@
+"""
+Benchmark suite of the main operations of the archive.
+
+Loads a synthetic corpus (see benchmarks/corpus.py) into a new temporary
+database, then times each benchmark --repeat times:
+
+    search_all, search_glossaries,   SearchView at each scope of the navbar
+    search_translations,             search form (all resources, all
+    search_resource                  glossaries, all translations, one resource)
+    highlight_query                  highlight_query filter on 10,000 texts
+    tmx_parser, docx_parser          parsing of uploaded translation files
+    build_entries                    parsing and saving of an uploaded glossary
+    resource_detail                  rendering of a resource detail page
+    homepage                         rendering of the homepage
+
+The cache is cleared before each repetition. Results are written as JSON, so
+that runs can be compared with --compare.
+
+Usage:
+    python -m benchmarks.suite [--items 10000] [--repeat 5] [--only search_all,homepage]
+                               [--output results.json]
+    python -m benchmarks.suite --compare OLD.json NEW.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+
+
+def setup_django(database_path):
+    sys.path.insert(0, BASE_DIR)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["CACHE_URL"] = "locmem://"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("DEBUG", "False")
+    os.environ["ALLOWED_HOSTS"] = "testserver"
+
+    import django
+
+    django.setup()
+
+
+class Suite:
+    """
+    Holds the data shared by the benchmarks. Each benchmark is a method
+    named bench_<name>, returning the function to be timed (and optionally
+    a setup function run before each repetition, without being timed).
+    """
+
+    def __init__(self, args, workdir):
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        from django.test import Client, RequestFactory
+
+        from benchmarks.corpus import populate, write_files
+
+        self.args = args
+        self.workdir = workdir
+        settings.MEDIA_ROOT = workdir
+
+        call_command("migrate", verbosity=0)
+        self.user = get_user_model().objects.create_user(username="benchmark", password="benchmark")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.request = RequestFactory().post("/")
+        self.request.user = self.user
+
+        self.resources = populate(args.items, args.glossary_ratio, seed=args.seed)
+        self.files = write_files(
+            os.path.join(workdir, "files"), min(args.items, args.file_items), seed=args.seed
+        )
+
+    def get(self, url, data=None):
+        def request():
+            response = self.client.get(url, data)
+            assert response.status_code == 200, response.status_code
+
+        return request
+
+    def search(self, resource):
+        return self.get("/search/", {"query": self.args.query, "resource": resource})
+
+    def bench_search_all(self):
+        return self.search("すべてのリソース")
+
+    def bench_search_glossaries(self):
+        return self.search("すべての用語集")
+
+    def bench_search_translations(self):
+        return self.search("すべての翻訳")
+
+    def bench_search_resource(self):
+        return self.search(self.resources[-1].title)
+
+    def bench_highlight_query(self):
+        from archive.models import Item
+        from archive.templatetags.archive_tags import highlight_query
+
+        texts = list(Item.objects.order_by("id").values_list("target", flat=True)[:10000])
+
+        def highlight():
+            for text in texts:
+                highlight_query(text, self.args.query)
+
+        return highlight
+
+    def upload(self, file_type, resource_type):
+        """Returns an unsaved Resource object with a copy of the corpus file as its upload file."""
+
+        from archive.models import Resource
+
+        name = f"upload.{file_type}"
+        shutil.copyfile(self.files[file_type], os.path.join(self.workdir, name))
+        resource = Resource(resource_type=resource_type, title=f"Upload {file_type}")
+        resource.upload_file.name = name
+        return resource
+
+    def bench_tmx_parser(self):
+        from archive.views.translation_upload_view import tmx_parser
+
+        resource = self.upload("tmx", "TRANSLATION")
+        return lambda: tmx_parser(resource)
+
+    def bench_docx_parser(self):
+        from archive.views.translation_upload_view import docx_parser
+
+        resource = self.upload("docx", "TRANSLATION")
+        return lambda: docx_parser(self.request, resource)
+
+    def bench_build_entries(self):
+        from archive.views.glossary_upload_view import build_entries
+
+        uploads = []
+
+        def setup():
+            # build_entries() saves the items and deletes the uploaded file.
+            for resource in uploads:
+                resource.delete()
+            uploads.clear()
+            resource = self.upload("tsv", "GLOSSARY")
+            resource.save()
+            uploads.append(resource)
+
+        return lambda: build_entries(uploads[0], self.request), setup
+
+    def bench_resource_detail(self):
+        return self.get(self.resources[-1].get_absolute_url())
+
+    def bench_homepage(self):
+        return self.get("/")
+
+
+BENCHMARKS = [name[len("bench_"):] for name in vars(Suite) if name.startswith("bench_")]
+
+
+def measure(func, setup, repeat):
+    """Returns the timings of func in milliseconds."""
+
+    from django.core.cache import cache
+
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def run(args):
+    workdir = tempfile.mkdtemp()
+    setup_django(os.path.join(workdir, "benchmark.sqlite3"))
+
+    import django
+
+    started = time.perf_counter()
+    suite = Suite(args, workdir)
+    print(f"Corpus of {args.items} items loaded in {time.perf_counter() - started:.1f} s.")
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        benchmark = getattr(suite, f"bench_{name}")()
+        func, setup = benchmark if isinstance(benchmark, tuple) else (benchmark, None)
+        timings = measure(func, setup, args.repeat)
+        results[name] = {
+            "repeat": args.repeat,
+            "min_ms": min(timings),
+            "median_ms": statistics.median(timings),
+            "mean_ms": statistics.mean(timings),
+            "max_ms": max(timings),
+        }
+        print(f"{name:<22}{results[name]['median_ms']:>12.1f} ms (median)")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "created_on": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "platform": platform.platform(),
+        },
+        "parameters": {
+            "items": args.items,
+            "glossary_ratio": args.glossary_ratio,
+            "file_items": args.file_items,
+            "query": args.query,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(old_path, new_path):
+    """Prints the change in median time of each benchmark between two result files."""
+
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    if old["parameters"] != new["parameters"]:
+        print("Warning: the results were produced with different parameters.")
+
+    print(f"{'benchmark':<22}{'old (ms)':>12}{'new (ms)':>12}{'change':>10}")
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+        old_median = old["results"][name]["median_ms"]
+        new_median = result["median_ms"]
+        change = (new_median - old_median) / old_median * 100 if old_median else 0
+        print(f"{name:<22}{old_median:>12.1f}{new_median:>12.1f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000, help="Number of items in the corpus.")
+    parser.add_argument("--glossary-ratio", type=float, default=0.3, help="Proportion of glossary items.")
+    parser.add_argument("--file-items", type=int, default=10000, help="Number of rows in the uploaded files.")
+    parser.add_argument("--query", default="signal", help="Query used by the search benchmarks.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times each benchmark is run.")
+    parser.add_argument(
+        "--only",
+        type=lambda value: value.split(","),
+        help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)}).",
+    )
+    parser.add_argument("--output", help="JSON file the results are written to.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files.")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    unknown = set(args.only or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+
+    results = run(args)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,22 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving the project through this module enables the async versions of the
+search, resource content and export views (see ASYNC_VIEWS in settings.py).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ.setdefault("ASYNC_VIEWS", "True")
+
+django.setup(set_prefix=False)
+
+from archive.asgi import ArchiveASGIHandler  # noqa: E402
 
-application = get_asgi_application()
+application = ArchiveASGIHandler()
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     "whitenoise.runserver_nostatic",
     "django.contrib.staticfiles",
     "django.contrib.humanize",
+    "django.forms",
     # Third party
     "crispy_forms",
     "crispy_bootstrap5",
@@ -43,21 +44,35 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "archive.middleware.TimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "archive.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "archive.middleware.StaticFilesMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "archive.profiling.ProfilingMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "archive.routers.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
 
+# Whether the time spent in each request, in SQL queries and in template
+# rendering is sent in a Server-Timing header (see archive/timing.py).
+SERVER_TIMING = env.bool("SERVER_TIMING", default=DEBUG)
+
+# Whether the search, resource content and export views are replaced by their
+# async versions (see archive/asgi.py). Enabled by config.asgi, since the async
+# export can only be sent by an ASGI server.
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, also recording the time spent rendering templates.
+        "BACKEND": "archive.timing.TimedDjangoTemplates",
         "DIRS": [str(BASE_DIR.joinpath("templates"))],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -74,12 +89,109 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Form widgets are rendered with the project templates (used by the
+# autocomplete widget in templates/widgets/).
+FORM_RENDERER = "django.forms.renderers.TemplatesSetting"
+
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
 DATABASES = {"default": env.dj_db_url("DATABASE_URL", default="sqlite:///db.sqlite3")}
 
+# SQLite performance profile.
+# When enabled, the pragmas below are applied to each new SQLite connection
+# (see archive/db.py), and connections are kept open between requests.
+# WAL mode lets searches read the database while an upload is writing to it.
+SQLITE_PERFORMANCE_PROFILE = env.bool("SQLITE_PERFORMANCE_PROFILE", default=False)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # Negative values are in KiB (64 MB).
+    "mmap_size": 268435456,  # 256 MB.
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # Milliseconds.
+}
+
+if SQLITE_PERFORMANCE_PROFILE and DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=600)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Optional read replica.
+# When REPLICA_DATABASE_URL is set, searches, exports, resource detail pages and
+# the homepage read from this database (see archive/routers.py). Writes always
+# go to the default database. For local testing, a read-only connection to a
+# copy of the SQLite file can be used (e.g. sqlite:///replica.sqlite3).
+REPLICA_DATABASE_URL = env.str("REPLICA_DATABASE_URL", default="")
+REPLICA_DATABASE = None
+
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = env.dj_db_url("REPLICA_DATABASE_URL")
+    if DATABASES["replica"]["ENGINE"] == "django.db.backends.sqlite3":
+        DATABASES["replica"]["NAME"] = f"file:{DATABASES['replica']['NAME']}?mode=ro"
+        DATABASES["replica"]["OPTIONS"] = {"uri": True}
+    # Tests use the default database in place of the replica.
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASE = "replica"
+
+DATABASE_ROUTERS = ["archive.routers.ReplicaRouter"]
+
+# Number of seconds after a request that may have written to the database
+# during which the same user only reads from the default database.
+READ_PRIMARY_SECONDS = env.int("READ_PRIMARY_SECONDS", default=10)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+# Set CACHE_URL to use another backend, e.g. redis://127.0.0.1:6379/0 (needs the
+# redis package) or locmem:// (one cache per process). The default file-based
+# cache is shared by all worker processes on the same machine, so that
+# invalidations made by one process are seen by the others (see archive/cache.py).
+CACHES = {"default": env.dj_cache_url("CACHE_URL", default=f"file://{BASE_DIR / 'cache'}")}
+
+# Tests use a local-memory cache instead (see config/test_runner.py).
+TEST_RUNNER = "config.test_runner.TestRunner"
+
+# Prefix of the keys written by archive/cache.py. Change it to make every value
+# cached by the archive app stale at once (e.g. when the format of a cached value
+# changes between releases).
+ARCHIVE_CACHE_VERSION = env.int("ARCHIVE_CACHE_VERSION", default=1)
+
+
+# Metrics
+# Served in the Prometheus text format at /metrics (see archive/metrics.py), to
+# staff users and to requests with an "Authorization: Bearer <METRICS_TOKEN>"
+# header (e.g. from Prometheus).
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")
+
+# Folder where each worker process writes its metrics every
+# METRICS_FLUSH_INTERVAL seconds, so that /metrics includes all the processes
+# of the server. Without it, /metrics only shows the process serving it.
+METRICS_DIR = env.str("METRICS_DIR", default="")
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=1.0)
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.1/topics/logging/
+
+# Set TIMING_LOG_LEVEL to INFO to log the timings of each request as a JSON
+# line (see archive/timing.py).
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "archive.timing": {
+            "handlers": ["console"],
+            "level": env.str("TIMING_LOG_LEVEL", default="WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -145,3 +257,44 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
+
+
+# Archive settings
+
+# Number of items displayed at a time in the content table of the resource
+# detail page. The next page is loaded when the bottom of the table is reached.
+RESOURCE_CONTENT_PAGE_SIZE = env.int("RESOURCE_CONTENT_PAGE_SIZE", default=100)
+
+# Number of resources displayed at a time in the table on the homepage.
+HOME_TABLE_PAGE_SIZE = env.int("HOME_TABLE_PAGE_SIZE", default=50)
+
+# Source and target texts longer than SEARCH_SNIPPET_MIN_LENGTH characters are
+# shown in the search results as snippets of SEARCH_SNIPPET_WIDTH characters
+# either side of each occurrence of the query. The full text is loaded when
+# the snippets are clicked. Set SEARCH_SNIPPET_WIDTH to 0 to show every text in full.
+SEARCH_SNIPPET_WIDTH = env.int("SEARCH_SNIPPET_WIDTH", default=60)
+SEARCH_SNIPPET_MIN_LENGTH = env.int("SEARCH_SNIPPET_MIN_LENGTH", default=300)
+
+# Documents are pre-translated (see archive/pretranslation.py) by comparing
+# their segments with the translations in this many processes, and fuzzy
+# matches must have at least PRETRANSLATE_FUZZY_THRESHOLD percent similarity
+# (the default of the pre-translation form).
+PRETRANSLATE_WORKERS = env.int("PRETRANSLATE_WORKERS", default=min(os.cpu_count() or 1, 4))
+PRETRANSLATE_FUZZY_THRESHOLD = env.int("PRETRANSLATE_FUZZY_THRESHOLD", default=75)
+
+# Number of entries displayed at a time in the results of a glossary check.
+# The next page is loaded when the bottom of the table is reached.
+GLOSSARY_CHECK_PAGE_SIZE = env.int("GLOSSARY_CHECK_PAGE_SIZE", default=100)
+
+# Number of seconds after which a glossary check that has not finished is
+# marked as failed (e.g. if the server was restarted while it was running).
+GLOSSARY_CHECK_TIMEOUT = env.int("GLOSSARY_CHECK_TIMEOUT", default=3600)
+
+# Maximum number of resources displayed below autocomplete fields.
+AUTOCOMPLETE_RESULTS = env.int("AUTOCOMPLETE_RESULTS", default=20)
+
+# Resources are deleted by deleting this many items at a time (see
+# archive/deletion.py). If DELETE_RESOURCES_IN_BACKGROUND is set, this is done
+# in a background thread after the resource has been hidden.
+DELETE_BATCH_SIZE = env.int("DELETE_BATCH_SIZE", default=5000)
+DELETE_RESOURCES_IN_BACKGROUND = env.bool("DELETE_RESOURCES_IN_BACKGROUND", default=False)
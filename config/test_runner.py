@@ -0,0 +1,21 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the tests with a local-memory cache in place of CACHES, so that the
+    tests neither clear nor read the cache of a development server run from
+    the same folder (the default file-based cache is in BASE_DIR / "cache").
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_override = override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        )
+        self.cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_override.disable()
+        super().teardown_test_environment(**kwargs)
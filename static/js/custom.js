@@ -41,3 +41,56 @@ function searchText(text) {
 function selectSearchInputText() {
     document.getElementById("search-input-field").select();
 }
+
+// Function to make the filter field above the homepage table use the sort
+// order of the column heading link that was clicked.
+function setHomeTableSortUrl(link) {
+    let filterField = document.getElementById("home-table-filter");
+    filterField.setAttribute("hx-get", link.getAttribute("hx-get"));
+    htmx.process(filterField);
+}
+
+// Function to set the resource chosen from the results of an autocomplete
+// field, and to hide the results.
+function selectAutocompleteResource(button) {
+    let target = button.dataset.target;
+    document.getElementById(target + "_value").value = button.dataset.pk;
+    document.getElementById(target).value = button.dataset.title;
+    document.getElementById(target + "_results").innerHTML = "";
+}
+
+// Function to add the resource chosen from the results of a multiple
+// autocomplete field to the chosen resources (unless already chosen), and to
+// clear the field and its results.
+function addAutocompleteResource(button) {
+    let target = button.dataset.target;
+    let chosen = document.getElementById(target + "_chosen");
+    if (!chosen.querySelector('input[value="' + button.dataset.pk + '"]')) {
+        let badge = document.createElement("span");
+        badge.className = "badge bg-secondary me-1 mb-2";
+        badge.textContent = button.dataset.title;
+
+        let input = document.createElement("input");
+        input.type = "hidden";
+        input.name = chosen.dataset.name;
+        input.value = button.dataset.pk;
+        badge.appendChild(input);
+
+        let remove = document.createElement("button");
+        remove.type = "button";
+        remove.className = "btn-close btn-close-white ms-1";
+        remove.setAttribute("aria-label", "削除");
+        remove.onclick = () => badge.remove();
+        badge.appendChild(remove);
+
+        chosen.appendChild(badge);
+    }
+    document.getElementById(target).value = "";
+    document.getElementById(target + "_results").innerHTML = "";
+}
+
+// Function to stop the resources dropdown list in the navbar from loading all
+// the resources once it has been loaded by the filter field next to it.
+function markResourceListLoaded() {
+    document.getElementById("inputGroupSelect").dataset.loaded = "true";
+}